@@ -0,0 +1,46 @@
+"""ADAMS core: scoring and analysis logic shared by the Streamlit app
+
+Importing the package loads none of its modules. The names below are
+imported from their submodule on first access, so ``from adams import
+compare_all`` costs numpy, not pandas, scipy or Streamlit.
+"""
+import importlib
+
+__version__ = "2.0.0"
+
+_EXPORTS = {
+    'METRIC_COLUMNS': 'adams.scoring',
+    'OUTPUT_COLUMNS': 'adams.scoring',
+    'REQUIRED_COLUMNS': 'adams.scoring',
+    'score_frame': 'adams.scoring',
+    'weighted_scores': 'adams.scoring',
+    'ScoredDataset': 'adams.results',
+    'DatasetSummary': 'adams.compare',
+    'compare_all': 'adams.compare',
+    'compare_pair': 'adams.compare',
+    'compare_paired': 'adams.compare',
+    'bootstrap_pair': 'adams.bootstrap',
+    'fit_weights': 'adams.optimize',
+    'ProfileStore': 'adams.profiles',
+    'ProfileScores': 'adams.profiles',
+    'DatasetStore': 'adams.store',
+    'export_bytes': 'adams.export',
+    'comparison_report': 'adams.report',
+    'config_report': 'adams.report',
+    'final_score': 'adams.report',
+}
+
+__all__ = ['__version__', *_EXPORTS]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
@@ -0,0 +1,5 @@
+import sys
+
+from adams.cli import main
+
+sys.exit(main())
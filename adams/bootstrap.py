@@ -0,0 +1,118 @@
+"""Bootstrap confidence intervals for dataset comparisons
+
+Resampling is done in blocks of resamples at a time: each block draws row
+indices for ``block`` resamples at once, turns them into per-row counts
+with one ``bincount`` and gets every resample mean from a single
+``counts @ values`` product. Blocks run on a thread pool (the matrix
+product releases the GIL) and each has its own ``SeedSequence`` child, so
+results depend only on the seed, not on the number of workers. Block size
+is fixed and the pool runs at most ``POOL_CELLS`` cells' worth of blocks
+at once, so memory stays bounded however many cores there are.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from adams.compare import PAIRED_MIN_COVERAGE, align_rows
+
+DEFAULT_RESAMPLES = 10_000
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_SEED = 0
+
+# Upper bound on the (resamples, rows) count matrix of one block; independent
+# of the worker count, as the blocks decide which random numbers are drawn
+BLOCK_CELLS = 2_000_000
+# Upper bound on the cells of all blocks in flight; a block holds int32 indices
+# and float32 counts, 8 bytes a cell, so about 64 MB in total
+POOL_CELLS = 8_000_000
+# Cells counted per bincount call, which works on an int64 copy of its input
+COUNT_CELLS = 1 << 18
+
+
+def _block_means(values, n_resamples, seed_seq):
+    rng = np.random.default_rng(seed_seq)
+    n_rows = len(values)
+    idx = rng.integers(0, n_rows, size=(n_resamples, n_rows), dtype=np.int32)
+    counts = np.empty((n_resamples, n_rows), dtype=values.dtype)
+    step = max(1, COUNT_CELLS // n_rows)
+    offsets = np.arange(0, step * n_rows, n_rows)[:, None]
+    for start in range(0, n_resamples, step):
+        part = idx[start:start + step]
+        flat = (part + offsets[:len(part)]).ravel()
+        counts[start:start + step] = np.bincount(flat, minlength=part.size).reshape(part.shape)
+    return counts @ values / n_rows
+
+
+def bootstrap_means(values, n_resamples=DEFAULT_RESAMPLES, seed=DEFAULT_SEED, workers=None):
+    """Column means of ``n_resamples`` bootstrap resamples of ``values`` (rows x columns)
+
+    ``seed`` is an int or a ``SeedSequence`` (e.g. a child spawned by the caller).
+    """
+    values = np.ascontiguousarray(values, dtype=np.float32)
+    n_rows = len(values)
+    if n_rows == 0:
+        return np.full((n_resamples, values.shape[1]), np.nan)
+    block = max(1, min(n_resamples, BLOCK_CELLS // n_rows))
+    sizes = [min(block, n_resamples - start) for start in range(0, n_resamples, block)]
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    seeds = seed_seq.spawn(len(sizes))
+    workers = min(workers or os.cpu_count() or 1, len(sizes), max(1, POOL_CELLS // (block * n_rows)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        blocks = list(pool.map(lambda args: _block_means(values, *args), zip(sizes, seeds)))
+    return np.concatenate(blocks).astype(np.float64)
+
+
+def percentile_interval(samples, confidence=DEFAULT_CONFIDENCE):
+    """(columns, 2) percentile interval of bootstrap samples"""
+    tail = (1 - confidence) / 2 * 100
+    return np.percentile(samples, [tail, 100 - tail], axis=0).T
+
+
+@dataclass(frozen=True)
+class BootstrapResult:
+    """Percentile intervals per ``SUMMARY_COLUMNS`` entry, shaped (columns, 2)"""
+    n_resamples: int
+    confidence: float
+    paired: bool
+    mean_a: np.ndarray
+    mean_b: np.ndarray
+    difference: np.ndarray
+
+    def excludes_zero(self):
+        """Columns whose difference interval lies entirely above or below zero"""
+        return (self.difference[:, 0] > 0) | (self.difference[:, 1] < 0)
+
+
+def _values(dataset, positions=None):
+    if positions is None:
+        return np.column_stack([dataset.scores, dataset.metrics])
+    return np.column_stack([dataset.scores[positions], dataset.metrics[positions]])
+
+
+def bootstrap_pair(a, b, n_resamples=DEFAULT_RESAMPLES, confidence=DEFAULT_CONFIDENCE, seed=DEFAULT_SEED,
+                   workers=None):
+    """Bootstrap intervals for the means of two ``ScoredDataset`` objects and their difference
+
+    When enough rows line up the aligned rows are resampled together, which
+    keeps the pairing; otherwise each dataset is resampled on its own.
+    """
+    pos_a, pos_b = align_rows(a.row_keys, b.row_keys)
+    paired = len(pos_a) > 1 and len(pos_a) / max(min(len(a), len(b)), 1) >= PAIRED_MIN_COVERAGE
+    if paired:
+        n_columns = 1 + a.metrics.shape[1]
+        means = bootstrap_means(np.hstack([_values(a, pos_a), _values(b, pos_b)]), n_resamples, seed, workers)
+        means_a, means_b = means[:, :n_columns], means[:, n_columns:]
+    else:
+        seed_a, seed_b = np.random.SeedSequence(seed).spawn(2)
+        means_a = bootstrap_means(_values(a), n_resamples, seed_a, workers)
+        means_b = bootstrap_means(_values(b), n_resamples, seed_b, workers)
+    return BootstrapResult(
+        n_resamples=n_resamples,
+        confidence=confidence,
+        paired=paired,
+        mean_a=percentile_interval(means_a, confidence),
+        mean_b=percentile_interval(means_b, confidence),
+        difference=percentile_interval(means_a - means_b, confidence),
+    )
@@ -0,0 +1,186 @@
+"""Persistent, content-addressed cache of per-row judgments
+
+Each entry is keyed by a SHA-256 of (judge, metric set, Question,
+Reference_Answer, Model_Answer) and stores that row's metric scores. The
+SQLite file is bounded by ``max_bytes``: once it grows past the limit the
+least recently used entries are evicted.
+
+The file is shared by the app, its background jobs and ``adams score``
+workers. Writers wait up to ``BUSY_TIMEOUT`` seconds for each other and
+commit in small batches; if the database still stays locked (or fails
+otherwise), lookups report misses and writes are dropped, so scoring goes
+on without the cache instead of failing.
+"""
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from adams.scoring import METRIC_COLUMNS, REQUIRED_COLUMNS
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Eviction shrinks the cache to this fraction of ``max_bytes``
+EVICT_TARGET = 0.9
+# Seconds a connection waits for another process's write lock
+BUSY_TIMEOUT = 60.0
+
+# SQLite's default limit on host parameters per statement is 999 on older builds
+_BATCH = 900
+# Rows written per transaction, so other processes get the lock in between
+_WRITE_BATCH = 5_000
+# Approximate per-entry overhead of the row and its primary-key index entry
+_ROW_OVERHEAD = 48
+
+
+def default_cache_path():
+    cache_dir = os.environ.get('ADAMS_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'adams'))
+    return os.path.join(cache_dir, 'judgments.sqlite')
+
+
+def judgment_keys(judge, df, metrics=METRIC_COLUMNS):
+    """SHA-256 cache key of every row of ``df`` for ``judge`` and ``metrics``"""
+    prefix = hashlib.sha256('\x1f'.join([judge, *metrics]).encode('utf-8'))
+    keys = []
+    for row in zip(*(df[col].astype(str).tolist() for col in REQUIRED_COLUMNS)):
+        h = prefix.copy()
+        h.update('\x1e'.join(row).encode('utf-8'))
+        keys.append(h.digest())
+    return keys
+
+
+def open_cache(path=None):
+    """A ``JudgmentCache`` at ``path``, or None when the database cannot be opened"""
+    try:
+        return JudgmentCache(path)
+    except sqlite3.Error:
+        return None
+
+
+class JudgmentCache:
+    """Thread-safe SQLite store of metric score vectors with size-based LRU eviction"""
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, metrics=METRIC_COLUMNS):
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        self.metrics = list(metrics)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS judgments ('
+            ' key BLOB PRIMARY KEY, scores BLOB NOT NULL,'
+            ' nbytes INTEGER NOT NULL, last_used INTEGER NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS judgments_last_used ON judgments(last_used)')
+        self._conn.commit()
+
+    def get_many(self, keys):
+        """Look up ``keys``; return (matrix, hit_mask) with NaN rows for misses"""
+        matrix = np.full((len(keys), len(self.metrics)), np.nan)
+        hit_mask = np.zeros(len(keys), dtype=bool)
+        positions = {}
+        for i, key in enumerate(keys):
+            positions.setdefault(key, []).append(i)
+
+        unique = list(positions)
+        now = time.time_ns()
+        with self._lock:
+            try:
+                for start in range(0, len(unique), _BATCH):
+                    batch = unique[start:start + _BATCH]
+                    marks = ','.join('?' * len(batch))
+                    rows = self._conn.execute(
+                        f'SELECT key, scores FROM judgments WHERE key IN ({marks})', batch
+                    ).fetchall()
+                    for key, blob in rows:
+                        idx = positions[key]
+                        matrix[idx] = np.frombuffer(blob, dtype='<f8')
+                        hit_mask[idx] = True
+                    if rows:
+                        self._conn.executemany(
+                            'UPDATE judgments SET last_used = ? WHERE key = ?', ((now, key) for key, _ in rows)
+                        )
+                    self._conn.commit()
+            except sqlite3.Error:
+                # Rows found before the failure are still valid hits
+                self._failed()
+            n_hits = int(hit_mask.sum())
+            self.hits += n_hits
+            self.misses += len(keys) - n_hits
+        return matrix, hit_mask
+
+    def put_many(self, keys, matrix):
+        """Store one score vector per key, then evict down to ``max_bytes``"""
+        now = time.time_ns()
+        blobs = np.ascontiguousarray(matrix, dtype='<f8')
+        keys = list(keys)
+        with self._lock:
+            try:
+                for start in range(0, len(keys), _WRITE_BATCH):
+                    self._conn.executemany('INSERT OR REPLACE INTO judgments VALUES (?, ?, ?, ?)', (
+                        (key, blobs[i].tobytes(), len(key) + blobs.shape[1] * 8 + _ROW_OVERHEAD, now)
+                        for i, key in enumerate(keys[start:start + _WRITE_BATCH], start)
+                    ))
+                    self._conn.commit()
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error:
+                self._failed()
+
+    def _failed(self):
+        """Give up on the current transaction; the caller carries on uncached"""
+        self.errors += 1
+        try:
+            self._conn.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self):
+        total, count = self._conn.execute('SELECT COALESCE(SUM(nbytes), 0), COUNT(*) FROM judgments').fetchone()
+        if total <= self.max_bytes or not count:
+            return
+        # Drop the oldest entries down to EVICT_TARGET of the cap, so the next
+        # few writes do not evict again; entries are all about the same size
+        excess = total - self.max_bytes * EVICT_TARGET
+        n_drop = min(count, math.ceil(excess / (total / count)))
+        deleted = self._conn.execute(
+            'DELETE FROM judgments WHERE key IN (SELECT key FROM judgments ORDER BY last_used LIMIT ?)', (n_drop,)
+        ).rowcount
+        self.evictions += deleted
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM judgments')
+            self._conn.commit()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Counters and current size, for display"""
+        with self._lock:
+            entries, size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM judgments').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'errors': self.errors,
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
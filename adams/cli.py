@@ -0,0 +1,187 @@
+"""Headless command-line entry point
+
+    python -m adams score 'runs/**/*.csv' --judge Qwen --workers 8
+    python -m adams synth bench_100k.parquet --rows 100000
+
+Each input is scored with the same pipeline as the app and the enriched rows
+are streamed next to it as ``<name>.adams.<ext>``, in the input's format or
+any export format given with ``--format``. Files are spread across
+worker processes. Simulated scores depend only on each row's text, the
+judge and ``--seed``, so any worker count or chunk size gives identical
+output. Nothing here imports Streamlit, and pandas is only loaded by the
+workers, so start-up stays fast.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+INPUT_EXTENSIONS = ('.csv', '.json', '.jsonl', '.ndjson', '.parquet')
+OUTPUT_MARKER = '.adams'
+
+# Default output format per input format; JSON arrays are written back as JSON Lines
+OUTPUT_FORMATS = {'csv': 'csv', 'json': 'jsonl', 'jsonl': 'jsonl', 'parquet': 'parquet'}
+
+
+def expand_inputs(patterns):
+    """Resolve glob patterns to scorable input files, skipping earlier outputs"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or ([pattern] if os.path.isfile(pattern) else [])
+        for path in matches:
+            stem, ext = os.path.splitext(path)
+            if ext.lower() in INPUT_EXTENSIONS and not stem.endswith(OUTPUT_MARKER) and path not in paths:
+                paths.append(path)
+    return paths
+
+
+def output_format(path, fmt=None):
+    """Requested export format, or the one matching the input"""
+    from adams.ingest import detect_format
+
+    return fmt or OUTPUT_FORMATS[detect_format(path)]
+
+
+def output_path(path, fmt):
+    from adams.export import export_file_name
+
+    return export_file_name(os.path.splitext(path)[0] + OUTPUT_MARKER, fmt)
+
+
+def score_file(path, judge, chunksize, use_cache, judge_url, fmt=None, seed=None, judge_rps=None, workers=1):
+    """Worker: score one file and write its enriched copy; returns a summary dict
+
+    ``judge_rps`` overrides ADAMS_JUDGE_RPS; the limit is shared equally by
+    the ``workers`` processes, as each has its own rate limiters.
+    """
+    from adams.export import ExportWriter
+    from adams.judge import JudgeConfig, parse_rate_limits
+    from adams.pipeline import iter_scored_chunks
+    from adams.scoring import DEFAULT_SEED
+
+    judge_config = JudgeConfig(base_url=judge_url) if judge_url else JudgeConfig.from_env()
+    if judge_config is not None:
+        if seed is not None:
+            judge_config.seed = seed
+        if judge_rps is not None:
+            judge_config.rate_limits, judge_config.default_rate_limit = parse_rate_limits(judge_rps)
+        judge_config = judge_config.split_rate_limits(workers)
+    cache = None
+    # Only live judgments are worth caching; simulated scores are recomputed faster
+    if use_cache and judge_config is not None:
+        from adams.cache import open_cache
+
+        cache = open_cache()
+
+    fmt = output_format(path, fmt)
+    out = output_path(path, fmt)
+    tmp = out + '.partial'
+    start = time.perf_counter()
+    rows = 0
+    try:
+        with open(path, 'rb') as f, open(tmp, 'wb') as sink:
+            writer = ExportWriter(sink, fmt)
+            for scored, rows, _ in iter_scored_chunks(f, path, judge, chunksize, judge_config=judge_config, cache=cache,
+                                                      seed=DEFAULT_SEED if seed is None else seed):
+                writer.write(scored)
+            writer.close()
+        if rows:
+            os.replace(tmp, out)
+    finally:
+        if cache is not None:
+            cache.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return {'input': path, 'output': out if rows else None, 'rows': rows, 'seconds': time.perf_counter() - start}
+
+
+def cmd_score(args):
+    from adams.ingest import DEFAULT_CHUNKSIZE
+    from adams.judge import parse_rate_limits
+
+    try:
+        parse_rate_limits(args.judge_rps if args.judge_rps is not None else os.environ.get('ADAMS_JUDGE_RPS'))
+    except ValueError as e:
+        print(f"adams: {e}", file=sys.stderr)
+        return 2
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("adams: no CSV/JSON/Parquet inputs matched", file=sys.stderr)
+        return 2
+
+    chunksize = args.chunksize or DEFAULT_CHUNKSIZE
+    workers = max(1, min(args.workers or os.cpu_count(), len(paths)))
+    failures = 0
+    total_rows = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(score_file, path, args.judge, chunksize, not args.no_cache, args.judge_url, args.format,
+                        args.seed, args.judge_rps, workers): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"FAILED  {path}: {e}", file=sys.stderr)
+                continue
+            total_rows += summary['rows']
+            rate = summary['rows'] / summary['seconds'] if summary['seconds'] else 0.0
+            print(f"scored  {path} -> {summary['output']} ({summary['rows']:,} rows, {rate:,.0f} rows/s)")
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths) - failures}/{len(paths)} files, {total_rows:,} rows in {elapsed:.1f}s "
+          f"with {workers} worker(s) using judge {args.judge}")
+    return 1 if failures else 0
+
+
+def cmd_synth(args):
+    from adams.synth import write_synthetic
+
+    start = time.perf_counter()
+    write_synthetic(args.output, args.rows, args.format, args.answer_chars, args.seed)
+    print(f"wrote   {args.output} ({args.rows:,} rows in {time.perf_counter() - start:.1f}s)")
+    return 0
+
+
+def build_parser():
+    from adams.export import EXPORT_FORMATS
+
+    parser = argparse.ArgumentParser(prog='adams', description="ADAMS headless evaluation tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    score = subparsers.add_parser('score', help="Score CSV/JSON/Parquet datasets without the UI")
+    score.add_argument('inputs', nargs='+', help="Input files or glob patterns (quote them; ** is supported)")
+    score.add_argument('--judge', default='Qwen', help="LLM judge label (default: Qwen)")
+    score.add_argument('--judge-url', help="OpenAI-compatible judge endpoint; defaults to ADAMS_JUDGE_URL")
+    score.add_argument('--judge-rps',
+                       help="Judge requests per second, split across workers: a number, or JSON per judge such "
+                            "as '{\"Qwen\": 5, \"*\": 20}'; defaults to ADAMS_JUDGE_RPS")
+    score.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    score.add_argument('--chunksize', type=int, help="Rows per scoring chunk")
+    score.add_argument('--format', choices=list(EXPORT_FORMATS),
+                       help="Output format, e.g. parquet or csv.zst (default: same as the input)")
+    score.add_argument('--no-cache', action='store_true', help="Do not read or write the judgment cache (only a live judge uses it)")
+    score.add_argument('--seed', type=int,
+                       help="Scoring seed; also sent to a live judge (default: 0 for the simulator, none for a judge)")
+    score.set_defaults(func=cmd_score)
+
+    synth = subparsers.add_parser('synth', help="Write a synthetic Question/Reference_Answer/Model_Answer dataset")
+    synth.add_argument('output', help="Output file; the format follows its extension unless --format is given")
+    synth.add_argument('--rows', type=int, default=10_000, help="Rows to generate (default: 10000)")
+    synth.add_argument('--answer-chars', type=int, default=300, help="Mean reference answer length (default: 300)")
+    synth.add_argument('--seed', type=int, default=0)
+    synth.add_argument('--format', choices=list(EXPORT_FORMATS))
+    synth.set_defaults(func=cmd_synth)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
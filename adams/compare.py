@@ -0,0 +1,312 @@
+"""Dataset comparison built on cached per-dataset summaries
+
+Every dataset is reduced once to a ``DatasetSummary`` (count, mean,
+variance, median and range of the ADAMS score and of each metric). Pairwise
+differences, t-tests and win counts are then computed from the summaries
+alone, without touching the rows again. ``compare_all`` does the same for
+every pair of N datasets at once by broadcasting over the stacked summaries.
+
+When two datasets share rows (the same file scored by two judges),
+``compare_paired`` lines them up on a hash of the text columns and runs
+paired tests on the per-row differences instead.
+"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from adams.profiler import section
+from adams.scoring import METRIC_COLUMNS
+
+# Summary columns: the overall score first, then each metric
+SUMMARY_COLUMNS = ('ADAMS_Score', *METRIC_COLUMNS)
+
+TIE_THRESHOLD = 0.1
+SIGNIFICANCE_LEVEL = 0.05
+
+# A paired test replaces the independent one once this share of the smaller dataset is matched
+PAIRED_MIN_COVERAGE = 0.5
+# Judges "disagree" on a row when their ADAMS scores differ by more than this
+DISAGREEMENT_THRESHOLD = 1.0
+TOP_DISAGREEMENTS = 20
+
+
+@dataclass(frozen=True)
+class DatasetSummary:
+    """Per-column statistics of one dataset, in ``SUMMARY_COLUMNS`` order"""
+    dataset_id: str
+    n: int
+    mean: np.ndarray
+    var: np.ndarray
+    median: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+
+    @classmethod
+    def from_dataset(cls, dataset_id, dataset):
+        """Summarize a ``ScoredDataset`` in one pass over its arrays"""
+        values = np.column_stack([dataset.scores, dataset.metrics]).astype(np.float64)
+        n = len(values)
+        if n == 0:
+            empty = np.full(len(SUMMARY_COLUMNS), np.nan)
+            return cls(dataset_id, 0, empty, empty, empty, empty, empty)
+        return cls(
+            dataset_id=dataset_id,
+            n=n,
+            mean=values.mean(axis=0),
+            var=values.var(axis=0, ddof=1) if n > 1 else np.zeros(len(SUMMARY_COLUMNS)),
+            median=np.median(values, axis=0),
+            min=values.min(axis=0),
+            max=values.max(axis=0),
+        )
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+    def score(self, stat):
+        """One statistic of the ADAMS score, e.g. ``score('median')``"""
+        return float(getattr(self, stat)[0])
+
+
+@dataclass(frozen=True)
+class PairComparison:
+    """Dataset A minus dataset B, per ``SUMMARY_COLUMNS`` entry"""
+    difference: np.ndarray
+    t_stat: np.ndarray
+    p_value: np.ndarray
+
+    @property
+    def score_difference(self):
+        return float(self.difference[0])
+
+    @property
+    def score_p_value(self):
+        return float(self.p_value[0])
+
+    @property
+    def significant(self):
+        """Whether the ADAMS score difference is significant; None without a test"""
+        if np.isnan(self.p_value[0]):
+            return None
+        return bool(self.p_value[0] < SIGNIFICANCE_LEVEL)
+
+    @property
+    def winner(self):
+        """'a', 'b' or 'tie' on the mean ADAMS score"""
+        if self.score_difference > TIE_THRESHOLD:
+            return 'a'
+        if self.score_difference < -TIE_THRESHOLD:
+            return 'b'
+        return 'tie'
+
+    def win_counts(self):
+        """Columns where A is higher, where B is higher, and ties"""
+        difference = self.difference
+        return int((difference > 0).sum()), int((difference < 0).sum()), int((difference == 0).sum())
+
+
+def pooled_ttest(mean_a, var_a, n_a, mean_b, var_b, n_b):
+    """Two-sample t-test with pooled variance on broadcastable summary arrays
+
+    Matches ``scipy.stats.ttest_ind``; p-values are NaN without scipy.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dof = n_a + n_b - 2.0
+        pooled = ((n_a - 1) * var_a + (n_b - 1) * var_b) / dof
+        t_stat = (mean_a - mean_b) / np.sqrt(pooled * (1.0 / n_a + 1.0 / n_b))
+    try:
+        from scipy import stats
+    except ImportError:
+        return t_stat, np.full(np.shape(t_stat), np.nan)
+    return t_stat, 2 * stats.t.sf(np.abs(t_stat), dof)
+
+
+def compare_pair(a, b):
+    """Compare two ``DatasetSummary`` objects"""
+    t_stat, p_value = pooled_ttest(a.mean, a.var, a.n, b.mean, b.var, b.n)
+    return PairComparison(difference=a.mean - b.mean, t_stat=t_stat, p_value=p_value)
+
+
+@dataclass(frozen=True)
+class MatrixComparison:
+    """All pairs of N datasets; entry ``[i, j, c]`` is dataset i minus dataset j on column c"""
+    dataset_ids: tuple
+    mean: np.ndarray
+    difference: np.ndarray
+    t_stat: np.ndarray
+    p_value: np.ndarray
+
+    def column(self, name):
+        return SUMMARY_COLUMNS.index(name)
+
+    def wins(self):
+        """(N, N) count of columns on which dataset i beats dataset j"""
+        return (self.difference > 0).sum(axis=2)
+
+    def significant(self, column=0):
+        """(N, N) mask of significant differences on one column"""
+        return self.p_value[:, :, column] < SIGNIFICANCE_LEVEL
+
+    def significant_wins(self, column=0):
+        """Per dataset, how many others it beats significantly on one column"""
+        return ((self.difference[:, :, column] > 0) & self.significant(column)).sum(axis=1)
+
+    def significant_losses(self, column=0):
+        return ((self.difference[:, :, column] < 0) & self.significant(column)).sum(axis=1)
+
+
+def compare_all(summaries):
+    """Compare every pair of ``summaries`` in one vectorized pass"""
+    n = np.array([summary.n for summary in summaries], dtype=float)[:, None]
+    mean = np.stack([summary.mean for summary in summaries])
+    var = np.stack([summary.var for summary in summaries])
+    # (N, 1, C) against (1, N, C) broadcasts to every ordered pair
+    t_stat, p_value = pooled_ttest(mean[:, None], var[:, None], n[:, None], mean[None], var[None], n[None])
+    return MatrixComparison(
+        dataset_ids=tuple(summary.dataset_id for summary in summaries),
+        mean=mean,
+        difference=mean[:, None] - mean[None],
+        t_stat=t_stat,
+        p_value=p_value,
+    )
+
+
+def align_rows(keys_a, keys_b):
+    """Positions ``(pos_a, pos_b)`` of the rows whose keys appear in both datasets
+
+    A key repeated within one dataset is matched on its first occurrence.
+    """
+    _, pos_a, pos_b = np.intersect1d(keys_a, keys_b, assume_unique=False, return_indices=True)
+    order = np.argsort(pos_a, kind='stable')
+    return pos_a[order], pos_b[order]
+
+
+@dataclass(frozen=True)
+class PairedComparison:
+    """Row-aligned comparison of two datasets, per ``SUMMARY_COLUMNS`` entry"""
+    n_pairs: int
+    coverage: float
+    difference: np.ndarray
+    t_stat: np.ndarray
+    p_value: np.ndarray
+    correlation: float
+    mean_abs_difference: float
+    disagreement_rate: float
+    top_positions_a: np.ndarray
+    top_differences: np.ndarray
+
+    @property
+    def usable(self):
+        """Whether enough rows line up for the paired test to stand in for the independent one"""
+        return self.n_pairs > 1 and self.coverage >= PAIRED_MIN_COVERAGE
+
+    @property
+    def score_difference(self):
+        return float(self.difference[0])
+
+    @property
+    def score_p_value(self):
+        return float(self.p_value[0])
+
+    @property
+    def significant(self):
+        if np.isnan(self.p_value[0]):
+            return None
+        return bool(self.p_value[0] < SIGNIFICANCE_LEVEL)
+
+
+def paired_ttest(differences):
+    """Paired t-test per column of an (n_pairs, columns) difference array
+
+    Matches ``scipy.stats.ttest_rel``; p-values are NaN without scipy.
+    """
+    n = len(differences)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = differences.mean(axis=0) / (differences.std(axis=0, ddof=1) / np.sqrt(n))
+    try:
+        from scipy import stats
+    except ImportError:
+        return t_stat, np.full(np.shape(t_stat), np.nan)
+    return t_stat, 2 * stats.t.sf(np.abs(t_stat), n - 1)
+
+
+def _values(dataset, positions):
+    return np.column_stack([dataset.scores[positions], dataset.metrics[positions]]).astype(np.float64)
+
+
+def compare_paired(a, b):
+    """Compare two ``ScoredDataset`` objects on the rows they share"""
+    pos_a, pos_b = align_rows(a.row_keys, b.row_keys)
+    n_pairs = len(pos_a)
+    differences = _values(a, pos_a) - _values(b, pos_b)
+    if n_pairs > 1:
+        t_stat, p_value = paired_ttest(differences)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = float(np.corrcoef(a.scores[pos_a], b.scores[pos_b])[0, 1])
+    else:
+        t_stat = p_value = np.full(len(SUMMARY_COLUMNS), np.nan)
+        correlation = float('nan')
+
+    score_gap = np.abs(differences[:, 0])
+    top = np.argsort(score_gap, kind='stable')[::-1][:TOP_DISAGREEMENTS]
+    return PairedComparison(
+        n_pairs=n_pairs,
+        coverage=n_pairs / max(min(len(a), len(b)), 1),
+        difference=differences.mean(axis=0) if n_pairs else np.full(len(SUMMARY_COLUMNS), np.nan),
+        t_stat=t_stat,
+        p_value=p_value,
+        correlation=correlation,
+        mean_abs_difference=float(score_gap.mean()) if n_pairs else float('nan'),
+        disagreement_rate=float((score_gap > DISAGREEMENT_THRESHOLD).mean()) if n_pairs else float('nan'),
+        top_positions_a=pos_a[top],
+        top_differences=differences[top, 0],
+    )
+
+
+class ComparisonCache:
+    """Comparison results keyed by dataset ids; safe to share between sessions
+
+    Stored datasets never change under an id, so an entry stays valid until
+    ``invalidate`` is called for one of its datasets (e.g. when it is deleted).
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def _get(self, key, build):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            with section(f'compare.{key[0]}'):
+                entry = build()
+            with self._lock:
+                self._entries[key] = entry
+                self.builds += 1
+        return entry
+
+    def summary(self, dataset_id, load):
+        """Summary of ``dataset_id``, calling ``load()`` for the dataset only on a miss"""
+        return self._get(('summary', dataset_id), lambda: DatasetSummary.from_dataset(dataset_id, load()))
+
+    def paired(self, id_a, id_b, load_a, load_b):
+        """Row-aligned comparison of two datasets"""
+        return self._get(('paired', id_a, id_b), lambda: compare_paired(load_a(), load_b()))
+
+    def bootstrap(self, id_a, id_b, n_resamples, load_a, load_b):
+        """Bootstrap confidence intervals for a pair at one resample count"""
+        from adams.bootstrap import bootstrap_pair
+
+        return self._get(('bootstrap', id_a, id_b, n_resamples),
+                         lambda: bootstrap_pair(load_a(), load_b(), n_resamples))
+
+    def invalidate(self, dataset_id=None):
+        """Drop every entry involving ``dataset_id``, or all of them"""
+        with self._lock:
+            if dataset_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if dataset_id in key[1:]]:
+                    del self._entries[key]
@@ -0,0 +1,181 @@
+"""On-demand export of scored datasets and reports
+
+Payloads are written chunk by chunk through an optional compressor, so no
+full-size intermediate string is built. Formats:
+
+* ``csv``, ``csv.gz``, ``csv.zst``
+* ``jsonl``, ``jsonl.gz``, ``jsonl.zst``
+* ``json``, a compact array of records
+* ``parquet`` and ``arrow`` (Arrow IPC file), both columnar
+
+``.zst`` needs ``zstandard`` and the columnar formats need ``pyarrow``;
+``available_formats()`` lists only what is installed.
+"""
+import gzip
+import io
+import json
+from importlib.util import find_spec
+
+from adams.profiler import payload, section
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Digits written for floats in JSON; float32 metrics carry about seven
+JSON_DOUBLE_PRECISION = 6
+
+# Key under which report metadata is stored in Parquet/Arrow schema metadata
+REPORT_METADATA_KEY = b'adams_report'
+
+EXPORT_FORMATS = {
+    'csv': {'label': "CSV", 'ext': '.csv', 'mime': 'text/csv'},
+    'csv.gz': {'label': "CSV (gzip)", 'ext': '.csv.gz', 'mime': 'application/gzip'},
+    'csv.zst': {'label': "CSV (zstd)", 'ext': '.csv.zst', 'mime': 'application/zstd'},
+    'jsonl': {'label': "JSON Lines", 'ext': '.jsonl', 'mime': 'application/x-ndjson'},
+    'jsonl.gz': {'label': "JSON Lines (gzip)", 'ext': '.jsonl.gz', 'mime': 'application/gzip'},
+    'jsonl.zst': {'label': "JSON Lines (zstd)", 'ext': '.jsonl.zst', 'mime': 'application/zstd'},
+    'json': {'label': "JSON", 'ext': '.json', 'mime': 'application/json'},
+    'parquet': {'label': "Parquet", 'ext': '.parquet', 'mime': 'application/vnd.apache.parquet'},
+    'arrow': {'label': "Arrow IPC", 'ext': '.arrow', 'mime': 'application/vnd.apache.arrow.file'},
+}
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+# Formats that can carry report metadata alongside the rows
+REPORT_FORMATS = ('parquet', 'arrow', 'jsonl.zst', 'jsonl.gz', 'jsonl', 'json')
+
+
+def available_formats():
+    """Export formats whose optional dependencies are installed"""
+    has_zstd = find_spec('zstandard') is not None
+    has_arrow = find_spec('pyarrow') is not None
+    return [
+        fmt for fmt in EXPORT_FORMATS
+        if (has_zstd or not fmt.endswith('.zst')) and (has_arrow or fmt not in COLUMNAR_FORMATS)
+    ]
+
+
+class _Closer:
+    """Close a compressor stream without closing the file underneath"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, data):
+        return self.stream.write(data)
+
+    def close(self):
+        self.stream.close()
+
+
+def _open_stream(fileobj, codec):
+    if codec == 'gz':
+        return _Closer(gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=6))
+    if codec == 'zst':
+        import zstandard
+
+        return _Closer(zstandard.ZstdCompressor(level=3).stream_writer(fileobj, closefd=False))
+    return None
+
+
+class ExportWriter:
+    """Write DataFrame chunks to ``fileobj`` in one export format
+
+    ``metadata`` (a JSON-serializable dict) is stored in the schema metadata
+    of columnar formats, as a leading ``{"_report": ...}`` line in JSON Lines
+    and as ``{"report": ..., "dataset": [...]}`` in JSON.
+    """
+
+    def __init__(self, fileobj, fmt, metadata=None):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        self.fmt = fmt
+        self.base, _, codec = fmt.partition('.')
+        self.metadata = metadata
+        self._fileobj = fileobj
+        self._stream = _open_stream(fileobj, codec)
+        self._out = self._stream or fileobj
+        self._arrow_writer = None
+        self._first = True
+        self._wrote_rows = False
+
+    def _table(self, chunk):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self.metadata is not None:
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}),
+                REPORT_METADATA_KEY: json.dumps(self.metadata, default=str).encode('utf-8'),
+            })
+        return table
+
+    def _json_head(self):
+        if self.metadata is None:
+            return b'['
+        return ('{"report":' + json.dumps(self.metadata, default=str) + ',"dataset":[').encode('utf-8')
+
+    def write(self, chunk):
+        if self.base == 'csv':
+            self._out.write(chunk.to_csv(index=False, header=self._first).encode('utf-8'))
+        elif self.base == 'jsonl':
+            if self._first and self.metadata is not None:
+                self._out.write((json.dumps({'_report': self.metadata}, default=str) + '\n').encode('utf-8'))
+            if len(chunk):
+                data = chunk.to_json(orient='records', lines=True, double_precision=JSON_DOUBLE_PRECISION)
+                self._out.write((data if data.endswith('\n') else data + '\n').encode('utf-8'))
+        elif self.base == 'json':
+            if self._first:
+                self._out.write(self._json_head())
+            if len(chunk):
+                # Splice each chunk's records into one array
+                records = chunk.to_json(orient='records', double_precision=JSON_DOUBLE_PRECISION)[1:-1]
+                self._out.write(((',' if self._wrote_rows else '') + records).encode('utf-8'))
+                self._wrote_rows = True
+        else:
+            table = self._table(chunk)
+            if self._arrow_writer is None:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                if self.base == 'parquet':
+                    self._arrow_writer = pq.ParquetWriter(self._fileobj, table.schema, compression='zstd')
+                else:
+                    self._arrow_writer = pa.ipc.new_file(self._fileobj, table.schema)
+            self._arrow_writer.write_table(table)
+        self._first = False
+
+    def close(self):
+        if self.base == 'json':
+            if self._first:
+                self._out.write(self._json_head())
+            self._out.write(b']}' if self.metadata is not None else b']')
+        if self._arrow_writer is not None:
+            self._arrow_writer.close()
+        if self._stream is not None:
+            self._stream.close()
+
+
+def write_export(df, fmt, fileobj, metadata=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream ``df`` to ``fileobj`` in ``chunksize``-row slices"""
+    writer = ExportWriter(fileobj, fmt, metadata)
+    for start in range(0, max(len(df), 1), chunksize):
+        writer.write(df.iloc[start:start + chunksize])
+    writer.close()
+
+
+def export_bytes(df, fmt, metadata=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Build an export payload in memory; only the encoded output is held"""
+    with section('export'):
+        buffer = io.BytesIO()
+        write_export(df, fmt, buffer, metadata, chunksize)
+        return payload('export', buffer.getvalue())
+
+
+def available_report_formats():
+    """Report formats whose optional dependencies are installed, most compact first"""
+    available = available_formats()
+    return [fmt for fmt in REPORT_FORMATS if fmt in available]
+
+
+def export_file_name(stem, fmt):
+    return stem + EXPORT_FORMATS[fmt]['ext']
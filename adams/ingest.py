@@ -0,0 +1,143 @@
+"""Chunked ingestion of uploaded CSV / JSON datasets"""
+import io
+import json
+import os
+
+import pandas as pd
+
+from adams.scoring import REQUIRED_COLUMNS, missing_columns
+
+DEFAULT_CHUNKSIZE = 50_000
+
+SUPPORTED_EXTENSIONS = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.parquet': 'parquet',
+}
+
+
+class MissingColumnsError(ValueError):
+    """The first chunk of an upload lacks required columns"""
+
+    def __init__(self, missing):
+        self.missing = missing
+        super().__init__(f"Missing required columns: {missing}")
+
+    def __reduce__(self):
+        # Rebuild from ``missing`` when crossing a process boundary
+        return type(self), (self.missing,)
+
+
+class UnsupportedFormatError(ValueError):
+    """The upload is not a CSV, JSON or Parquet file"""
+
+
+def detect_format(name):
+    """Map a file name to 'csv', 'json', 'jsonl' or 'parquet'"""
+    ext = os.path.splitext(name.lower())[1]
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise UnsupportedFormatError(f"Unsupported file type: {name}")
+    return SUPPORTED_EXTENSIONS[ext]
+
+
+def file_size(file):
+    """Total size in bytes of a seekable file-like object"""
+    size = getattr(file, 'size', None)
+    if size is not None:
+        return size
+    pos = file.tell()
+    file.seek(0, io.SEEK_END)
+    size = file.tell()
+    file.seek(pos)
+    return size
+
+
+def _is_json_lines(file):
+    """Sniff a .json upload: JSON Lines starts with one complete record per line
+
+    A pretty-printed document or pandas' ``to_json`` layouts (columns, index,
+    split), whose first line is not a flat record, are read as one document.
+    """
+    pos = file.tell()
+    first = file.readline()
+    file.seek(pos)
+    if isinstance(first, bytes):
+        first = first.decode('utf-8', errors='ignore')
+    try:
+        record = json.loads(first)
+    except ValueError:
+        return False
+    return isinstance(record, dict) and not any(isinstance(value, (dict, list)) for value in record.values())
+
+
+def _as_text(values):
+    """Text column values as strings; JSON numbers become their text, missing values stay missing"""
+    if pd.api.types.is_string_dtype(values.dtype) and not pd.api.types.is_object_dtype(values.dtype):
+        return values
+    return values.astype(str).mask(values.isna())
+
+
+def _raw_chunks(file, fmt, chunksize, columns):
+    if fmt == 'csv':
+        # Only the requested columns are materialized; the callable never raises,
+        # so missing columns are reported from the first chunk below. Text is
+        # read as text, so no chunk's values are re-parsed as numbers.
+        return pd.read_csv(file, chunksize=chunksize, usecols=lambda col: col in columns,
+                           dtype={col: str for col in REQUIRED_COLUMNS if col in columns})
+    if fmt == 'jsonl' or _is_json_lines(file):
+        return pd.read_json(file, lines=True, chunksize=chunksize, dtype=False)
+    # A single JSON document cannot be parsed incrementally; slice it after loading
+    df = pd.read_json(file, dtype=False)
+    return (df.iloc[start:start + chunksize] for start in range(0, max(len(df), 1), chunksize))
+
+
+def _missing(columns, available):
+    if columns is REQUIRED_COLUMNS:
+        return missing_columns(available)
+    return [col for col in columns if col not in available]
+
+
+def _iter_parquet(file, chunksize, columns):
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(file)
+    missing = _missing(columns, parquet.schema_arrow.names)
+    if missing:
+        raise MissingColumnsError(missing)
+    total_rows = parquet.metadata.num_rows or 1
+    total_bytes = file_size(file)
+    rows_read = 0
+    for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+        rows_read += batch.num_rows
+        # The reader seeks around the file (footer first), so report progress by rows
+        yield batch.to_pandas(), int(total_bytes * rows_read / total_rows)
+
+
+def iter_chunks(file, name, chunksize=DEFAULT_CHUNKSIZE, columns=REQUIRED_COLUMNS):
+    """Yield (chunk, bytes_read) pairs holding only ``columns`` (the required ones by default)
+
+    The header is validated on the first chunk, before the rest of the file is
+    read. CSV, JSON Lines and Parquet are streamed; a JSON array is loaded once
+    and sliced.
+    """
+    fmt = detect_format(name)
+    if fmt == 'parquet':
+        yield from _iter_parquet(file, chunksize, columns)
+        return
+    first = True
+    for chunk in _raw_chunks(file, fmt, chunksize, columns):
+        if first:
+            missing = _missing(columns, chunk.columns)
+            if missing:
+                raise MissingColumnsError(missing)
+            first = False
+        chunk = chunk[columns].reset_index(drop=True)
+        if fmt != 'csv':
+            # JSON values keep their parsed types; the same column must hold
+            # the same text in every chunk
+            for col in REQUIRED_COLUMNS:
+                if col in chunk:
+                    chunk[col] = _as_text(chunk[col])
+        yield chunk, file.tell()
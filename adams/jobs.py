@@ -0,0 +1,209 @@
+"""Background scoring jobs on a process pool
+
+A job copies its input under ``ADAMS_HOME/jobs/<job id>/``, scores it on a
+worker process and writes every scored chunk there as soon as it is ready,
+together with a ``status.json`` that any session can poll. Several jobs run at
+once, one per worker process.
+"""
+import glob
+import json
+import multiprocessing
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+import pandas as pd
+
+from adams.ingest import DEFAULT_CHUNKSIZE
+from adams.paths import data_dir
+from adams.pipeline import concat_scored, iter_scored_chunks
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+INTERRUPTED = 'interrupted'
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+# Minimum seconds between status writes while a chunk is in progress
+_STATUS_INTERVAL = 0.5
+
+
+@dataclass
+class Job:
+    """Persisted state of one background scoring job"""
+    id: str
+    filename: str
+    judge: str
+    submitted: float
+    # Process that owns the worker pool running this job
+    owner_pid: int = None
+    status: str = QUEUED
+    rows_done: int = 0
+    fraction: float = 0.0
+    parts: int = 0
+    started: float = None
+    finished: float = None
+    error: str = None
+
+    @property
+    def name(self):
+        return f"{self.filename} ({self.judge})"
+
+    @property
+    def active(self):
+        return self.status in ACTIVE_STATUSES
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+def _status_path(job_dir):
+    return os.path.join(job_dir, 'status.json')
+
+
+def _write_status(job_dir, job):
+    tmp = _status_path(job_dir) + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(asdict(job), f)
+    os.replace(tmp, _status_path(job_dir))
+
+
+def _read_status(job_dir):
+    with open(_status_path(job_dir)) as f:
+        return Job(**json.load(f))
+
+
+def _input_path(job_dir, filename):
+    return os.path.join(job_dir, 'input' + os.path.splitext(filename)[1].lower())
+
+
+def _part_paths(job_dir):
+    return sorted(glob.glob(os.path.join(job_dir, 'part-*.pkl')))
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _run_job(job_dir, judge_config, cache_path, chunksize):
+    """Worker-process entry point: score the job input chunk by chunk"""
+    job = _read_status(job_dir)
+    job.status = RUNNING
+    job.started = time.time()
+    _write_status(job_dir, job)
+
+    cache = None
+    # Only live judgments are worth caching; simulated scores are recomputed faster
+    if cache_path is not None and judge_config is not None:
+        from adams.cache import open_cache
+
+        cache = open_cache(cache_path)
+
+    last_write = 0.0
+
+    def on_progress(rows_done, fraction):
+        nonlocal last_write
+        job.rows_done, job.fraction = rows_done, fraction
+        if time.monotonic() - last_write >= _STATUS_INTERVAL:
+            _write_status(job_dir, job)
+            last_write = time.monotonic()
+
+    try:
+        with open(_input_path(job_dir, job.filename), 'rb') as f:
+            chunks = iter_scored_chunks(f, job.filename, job.judge, chunksize, on_progress, judge_config, cache)
+            for scored, rows_done, fraction in chunks:
+                scored.to_pickle(os.path.join(job_dir, f"part-{job.parts:05d}.pkl"))
+                job.parts += 1
+                job.rows_done, job.fraction = rows_done, fraction
+                _write_status(job_dir, job)
+        job.status = DONE
+    except Exception as e:
+        job.status = FAILED
+        job.error = str(e)
+    finally:
+        job.finished = time.time()
+        _write_status(job_dir, job)
+        if cache is not None:
+            cache.close()
+    return job.status
+
+
+class JobManager:
+    """Queue uploads for scoring on worker processes and track their state on disk"""
+
+    def __init__(self, root=None, max_workers=None, cache_path=None, chunksize=DEFAULT_CHUNKSIZE):
+        self.root = root or data_dir('jobs')
+        os.makedirs(self.root, exist_ok=True)
+        self.cache_path = cache_path
+        self.chunksize = chunksize
+        self.max_workers = max_workers or os.cpu_count()
+        # spawn, not fork: the server process runs threads that must not be cloned
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+        self._mark_interrupted()
+
+    def _job_dir(self, job_id):
+        return os.path.join(self.root, job_id)
+
+    def _mark_interrupted(self):
+        # Jobs left active by a server process that has since exited will never finish
+        for job in self.list():
+            if job.active and not (job.owner_pid and _pid_alive(job.owner_pid)):
+                job.status = INTERRUPTED
+                job.finished = time.time()
+                _write_status(self._job_dir(job.id), job)
+
+    def submit(self, fileobj, filename, judge, judge_config=None):
+        """Copy ``fileobj`` to the job directory, queue it and return the job id"""
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = self._job_dir(job_id)
+        os.makedirs(job_dir)
+        fileobj.seek(0)
+        with open(_input_path(job_dir, filename), 'wb') as f:
+            shutil.copyfileobj(fileobj, f, 1024 * 1024)
+        job = Job(id=job_id, filename=filename, judge=judge, submitted=time.time(), owner_pid=os.getpid())
+        _write_status(job_dir, job)
+        if judge_config is not None:
+            # Each worker process has its own rate limiters, so each gets an equal share
+            judge_config = judge_config.split_rate_limits(self.max_workers)
+        self._executor.submit(_run_job, job_dir, judge_config, self.cache_path, self.chunksize)
+        return job_id
+
+    def get(self, job_id):
+        return _read_status(self._job_dir(job_id))
+
+    def list(self):
+        """All known jobs, oldest first"""
+        jobs = []
+        for path in glob.glob(os.path.join(self.root, '*', 'status.json')):
+            try:
+                jobs.append(_read_status(os.path.dirname(path)))
+            except (OSError, ValueError):
+                continue
+        return sorted(jobs, key=lambda job: job.submitted)
+
+    def result(self, job_id):
+        """Scored rows written so far; the full dataset once the job is done"""
+        return concat_scored([pd.read_pickle(path) for path in _part_paths(self._job_dir(job_id))])
+
+    def delete(self, job_id):
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
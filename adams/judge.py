@@ -0,0 +1,328 @@
+"""Asynchronous client for OpenAI-compatible LLM judge endpoints
+
+Every (Question, Reference_Answer, Model_Answer) triple is sent as one chat
+completion request. Requests share a pooled HTTP session, run under a global
+concurrency limit and a per-judge token-bucket rate limit, and are retried
+with exponential backoff on throttling, server errors, dropped connections
+and malformed replies. Rate limiters are kept per (endpoint, judge) for the
+whole process, so every chunk, session and thread calling the same judge
+shares one budget; separate worker processes need their own share of it
+(``JudgeConfig.split_rate_limits``).
+
+``aiohttp`` is only imported when a client is opened, so the simulated
+scoring path does not need it.
+"""
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from adams.scoring import METRIC_COLUMNS, REQUIRED_COLUMNS
+
+# LLM judge labels offered in the UI and the model names sent to the endpoint
+JUDGE_MODELS = {
+    'Qwen': 'qwen2.5-72b-instruct',
+    'Deepseek': 'deepseek-chat',
+    'Distilled Qwen': 'deepseek-r1-distill-qwen-32b',
+    'Mistral': 'mistral-large-latest',
+    'LLaMA 3.1': 'llama-3.1-70b-instruct',
+}
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+SYSTEM_PROMPT = (
+    "You are an impartial evaluator of retrieval-augmented generation outputs. "
+    "Compare the model answer to the reference answer for the given question and "
+    "rate it from 0 to 10 on each of these metrics: " + ", ".join(METRIC_COLUMNS) + ". "
+    "Reply with a single JSON object mapping each metric name to its score and nothing else."
+)
+
+
+class JudgeError(RuntimeError):
+    """A judgment could not be obtained or parsed"""
+
+
+@dataclass
+class JudgeConfig:
+    """Connection, concurrency and retry settings for a judge endpoint"""
+    base_url: str
+    api_key: str = None
+    concurrency: int = 16
+    max_retries: int = 4
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    timeout: float = 60.0
+    # Requests per second for each judge label; judges not listed use default_rate_limit
+    rate_limits: dict = field(default_factory=dict)
+    default_rate_limit: float = None
+    # Sent with every request for endpoints that support seeded sampling
+    seed: int = None
+
+    @classmethod
+    def from_env(cls):
+        """Build a config from ADAMS_JUDGE_* variables, or None when no endpoint is set
+
+        ``ADAMS_JUDGE_RPS`` is a number for every judge or a JSON object of
+        per-judge limits (see ``parse_rate_limits``).
+        """
+        base_url = os.environ.get('ADAMS_JUDGE_URL')
+        if not base_url:
+            return None
+        rate_limits, default_rate_limit = parse_rate_limits(os.environ.get('ADAMS_JUDGE_RPS'))
+        seed = os.environ.get('ADAMS_JUDGE_SEED')
+        return cls(
+            base_url=base_url,
+            api_key=os.environ.get('ADAMS_JUDGE_API_KEY'),
+            concurrency=int(os.environ.get('ADAMS_JUDGE_CONCURRENCY', 16)),
+            rate_limits=rate_limits,
+            default_rate_limit=default_rate_limit,
+            seed=int(seed) if seed else None,
+        )
+
+    def rate_limit_for(self, judge):
+        return self.rate_limits.get(judge, self.default_rate_limit)
+
+    def split_rate_limits(self, parts):
+        """A copy whose rate limits are ``parts`` equal shares of these, for one of ``parts`` worker processes"""
+        if parts <= 1:
+            return self
+        return replace(
+            self,
+            rate_limits={judge: rate / parts for judge, rate in self.rate_limits.items()},
+            default_rate_limit=self.default_rate_limit / parts if self.default_rate_limit else None,
+        )
+
+
+def parse_rate_limits(text):
+    """``(rate_limits, default_rate_limit)`` from a requests-per-second setting
+
+    ``text`` is empty, a number applying to every judge, or a JSON object
+    mapping judge labels to requests per second, where ``"*"`` covers judges
+    not listed, e.g. ``{"Qwen": 5, "*": 20}``.
+    """
+    if not text or not text.strip():
+        return {}, None
+    try:
+        return {}, float(text)
+    except ValueError:
+        pass
+    try:
+        limits = json.loads(text)
+        if not isinstance(limits, dict):
+            raise ValueError("not a JSON object")
+        limits = {str(judge): float(rate) for judge, rate in limits.items()}
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Rate limit must be a number or a JSON object of judge -> requests/s: {text!r}") from e
+    return limits, limits.pop('*', None)
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` acquisitions per second
+
+    Safe to share between threads and event loops: ``reserve`` takes a token
+    under a thread lock, going into debt when the bucket is empty, and
+    ``acquire`` sleeps on the caller's own loop until that token is due.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token; seconds until it may be used"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate) - 1
+            self.updated = now
+            return max(0.0, -self.tokens / self.rate)
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def rate_limiter(base_url, judge, rate):
+    """The process-wide limiter for ``judge`` at ``base_url``, or None without a ``rate``
+
+    Every client calling the same endpoint and judge shares it, so the limit
+    holds across chunks, sessions and threads. A different ``rate`` starts a
+    new bucket.
+    """
+    if not rate:
+        return None
+    key = (base_url.rstrip('/'), judge)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None or limiter.rate != rate:
+            limiter = _limiters[key] = RateLimiter(rate)
+        return limiter
+
+
+def build_messages(question, reference, answer):
+    """Chat messages asking the judge to score one triple"""
+    user = (
+        f"Question:\n{question}\n\n"
+        f"Reference answer:\n{reference}\n\n"
+        f"Model answer:\n{answer}"
+    )
+    return [
+        {'role': 'system', 'content': SYSTEM_PROMPT},
+        {'role': 'user', 'content': user},
+    ]
+
+
+def parse_scores(content):
+    """Extract the metric scores, in METRIC_COLUMNS order, from a judge reply"""
+    start, end = content.find('{'), content.rfind('}')
+    if start < 0 or end < start:
+        raise JudgeError(f"Judge reply contains no JSON object: {content[:200]!r}")
+    try:
+        payload = json.loads(content[start:end + 1])
+        scores = [float(payload[col]) for col in METRIC_COLUMNS]
+    except (ValueError, KeyError, TypeError) as e:
+        raise JudgeError(f"Malformed judge reply: {e}") from e
+    return [min(max(score, 0.0), 10.0) for score in scores]
+
+
+class JudgeClient:
+    """Pooled, rate-limited async judge client; use as ``async with JudgeClient(config)``"""
+
+    def __init__(self, config):
+        self.config = config
+        self.latencies = []
+        self.retries = 0
+        self._session = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.config.concurrency, keepalive_timeout=60)
+        headers = {'Content-Type': 'application/json'}
+        if self.config.api_key:
+            headers['Authorization'] = f"Bearer {self.config.api_key}"
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+        self._session = None
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.config.backoff_max)
+        delay = min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def judge_one(self, judge, question, reference, answer):
+        """Score a single triple, retrying transient failures"""
+        import aiohttp
+
+        body = {
+            'model': JUDGE_MODELS.get(judge, judge),
+            'messages': build_messages(question, reference, answer),
+            'temperature': 0,
+            'response_format': {'type': 'json_object'},
+        }
+        if self.config.seed is not None:
+            body['seed'] = self.config.seed
+        url = self.config.base_url.rstrip('/') + '/chat/completions'
+        limiter = rate_limiter(self.config.base_url, judge, self.config.rate_limit_for(judge))
+
+        for attempt in range(self.config.max_retries + 1):
+            if limiter is not None:
+                await limiter.acquire()
+            retry_after = None
+            start = time.perf_counter()
+            try:
+                async with self._session.post(url, json=body) as resp:
+                    if resp.status in RETRY_STATUSES:
+                        header = resp.headers.get('Retry-After')
+                        retry_after = float(header) if header and header.isdigit() else None
+                        error = JudgeError(f"Judge endpoint returned HTTP {resp.status}")
+                    else:
+                        resp.raise_for_status()
+                        payload = await resp.json(content_type=None)
+                        self.latencies.append(time.perf_counter() - start)
+                        try:
+                            return parse_scores(payload['choices'][0]['message']['content'])
+                        except (KeyError, IndexError, TypeError) as e:
+                            raise JudgeError(f"Malformed judge response: {e!r}") from e
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = JudgeError(f"Judge request failed: {e}")
+            except (JudgeError, ValueError) as e:
+                # A reply that is not the requested JSON is usually a one-off; ask again
+                error = e if isinstance(e, JudgeError) else JudgeError(f"Judge response is not JSON: {e}")
+            if attempt < self.config.max_retries:
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+        raise error
+
+    async def judge_many(self, judge, rows, on_progress=None, progress_every=100, on_judged=None):
+        """Score a sequence of (question, reference, answer) triples
+
+        Returns an (n_rows, n_metrics) array in input order. ``concurrency``
+        workers pull from a shared queue so memory stays flat for long inputs.
+        ``on_judged(indices, scores)`` receives finished rows every
+        ``progress_every`` judgments, and once more if a row finally fails, so
+        a caller can keep what was already paid for.
+        """
+        matrix = np.empty((len(rows), len(METRIC_COLUMNS)))
+        next_index = iter(range(len(rows)))
+        done = 0
+        finished = []
+
+        def flush():
+            if on_judged is not None and finished:
+                indices = np.array(finished)
+                finished.clear()
+                on_judged(indices, matrix[indices])
+
+        async def worker():
+            nonlocal done
+            for i in next_index:
+                matrix[i] = await self.judge_one(judge, *rows[i])
+                finished.append(i)
+                done += 1
+                if done % progress_every == 0:
+                    flush()
+                    if on_progress is not None:
+                        on_progress(done)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.config.concurrency, len(rows)) or 1)))
+        finally:
+            flush()
+        if on_progress is not None and done % progress_every:
+            on_progress(done)
+        return matrix
+
+
+def judge_metric_matrix(df, judge, config, on_progress=None, on_judged=None):
+    """Synchronously score every row of ``df`` against a live judge endpoint
+
+    See ``JudgeClient.judge_many`` for ``on_judged``.
+    """
+    rows = list(zip(*(df[col].tolist() for col in REQUIRED_COLUMNS)))
+
+    async def run():
+        async with JudgeClient(config) as client:
+            return await client.judge_many(judge, rows, on_progress=on_progress, on_judged=on_judged)
+
+    return asyncio.run(run())
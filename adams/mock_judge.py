@@ -0,0 +1,125 @@
+"""Local stand-in for an OpenAI-compatible judge endpoint
+
+Serves ``POST /v1/chat/completions`` with plausible metric scores derived from
+the request content, after a configurable simulated latency. A fraction of
+requests can be failed with HTTP 503, and another answered with prose instead
+of JSON, to exercise client retries.
+
+    python -m adams.mock_judge --port 8089 --latency 0.05 --jitter 0.02
+    ADAMS_JUDGE_URL=http://127.0.0.1:8089/v1 streamlit run adams_app.py
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+
+from adams.scoring import METRIC_SPECS
+
+
+def mock_scores(content):
+    """Deterministic pseudo-scores within each metric's simulated range"""
+    digest = hashlib.blake2b(content.encode('utf-8'), digest_size=2 * len(METRIC_SPECS)).digest()
+    scores = {}
+    for j, (col, low, high, _) in enumerate(METRIC_SPECS):
+        fraction = int.from_bytes(digest[2 * j:2 * j + 2], 'big') / 0xFFFF
+        scores[col] = round(low + (high - low) * fraction, 2)
+    return scores
+
+
+def create_app(latency=0.05, jitter=0.0, failure_rate=0.0, malformed_rate=0.0):
+    """Build the aiohttp application"""
+    from aiohttp import web
+
+    async def chat_completions(request):
+        body = await request.json()
+        delay = max(0.0, random.gauss(latency, jitter)) if jitter else latency
+        await asyncio.sleep(delay)
+        if failure_rate and random.random() < failure_rate:
+            return web.json_response({'error': {'message': 'overloaded'}}, status=503)
+        if malformed_rate and random.random() < malformed_rate:
+            content = "The model answer looks mostly correct."
+        else:
+            content = json.dumps(mock_scores(body['messages'][-1]['content']))
+        return web.json_response({
+            'id': 'mock-judgment',
+            'object': 'chat.completion',
+            'model': body.get('model', 'mock'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+        })
+
+    app = web.Application()
+    app.router.add_post('/v1/chat/completions', chat_completions)
+    return app
+
+
+class BackgroundServer:
+    """Run the mock judge on a daemon thread; used by benchmarks"""
+
+    def __init__(self, host='127.0.0.1', port=0, **app_options):
+        self.host = host
+        self.port = port
+        self.app_options = app_options
+        self._loop = None
+        self._runner = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/v1"
+
+    def _serve(self):
+        from aiohttp import web
+
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._runner = web.AppRunner(create_app(**self.app_options))
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, self.host, self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = self._runner.addresses[0][1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    from aiohttp import web
+
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible ADAMS judge server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.05, help="Mean response delay in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Std deviation of the response delay")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument('--malformed-rate', type=float, default=0.0,
+                        help="Fraction of requests answered with a reply that is not JSON")
+    args = parser.parse_args(argv)
+    web.run_app(create_app(args.latency, args.jitter, args.failure_rate, args.malformed_rate),
+                host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""Fit per-metric weights to human reviewer labels
+
+Labels are joined to a scored dataset on the text-row keys, then weights
+are fitted over its stored metric matrix:
+
+* ``nnls``: non-negative least squares with a free intercept. The matrix
+  is reduced to its 7x7 Gram matrix in one pass, so the solver never sees
+  the rows and 1M labels fit in well under a second.
+* ``rank``: maximizes the Spearman correlation between weighted scores and
+  labels. It starts from NNLS on the label ranks and refines with batches
+  of candidate weight vectors scored together on a row sample.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from adams.compare import align_rows
+from adams.ingest import DEFAULT_CHUNKSIZE, iter_chunks
+from adams.scoring import METRIC_COLUMNS, REQUIRED_COLUMNS, row_keys, weighted_scores
+
+DEFAULT_LABEL_COLUMN = 'Human_Score'
+FIT_MODES = {'nnls': "Least squares (non-negative)", 'rank': "Rank correlation"}
+
+RANK_SAMPLE_ROWS = 100_000
+RANK_ROUNDS = 6
+RANK_CANDIDATES = 32
+
+
+class LabelError(ValueError):
+    """Labels could not be read or matched to the dataset"""
+
+
+def read_labels(file, name, label_column=DEFAULT_LABEL_COLUMN, chunksize=DEFAULT_CHUNKSIZE):
+    """``(row_keys, labels)`` from a labelled CSV/JSON/Parquet file; non-numeric labels are dropped"""
+    keys, labels = [], []
+    for chunk, _ in iter_chunks(file, name, chunksize, columns=[*REQUIRED_COLUMNS, label_column]):
+        values = pd.to_numeric(chunk[label_column], errors='coerce').to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        keys.append(row_keys(chunk)[valid])
+        labels.append(values[valid])
+    if not keys:
+        return np.empty(0, dtype=np.uint64), np.empty(0)
+    return np.concatenate(keys), np.concatenate(labels)
+
+
+def rank_columns(values):
+    """Ranks down each column, ties sharing their average rank, as Spearman's correlation needs
+
+    Labels and 2-decimal scores are full of ties; ranking them by position
+    would make the correlation depend on row order.
+    """
+    from scipy.stats import rankdata
+
+    return rankdata(values.reshape(len(values), -1), axis=0)
+
+
+def pearson_columns(values, target):
+    """Pearson correlation of each column of ``values`` with ``target``"""
+    values = values.reshape(len(values), -1)
+    centered = values - values.mean(axis=0)
+    target = target - target.mean()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return centered.T @ target / (np.linalg.norm(centered, axis=0) * np.linalg.norm(target))
+
+
+def spearman_columns(values, target_ranks):
+    return pearson_columns(rank_columns(values), target_ranks)
+
+
+def fit_nnls(matrix, labels):
+    """Non-negative weights ``w`` minimizing ``|a + matrix @ w - labels|`` for a free intercept ``a``
+
+    With ``G = Xc'Xc = L L'`` the residual equals ``|L'w - L^-1 Xc'yc|`` up to a
+    constant, so NNLS runs on a k x k system built from the Gram matrix.
+    """
+    from scipy.linalg import cho_factor, solve_triangular
+    from scipy.optimize import nnls
+
+    x = matrix.astype(np.float64, copy=False)
+    mean = x.mean(axis=0)
+    gram = x.T @ x - len(x) * np.outer(mean, mean)
+    rhs = x.T @ labels - mean * labels.sum()
+    # A small ridge keeps the factorization defined when a metric is constant
+    gram[np.diag_indices_from(gram)] += 1e-9 * max(np.trace(gram), 1.0)
+    lower, _ = cho_factor(gram, lower=True)
+    lower = np.tril(lower)
+    weights, _ = nnls(lower.T, solve_triangular(lower, rhs, lower=True))
+    return weights
+
+
+def fit_rank(matrix, labels, seed=0):
+    """Non-negative weights maximizing Spearman correlation with ``labels``"""
+    rng = np.random.default_rng(seed)
+    if len(matrix) > RANK_SAMPLE_ROWS:
+        sample = rng.choice(len(matrix), RANK_SAMPLE_ROWS, replace=False)
+        matrix, labels = matrix[sample], labels[sample]
+    x = matrix.astype(np.float64, copy=False)
+    target = rank_columns(labels)[:, 0]
+
+    best = fit_nnls(x, target)
+    if not best.any():
+        best = np.ones(x.shape[1])
+    best = best / best.sum()
+    best_score = spearman_columns(x @ best, target)[0]
+    spread = 1.0
+    for _ in range(RANK_ROUNDS):
+        # Candidates around the incumbent on the weight simplex, scored as one matrix
+        candidates = best[:, None] * rng.lognormal(0.0, spread, size=(len(best), RANK_CANDIDATES))
+        candidates /= candidates.sum(axis=0)
+        scores = spearman_columns(x @ candidates, target)
+        top = int(np.nanargmax(scores))
+        if scores[top] > best_score:
+            best, best_score = candidates[:, top], scores[top]
+        spread /= 2
+    return best
+
+
+@dataclass(frozen=True)
+class WeightFit:
+    """Fitted weights (max 1) per metric column and how well the scores track the labels"""
+    mode: str
+    weights: np.ndarray
+    n_rows: int
+    pearson: float
+    spearman: float
+    baseline_pearson: float
+    baseline_spearman: float
+
+    def profile(self):
+        """Weights by metric column, on the sliders' 0-1 scale"""
+        return dict(zip(METRIC_COLUMNS, np.round(self.weights, 2).tolist()))
+
+
+def fit_weights(dataset, keys, labels, mode='nnls', baseline=None):
+    """Fit weights for ``dataset`` from labelled rows ``(keys, labels)``
+
+    ``baseline`` weights (default: the judged weights) are scored alongside
+    for comparison.
+    """
+    if mode not in FIT_MODES:
+        raise ValueError(f"Unknown fit mode: {mode}")
+    pos_data, pos_labels = align_rows(dataset.row_keys, keys)
+    if len(pos_data) < 2:
+        raise LabelError(f"Only {len(pos_data)} labelled rows match the dataset")
+    matrix = dataset.metrics[pos_data]
+    y = labels[pos_labels]
+
+    weights = fit_nnls(matrix, y) if mode == 'nnls' else fit_rank(matrix, y)
+    if weights.max() > 0:
+        weights = weights / weights.max()
+
+    target_ranks = rank_columns(y)[:, 0]
+    scores = np.column_stack([weighted_scores(matrix, weights), weighted_scores(matrix, baseline)])
+    pearson = pearson_columns(scores, y)
+    spearman = spearman_columns(scores, target_ranks)
+    return WeightFit(
+        mode=mode,
+        weights=weights,
+        n_rows=len(pos_data),
+        pearson=float(pearson[0]),
+        spearman=float(spearman[0]),
+        baseline_pearson=float(pearson[1]),
+        baseline_spearman=float(spearman[1]),
+    )
@@ -0,0 +1,14 @@
+"""Locations of ADAMS data on disk"""
+import os
+
+
+def adams_home():
+    """Root directory for persistent ADAMS data (``ADAMS_HOME``, default ``~/.adams``)"""
+    return os.environ.get('ADAMS_HOME', os.path.join(os.path.expanduser('~'), '.adams'))
+
+
+def data_dir(*parts):
+    """Return ``adams_home()/parts...``, creating it if needed"""
+    path = os.path.join(adams_home(), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
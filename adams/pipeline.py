@@ -0,0 +1,109 @@
+"""End-to-end scoring of an uploaded file, one chunk at a time"""
+import time
+
+import pandas as pd
+
+from adams.cache import judgment_keys
+from adams.ingest import DEFAULT_CHUNKSIZE, file_size, iter_chunks
+from adams.profiler import section
+from adams.scoring import DEFAULT_SEED, OUTPUT_COLUMNS, build_scored_frame, row_keys, simulate_metric_matrix
+
+
+def judge_id(selected_llm, judge_config=None, seed=DEFAULT_SEED):
+    """Identity of the scoring backend, as used in judgment cache keys
+
+    A non-default seed (``seed`` for the simulator, ``judge_config.seed`` for
+    a live judge) is part of the identity, as it changes the scores.
+    """
+    if judge_config is None:
+        backend = f"simulated:{selected_llm}"
+    else:
+        backend = f"{judge_config.base_url}:{selected_llm}"
+        seed = DEFAULT_SEED if judge_config.seed is None else judge_config.seed
+    return backend if seed == DEFAULT_SEED else f"{backend}:seed={seed}"
+
+
+def _metric_matrix(rows, selected_llm, judge_config, on_progress, seed, on_judged=None):
+    if judge_config is None:
+        return simulate_metric_matrix(row_keys(rows), selected_llm, seed)
+    from adams.judge import judge_metric_matrix
+
+    return judge_metric_matrix(rows, selected_llm, judge_config, on_progress=on_progress, on_judged=on_judged)
+
+
+def iter_scored_chunks(file, name, selected_llm, chunksize=DEFAULT_CHUNKSIZE, on_progress=None,
+                       judge_config=None, cache=None, seed=DEFAULT_SEED):
+    """Yield ``(scored_chunk, rows_done, fraction)`` for each chunk of ``file``
+
+    ``fraction`` is measured in bytes of input consumed. With a ``judge_config``
+    the metrics come from the live judge endpoint instead of the simulator.
+    With a ``cache`` and a live judge only rows without a stored judgment are
+    sent to the judge, and judged rows are stored as they finish, so a failed
+    run resumes where it stopped. Simulated scores never use the cache: they
+    depend only on each row's text, the judge and ``seed``, so recomputing
+    them is cheaper than a lookup, and any split of the file into chunks or
+    processes scores identically.
+    ``on_progress(rows_done, fraction)`` additionally reports progress inside
+    a chunk while a live judge is working through it.
+    """
+    total_bytes = file_size(file) or 1
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    backend = judge_id(selected_llm, judge_config, seed)
+    if judge_config is None:
+        cache = None
+    rows_done = 0
+    fraction = 0.0
+    chunks = iter_chunks(file, name, chunksize)
+    while True:
+        with section('ingest'):
+            item = next(chunks, None)
+        if item is None:
+            break
+        chunk, bytes_read = item
+        chunk_progress = None
+        if on_progress is not None:
+            chunk_progress = lambda done, base=rows_done, at=fraction: on_progress(base + done, at)
+
+        with section('score'):
+            if cache is None:
+                matrix = _metric_matrix(chunk, selected_llm, judge_config, chunk_progress, seed)
+            else:
+                keys = judgment_keys(backend, chunk, cache.metrics)
+                matrix, hit_mask = cache.get_many(keys)
+                if not hit_mask.all():
+                    miss_mask = ~hit_mask
+                    miss_keys = [key for key, miss in zip(keys, miss_mask) if miss]
+                    store = lambda indices, scores, miss_keys=miss_keys: cache.put_many(
+                        [miss_keys[i] for i in indices], scores)
+                    matrix[miss_mask] = _metric_matrix(chunk[miss_mask], selected_llm, judge_config,
+                                                       chunk_progress, seed, store)
+            scored = build_scored_frame(chunk, matrix, selected_llm, timestamp)
+
+        rows_done += len(chunk)
+        fraction = min(bytes_read / total_bytes, 1.0)
+        yield scored, rows_done, fraction
+
+
+def concat_scored(chunks):
+    """Concatenate scored chunks into one frame with a fresh RangeIndex"""
+    if not chunks:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def score_upload(file, name, selected_llm, chunksize=DEFAULT_CHUNKSIZE, on_progress=None,
+                 judge_config=None, cache=None, seed=DEFAULT_SEED):
+    """Stream ``file`` through the scoring engine and return the scored frame
+
+    ``on_progress(rows_done, fraction)`` is called after every chunk; see
+    ``iter_scored_chunks`` for the other options.
+    """
+    scored_chunks = []
+    for scored, rows_done, fraction in iter_scored_chunks(file, name, selected_llm, chunksize, on_progress,
+                                                          judge_config, cache, seed):
+        scored_chunks.append(scored)
+        if on_progress is not None:
+            on_progress(rows_done, fraction)
+    return concat_scored(scored_chunks)
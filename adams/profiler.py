@@ -0,0 +1,241 @@
+"""Opt-in timing of the named sections of each app rerun
+
+Hot paths are wrapped in ``section(name)``, which costs one context-variable
+lookup while no profiler is active. When profiling is turned on the app
+calls ``Profiler.start_run`` at the top of every rerun, which makes that
+session's profiler the active one; each section entered during the rerun
+then records its wall time and, with ``track_memory``, its net tracemalloc
+allocation. ``payload(name, obj)`` records the size of data handed to the
+browser or to a download.
+
+The last runs are kept for the diagnostics panel, and totals since the
+profiler was created can be exported as JSON or in the Prometheus text
+exposition format.
+
+tracemalloc slows allocations in the whole process, not just one session,
+so it runs only while at least one profiler tracks memory: profilers are
+counted when ``track_memory`` is turned on and uncounted when it is turned
+off or the profiler is garbage collected with its session.
+"""
+import contextlib
+import contextvars
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import deque
+from dataclasses import asdict, dataclass, field
+
+DEFAULT_HISTORY = 20
+
+_active = contextvars.ContextVar('adams_profiler', default=None)
+
+# Profilers tracking memory; tracing runs while this is non-zero
+_tracing_users = 0
+# Whether tracing was started here (not by PYTHONTRACEMALLOC or another tool)
+_started_tracing = False
+_tracing_lock = threading.Lock()
+
+
+def _acquire_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+
+
+def _release_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def tracing_users():
+    """Number of profilers currently tracking memory"""
+    return _tracing_users
+
+
+@dataclass
+class SectionStats:
+    """Accumulated measurements of one section"""
+    calls: int = 0
+    seconds: float = 0.0
+    payload_bytes: int = 0
+    memory_bytes: int = 0
+
+
+@dataclass
+class RunProfile:
+    """Sections of one rerun; ``seconds`` stays None until the run ends"""
+    started: float
+    seconds: float = None
+    sections: dict = field(default_factory=dict)
+
+    def as_dict(self):
+        return {
+            'started': self.started,
+            'seconds': self.seconds,
+            'sections': {name: asdict(stats) for name, stats in self.sections.items()},
+        }
+
+
+def payload_size(obj):
+    """Approximate bytes of a frame, array, string or bytes payload"""
+    if obj is None:
+        return 0
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return len(obj)
+    if isinstance(obj, str):
+        return len(obj.encode('utf-8'))
+    if hasattr(obj, 'memory_usage'):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    return int(getattr(obj, 'nbytes', 0))
+
+
+class Profiler:
+    """Section timings of one session's reruns"""
+
+    def __init__(self, track_memory=False, history=DEFAULT_HISTORY):
+        self._tracing = None
+        self.track_memory = track_memory
+        self.runs = deque(maxlen=history)
+        self.totals = {}
+        self.reruns = 0
+        self.rerun_seconds = 0.0
+        self._current = None
+        self._started = None
+
+    @property
+    def track_memory(self):
+        return self._tracing is not None
+
+    @track_memory.setter
+    def track_memory(self, enabled):
+        if enabled and self._tracing is None:
+            _acquire_tracing()
+            # Released when tracking is turned off or the profiler is collected
+            self._tracing = weakref.finalize(self, _release_tracing)
+        elif not enabled and self._tracing is not None:
+            self._tracing()
+            self._tracing = None
+
+    def start_run(self):
+        """Start timing a rerun and make this the active profiler
+
+        A run interrupted by ``st.rerun``/``st.stop`` is closed here.
+        """
+        self.end_run()
+        self._current = RunProfile(time.time())
+        self._started = time.perf_counter()
+        _active.set(self)
+
+    def end_run(self):
+        if self._current is None:
+            return
+        self._current.seconds = time.perf_counter() - self._started
+        self.reruns += 1
+        self.rerun_seconds += self._current.seconds
+        self.runs.append(self._current)
+        self._current = None
+
+    @classmethod
+    def from_env(cls):
+        """A profiler when ``ADAMS_PROFILE`` is set (``memory`` also traces allocations), else None"""
+        setting = os.environ.get('ADAMS_PROFILE', '').strip().lower()
+        if setting in ('', '0', 'false', 'off'):
+            return None
+        return cls(track_memory=setting == 'memory')
+
+    @staticmethod
+    def stop():
+        """Deactivate whichever profiler is active in this context"""
+        _active.set(None)
+
+    @property
+    def last_run(self):
+        return self.runs[-1] if self.runs else None
+
+    def record(self, name, seconds=0.0, payload_bytes=0, memory_bytes=0, calls=1):
+        targets = [self.totals] if self._current is None else [self.totals, self._current.sections]
+        for sections in targets:
+            stats = sections.get(name)
+            if stats is None:
+                stats = sections[name] = SectionStats()
+            stats.calls += calls
+            stats.seconds += seconds
+            stats.payload_bytes += payload_bytes
+            stats.memory_bytes += memory_bytes
+
+    @contextlib.contextmanager
+    def section(self, name):
+        memory = self.track_memory and tracemalloc.is_tracing()
+        before = tracemalloc.get_traced_memory()[0] if memory else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, seconds=time.perf_counter() - start,
+                        memory_bytes=tracemalloc.get_traced_memory()[0] - before if memory else 0)
+
+    def to_json(self):
+        """Totals and recent runs as a JSON-serializable dict"""
+        return {
+            'reruns': self.reruns,
+            'rerun_seconds': self.rerun_seconds,
+            'track_memory': self.track_memory,
+            'totals': {name: asdict(stats) for name, stats in self.totals.items()},
+            'runs': [run.as_dict() for run in self.runs],
+        }
+
+    def to_prometheus(self, prefix='adams'):
+        """Totals in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_reruns_total Profiled app reruns.",
+            f"# TYPE {prefix}_reruns_total counter",
+            f"{prefix}_reruns_total {self.reruns}",
+            f"# HELP {prefix}_rerun_seconds_total Wall time of profiled app reruns.",
+            f"# TYPE {prefix}_rerun_seconds_total counter",
+            f"{prefix}_rerun_seconds_total {self.rerun_seconds:.6f}",
+        ]
+        metrics = [
+            ('calls_total', 'counter', "Times each section was entered.", lambda stats: str(stats.calls)),
+            ('seconds_total', 'counter', "Wall time spent in each section.", lambda stats: f"{stats.seconds:.6f}"),
+            ('payload_bytes_total', 'counter', "Bytes of payloads recorded by each section.",
+             lambda stats: str(stats.payload_bytes)),
+        ]
+        if self.track_memory:
+            # Net allocations can be negative, so this is a gauge
+            metrics.append(('memory_delta_bytes', 'gauge', "Net traced allocations of each section.",
+                            lambda stats: str(stats.memory_bytes)))
+        for metric, kind, help_text, value in metrics:
+            name = f"{prefix}_section_{metric}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for section, stats in sorted(self.totals.items()):
+                lines.append(f'{name}{{section="{_label(section)}"}} {value(stats)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def section(name):
+    """Time the enclosed block under ``name`` if a profiler is active"""
+    profiler = _active.get()
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.section(name)
+
+
+def payload(name, obj):
+    """Record the size of ``obj`` under ``name`` if a profiler is active; returns ``obj``"""
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.record(name, payload_bytes=payload_size(obj), calls=0)
+    return obj
@@ -0,0 +1,228 @@
+"""Named, versioned weight profiles
+
+A profile maps the Configuration page's metric names to weights. Profiles
+are immutable: saving under an existing name adds a new version, written
+once to ``ADAMS_HOME/profiles/<name>/v<NNNN>.json``. The built-in
+``general``, ``clinical`` and ``legal`` profiles are always available as
+version 1.
+
+``ProfileScores`` keeps the ADAMS scores of one dataset under several
+weight sets, computed together in one matrix product, so switching
+profiles on a loaded dataset is a lookup.
+"""
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from adams.paths import data_dir
+from adams.profiler import section
+from adams.scoring import METRIC_COLUMNS, METRIC_WEIGHTS
+
+# Configuration page metrics: sample score and default weight
+DEFAULT_METRICS = {
+    'Factual Accuracy': {'score': 8.7, 'weight': 0.9},
+    'Coherence': {'score': 9.2, 'weight': 0.8},
+    'Relevance': {'score': 8.9, 'weight': 0.85},
+    'Completeness': {'score': 7.8, 'weight': 0.7},
+    'Citation Quality': {'score': 8.1, 'weight': 0.75},
+    'Domain Specificity': {'score': 8.5, 'weight': 0.8},
+    'Clarity': {'score': 9.0, 'weight': 0.7},
+    'Consistency': {'score': 8.3, 'weight': 0.6},
+    'Novelty': {'score': 7.5, 'weight': 0.5},
+    'Readability': {'score': 8.8, 'weight': 0.6},
+    'Technical Depth': {'score': 8.0, 'weight': 0.7},
+    'Evidence Support': {'score': 8.4, 'weight': 0.8},
+    'Contextual Fit': {'score': 8.6, 'weight': 0.7},
+    'Timeliness': {'score': 7.9, 'weight': 0.6},
+    'Bias Detection': {'score': 8.2, 'weight': 0.7}
+}
+
+BUILTIN_PROFILES = {
+    'general': {name: metric['weight'] for name, metric in DEFAULT_METRICS.items()},
+    # Patient safety first: facts, evidence and up-to-date guidance
+    'clinical': {
+        'Factual Accuracy': 1.0, 'Coherence': 0.7, 'Relevance': 0.85, 'Completeness': 0.8,
+        'Citation Quality': 0.9, 'Domain Specificity': 0.9, 'Clarity': 0.75, 'Consistency': 0.8,
+        'Novelty': 0.2, 'Readability': 0.6, 'Technical Depth': 0.7, 'Evidence Support': 1.0,
+        'Contextual Fit': 0.7, 'Timeliness': 0.85, 'Bias Detection': 0.8,
+    },
+    # Traceable sources, complete and consistent answers
+    'legal': {
+        'Factual Accuracy': 0.95, 'Coherence': 0.8, 'Relevance': 0.85, 'Completeness': 0.9,
+        'Citation Quality': 1.0, 'Domain Specificity': 0.85, 'Clarity': 0.8, 'Consistency': 0.9,
+        'Novelty': 0.2, 'Readability': 0.6, 'Technical Depth': 0.65, 'Evidence Support': 0.95,
+        'Contextual Fit': 0.75, 'Timeliness': 0.6, 'Bias Detection': 0.7,
+    },
+}
+
+
+class ProfileNotFoundError(KeyError):
+    """No profile (or profile version) with the requested name"""
+
+
+def row_weights(weights):
+    """Weights of the per-row metric columns, from weights keyed by display name
+
+    Metrics without a matching entry keep their judged weight.
+    """
+    return tuple(
+        float(weights.get(col.replace('_', ' '), default))
+        for col, default in zip(METRIC_COLUMNS, METRIC_WEIGHTS)
+    )
+
+
+@dataclass(frozen=True)
+class WeightProfile:
+    """One immutable version of a named weight set"""
+    name: str
+    version: int
+    weights: tuple
+    created: float = 0.0
+    note: str = ''
+    builtin: bool = field(default=False, compare=False)
+
+    @property
+    def label(self):
+        return f"{self.name} v{self.version}"
+
+    @property
+    def key(self):
+        return (self.name, self.version)
+
+    def as_dict(self):
+        """Weights keyed by metric name"""
+        return dict(self.weights)
+
+    def row_weights(self):
+        return row_weights(self.as_dict())
+
+
+def _slug(name):
+    slug = re.sub(r'[^a-z0-9_-]+', '-', name.strip().lower()).strip('-')
+    if not slug:
+        raise ValueError(f"Invalid profile name: {name!r}")
+    return slug
+
+
+class ProfileStore:
+    """Profiles persisted locally as write-once JSON files, plus the built-ins"""
+
+    def __init__(self, root=None):
+        self.root = root or data_dir('profiles')
+        self.builtins = {
+            name: WeightProfile(name, 1, tuple(weights.items()), builtin=True)
+            for name, weights in BUILTIN_PROFILES.items()
+        }
+
+    def _dir(self, name):
+        return os.path.join(self.root, _slug(name))
+
+    def _read(self, path):
+        with open(path) as f:
+            data = json.load(f)
+        return WeightProfile(data['name'], data['version'], tuple(data['weights'].items()),
+                             data.get('created', 0.0), data.get('note', ''))
+
+    def versions(self, name):
+        """Every version of ``name``, oldest first"""
+        profiles = [self.builtins[name]] if name in self.builtins else []
+        directory = self._dir(name)
+        if os.path.isdir(directory):
+            for entry in sorted(os.listdir(directory)):
+                if entry.startswith('v') and entry.endswith('.json'):
+                    try:
+                        profiles.append(self._read(os.path.join(directory, entry)))
+                    except (OSError, ValueError, KeyError):
+                        continue
+        return profiles
+
+    def names(self):
+        """Built-in names first, then saved ones alphabetically"""
+        saved = []
+        if os.path.isdir(self.root):
+            for slug in sorted(os.listdir(self.root)):
+                versions = self.versions(slug)
+                if versions and versions[-1].name not in self.builtins and versions[-1].name not in saved:
+                    saved.append(versions[-1].name)
+        return [*self.builtins, *saved]
+
+    def get(self, name, version=None):
+        """Latest version of ``name``, or a specific one"""
+        versions = self.versions(name)
+        if version is not None:
+            versions = [profile for profile in versions if profile.version == version]
+        if not versions:
+            raise ProfileNotFoundError(name if version is None else f"{name} v{version}")
+        return versions[-1]
+
+    def latest(self):
+        """The latest version of every profile"""
+        return [self.get(name) for name in self.names()]
+
+    def save(self, name, weights, note=''):
+        """Store ``weights`` as the next version of ``name`` and return it"""
+        name = name.strip()
+        directory = self._dir(name)
+        os.makedirs(directory, exist_ok=True)
+        version = max((profile.version for profile in self.versions(name)), default=0) + 1
+        while True:
+            profile = WeightProfile(name, version, tuple((key, float(value)) for key, value in weights.items()),
+                                    time.time(), note)
+            try:
+                # Exclusive create: a version, once written, is never replaced
+                with open(os.path.join(directory, f"v{version:04d}.json"), 'x') as f:
+                    json.dump({'name': profile.name, 'version': profile.version, 'weights': profile.as_dict(),
+                               'created': profile.created, 'note': profile.note}, f, indent=2)
+                return profile
+            except FileExistsError:
+                version += 1
+
+
+class ProfileScores:
+    """ADAMS scores of one dataset under several weight sets (small LRU)
+
+    Missing weight sets are computed together as one ``weights @ metrics.T``
+    product, rounded to two decimals like freshly scored rows, without
+    consulting the judge again. Each result shares every array of the
+    dataset but its scores; the judged weights return the dataset itself.
+    """
+
+    def __init__(self, dataset, max_entries=16):
+        self.dataset = dataset
+        self.max_entries = max_entries
+        self._scored = OrderedDict()
+
+    def precompute(self, weight_sets):
+        keys = [tuple(weights) for weights in weight_sets]
+        missing = [key for key in dict.fromkeys(keys) if key not in self._scored]
+        if missing:
+            with section('profiles.rescore'):
+                weights = np.array(missing, dtype=self.dataset.metrics.dtype)
+                totals = weights.sum(axis=1, keepdims=True)
+                weights = np.divide(weights, totals, out=np.zeros_like(weights), where=totals != 0)
+                scores = np.round(weights @ self.dataset.metrics.T, 2)
+            for key, row in zip(missing, scores):
+                if np.array_equal(key, METRIC_WEIGHTS):
+                    self._scored[key] = self.dataset
+                else:
+                    self._scored[key] = self.dataset.with_scores(row)
+        for key in keys:
+            self._scored.move_to_end(key)
+        while len(self._scored) > max(self.max_entries, len(keys)):
+            self._scored.popitem(last=False)
+
+    def get(self, weights):
+        """The dataset re-scored with ``weights`` (per-row metric weights)"""
+        key = tuple(weights)
+        if key not in self._scored:
+            self.precompute([key])
+        self._scored.move_to_end(key)
+        return self._scored[key]
+
+    def __contains__(self, weights):
+        return tuple(weights) in self._scored
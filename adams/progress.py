@@ -0,0 +1,58 @@
+"""Progress, throughput and ETA reporting for scoring runs"""
+import time
+
+
+def format_duration(seconds):
+    """Compact h/m/s rendering of a duration"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+class ProgressTracker:
+    """Rows done, rows/second and ETA of one scoring run
+
+    ``fraction`` is the share of the input consumed so far (bytes for
+    streamed uploads), which gives an ETA without knowing the row count.
+    """
+
+    def __init__(self, judge, clock=time.perf_counter):
+        self.judge = judge
+        self._clock = clock
+        self.started = clock()
+        self.rows_done = 0
+        self.fraction = 0.0
+
+    def update(self, rows_done, fraction):
+        self.rows_done = rows_done
+        self.fraction = fraction
+        return self
+
+    @property
+    def elapsed(self):
+        return self._clock() - self.started
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed
+        return self.rows_done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self):
+        """Seconds remaining, or None before any progress is known"""
+        if self.fraction <= 0:
+            return None
+        return self.elapsed * (1 - self.fraction) / self.fraction
+
+    def summary(self):
+        eta = self.eta_seconds
+        eta_text = "estimating..." if eta is None else format_duration(eta)
+        return (
+            f"Judge: {self.judge} • {self.rows_done:,} rows scored • "
+            f"{self.rows_per_second:,.0f} rows/s • ETA {eta_text}"
+        )
@@ -0,0 +1,130 @@
+"""Scores, ratings and report payloads shown by the Configuration and Compare pages
+
+Plain Python over the session's metric settings and the cached comparison
+results; nothing here imports pandas or scipy.
+"""
+import math
+import time
+
+from adams.compare import SUMMARY_COLUMNS
+
+REPORT_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Lower bounds of the performance ratings, best first
+RATINGS = [
+    (9.0, "🟢 Excellent"),
+    (8.0, "🔵 Very Good"),
+    (7.0, "🟡 Good"),
+]
+LOWEST_RATING = "🔴 Needs Improvement"
+
+
+def timestamp():
+    return time.strftime(REPORT_TIME_FORMAT)
+
+
+def final_score(metrics_data):
+    """``(score, total_weight)`` of the Configuration page's metric settings
+
+    The score is the weighted average of the metric scores, 0 when every
+    weight is 0.
+    """
+    total_weight = sum(data['weight'] for data in metrics_data.values())
+    weighted_sum = sum(data['score'] * data['weight'] for data in metrics_data.values())
+    return (weighted_sum / total_weight if total_weight > 0 else 0), total_weight
+
+
+def top_metrics(metrics_data, n=3):
+    """The ``n`` highest-weighted ``(name, settings)`` pairs"""
+    return sorted(metrics_data.items(), key=lambda item: item[1]['weight'], reverse=True)[:n]
+
+
+def score_stats(dataset):
+    """Mean, max and min ADAMS score of a ``ScoredDataset``"""
+    scores = dataset.scores
+    if len(scores) == 0:
+        return {'mean': math.nan, 'max': math.nan, 'min': math.nan}
+    return {'mean': float(scores.mean(dtype='float64')), 'max': float(scores.max()), 'min': float(scores.min())}
+
+
+def performance_rating(mean_score):
+    for threshold, rating in RATINGS:
+        if mean_score >= threshold:
+            return rating
+    return LOWEST_RATING
+
+
+def _optional(value):
+    """JSON-friendly float: None for NaN"""
+    return None if math.isnan(value) else value
+
+
+def metric_rows(summary_a, summary_b, comparison, judge_a, judge_b):
+    """Per-column means and differences of two datasets, one dict per ``SUMMARY_COLUMNS`` entry"""
+    rows = []
+    for column, mean_a, mean_b, difference in zip(SUMMARY_COLUMNS, summary_a.mean, summary_b.mean,
+                                                  comparison.difference):
+        rows.append({
+            'Metric': column.replace('_', ' ').title(),
+            f'{judge_a} Avg': round(float(mean_a), 2),
+            f'{judge_b} Avg': round(float(mean_b), 2),
+            'Difference': round(float(difference), 2),
+            'Better Judge': judge_a if difference > 0 else judge_b if difference < 0 else 'Tie'
+        })
+    return rows
+
+
+def config_report(metrics_data, profile, judge):
+    """Payload of the Configuration page's "Save Configuration" download"""
+    return {
+        "metrics": metrics_data,
+        "profile": profile,
+        "final_score": final_score(metrics_data)[0],
+        "llm_judge": judge,
+        "timestamp": timestamp()
+    }
+
+
+def comparison_report(entry_a, entry_b, summary_a, summary_b, comparison, paired, significance,
+                      detailed_metrics, bootstrap=None):
+    """Payload of the Compare page's report download
+
+    ``entry_a``/``entry_b`` are the datasets' store handles; the remaining
+    arguments are the summaries and comparison results already on screen.
+    """
+    winner = {'a': entry_a['llm_judge'], 'b': entry_b['llm_judge']}.get(comparison.winner, "Tie")
+    report = {
+        "comparison_summary": {
+            "dataset_a": {
+                "name": entry_a['name'],
+                "llm_judge": entry_a['llm_judge'],
+                "samples": summary_a.n,
+                "mean_score": summary_a.score('mean'),
+                "processing_time": entry_a['timestamp']
+            },
+            "dataset_b": {
+                "name": entry_b['name'],
+                "llm_judge": entry_b['llm_judge'],
+                "samples": summary_b.n,
+                "mean_score": summary_b.score('mean'),
+                "processing_time": entry_b['timestamp']
+            },
+            "comparison_results": {
+                "score_difference": comparison.score_difference,
+                "statistical_significance": significance,
+                "paired_rows": paired.n_pairs,
+                "paired_p_value": _optional(paired.score_p_value),
+                "winner": winner,
+                "comparison_timestamp": timestamp()
+            }
+        },
+        "detailed_metrics": detailed_metrics
+    }
+    if bootstrap is not None:
+        report["bootstrap"] = {
+            "resamples": bootstrap.n_resamples,
+            "confidence": bootstrap.confidence,
+            "paired": bootstrap.paired,
+            "difference_ci": dict(zip(SUMMARY_COLUMNS, bootstrap.difference.tolist()))
+        }
+    return report
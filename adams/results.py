@@ -0,0 +1,143 @@
+"""Compact columnar representation of a scored dataset
+
+A scored dataset is held as one float32 ``(n_rows, n_metrics)`` matrix, a
+float32 ADAMS score vector, categorical judge and timestamp columns and a
+bool flag array, next to the untouched text columns. ``frame`` is a
+zero-copy pandas view over those arrays for the viewer and exports.
+
+Re-weighted datasets (see ``adams.profiles.ProfileScores``) share every
+array except their new score vector.
+"""
+import copy
+import sys
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from adams.scoring import METRIC_COLUMNS, OUTPUT_COLUMNS, REQUIRED_COLUMNS, row_keys
+
+METRIC_DTYPE = np.float32
+
+
+def _frozen(array):
+    array.flags.writeable = False
+    return array
+
+
+def _categorical(values, n_rows):
+    if isinstance(values, str):
+        return pd.Categorical.from_codes(np.zeros(n_rows, dtype=np.int8), [values])
+    return pd.Categorical(values)
+
+
+class ScoredDataset:
+    """Scored rows stored column by column; the arrays are read-only
+
+    Datasets are shared between pages, sessions and the store's cache, so
+    derived results (re-weighted scores, filtered views) are always new
+    arrays rather than edits to these.
+    """
+
+    metric_columns = METRIC_COLUMNS
+
+    def __init__(self, text, scores, metrics, judge, timestamp, original):
+        n_rows = len(scores)
+        self.text = {col: pd.Series(text[col]).reset_index(drop=True) for col in REQUIRED_COLUMNS}
+        self.scores = _frozen(np.asarray(scores, dtype=METRIC_DTYPE))
+        self.metrics = _frozen(np.ascontiguousarray(metrics, dtype=METRIC_DTYPE).reshape(n_rows, len(METRIC_COLUMNS)))
+        self.judge = _categorical(judge, n_rows)
+        self.timestamp = _categorical(timestamp, n_rows)
+        self.original = _frozen(np.asarray(original, dtype=bool))
+
+    @classmethod
+    def from_frame(cls, df):
+        """Columnar copy of a scored frame (``OUTPUT_COLUMNS`` layout)"""
+        return cls(
+            text={col: df[col] for col in REQUIRED_COLUMNS},
+            scores=df['ADAMS_Score'].to_numpy(dtype=METRIC_DTYPE),
+            metrics=df[METRIC_COLUMNS].to_numpy(dtype=METRIC_DTYPE),
+            judge=df['LLM_Judge'],
+            timestamp=df['Processing_Timestamp'],
+            original=df['Original_Data'].to_numpy(dtype=bool),
+        )
+
+    def __len__(self):
+        return len(self.scores)
+
+    @property
+    def judges(self):
+        """Judge labels present in the dataset"""
+        return [str(label) for label in self.judge.categories]
+
+    def with_scores(self, scores):
+        """The same rows with a different ADAMS score; all other arrays are shared"""
+        dataset = copy.copy(self)
+        for derived in ('frame', 'nbytes'):
+            dataset.__dict__.pop(derived, None)
+        dataset.scores = _frozen(np.asarray(scores, dtype=METRIC_DTYPE))
+        return dataset
+
+    def with_text(self, text):
+        """The same rows over another, equal copy of the text columns (shared, not copied)"""
+        dataset = copy.copy(self)
+        for derived in ('frame', 'nbytes', 'text_nbytes', 'legacy_nbytes'):
+            dataset.__dict__.pop(derived, None)
+        dataset.text = text
+        return dataset
+
+    @cached_property
+    def frame(self):
+        """DataFrame in ``OUTPUT_COLUMNS`` order sharing memory with the arrays"""
+        data = dict(self.text)
+        data['ADAMS_Score'] = self.scores
+        data['LLM_Judge'] = self.judge
+        for j, col in enumerate(METRIC_COLUMNS):
+            data[col] = self.metrics[:, j]
+        data['Processing_Timestamp'] = self.timestamp
+        data['Original_Data'] = self.original
+        return pd.DataFrame(data, index=pd.RangeIndex(len(self)), columns=OUTPUT_COLUMNS, copy=False)
+
+    @cached_property
+    def row_keys(self):
+        """``row_keys`` of the text columns"""
+        return _frozen(row_keys(self.text))
+
+    @cached_property
+    def text_nbytes(self):
+        return int(sum(series.memory_usage(index=False, deep=True) for series in self.text.values()))
+
+    @cached_property
+    def nbytes(self):
+        """Bytes held by this representation, text included"""
+        categorical = sum(
+            column.codes.nbytes + column.categories.memory_usage(deep=True)
+            for column in (self.judge, self.timestamp)
+        )
+        return int(self.text_nbytes + self.scores.nbytes + self.metrics.nbytes + categorical + self.original.nbytes)
+
+    @cached_property
+    def legacy_nbytes(self):
+        """Estimated bytes of the same rows as a list of per-row dicts
+
+        Each row was a dict of ``OUTPUT_COLUMNS`` holding boxed floats and its
+        own timestamp string, referenced from a list; the text strings are the
+        same objects in both layouts and are counted once.
+        """
+        row = dict.fromkeys(OUTPUT_COLUMNS)
+        per_row = (
+            sys.getsizeof(row)
+            + 8  # list slot
+            + (len(METRIC_COLUMNS) + 1) * sys.getsizeof(1.0)
+            + sys.getsizeof(str(self.timestamp[0]) if len(self) else '')
+        )
+        return int(self.text_nbytes + len(self) * per_row)
+
+    def memory_report(self):
+        """Footprint of this dataset next to the list-of-dicts layout"""
+        return {
+            'rows': len(self),
+            'columnar_bytes': self.nbytes,
+            'legacy_bytes': self.legacy_nbytes,
+            'ratio': self.legacy_nbytes / self.nbytes if self.nbytes else 1.0,
+        }
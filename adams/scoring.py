@@ -0,0 +1,125 @@
+"""Columnar ADAMS scoring engine
+
+pandas is only imported to build scored frames and hash rows, so the metric
+definitions and ``weighted_scores`` stay cheap to import.
+
+Simulated scores are a pure function of each row's text, the judge, the
+seed and the metric: every value comes from splitmix64 over the row key
+mixed with a per-judge stream. A row gets the same scores whichever chunk,
+worker process or resumed run it is scored in, and in any row order.
+"""
+import hashlib
+import time
+
+import numpy as np
+
+REQUIRED_COLUMNS = ['Question', 'Reference_Answer', 'Model_Answer']
+
+# Per-row metrics: (column, simulated score low, simulated score high, weight)
+METRIC_SPECS = [
+    ('Factual_Accuracy', 7.5, 9.5, 0.9),
+    ('Coherence', 8.0, 9.8, 0.8),
+    ('Relevance', 8.2, 9.6, 0.85),
+    ('Completeness', 7.0, 9.0, 0.7),
+    ('Citation_Quality', 6.5, 8.5, 0.75),
+    ('Clarity', 8.5, 9.7, 0.7),
+    ('Technical_Depth', 7.2, 8.8, 0.7),
+]
+METRIC_COLUMNS = [spec[0] for spec in METRIC_SPECS]
+METRIC_WEIGHTS = np.array([spec[3] for spec in METRIC_SPECS])
+
+DEFAULT_SEED = 0
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+# Column order of a scored dataset
+OUTPUT_COLUMNS = (
+    REQUIRED_COLUMNS
+    + ['ADAMS_Score', 'LLM_Judge']
+    + METRIC_COLUMNS
+    + ['Processing_Timestamp', 'Original_Data']
+)
+
+
+def missing_columns(columns):
+    """Return the required columns absent from ``columns``"""
+    return [col for col in REQUIRED_COLUMNS if col not in columns]
+
+
+def row_keys(text):
+    """uint64 hash of each row's Question/Reference_Answer/Model_Answer
+
+    Equal text gives equal keys in any dataset or file, which is what lines
+    rows up when two judges (or a judge and a reviewer) scored the same rows.
+    ``adams.ingest`` reads these columns as text, so keys do not depend on
+    how a file was split into chunks.
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame({col: text[col] for col in REQUIRED_COLUMNS}, copy=False)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def splitmix64(x):
+    """splitmix64 finalizer of a uint64 array (wrapping arithmetic)"""
+    x = np.asarray(x, dtype=np.uint64) + _GOLDEN
+    x = (x ^ (x >> np.uint64(30))) * _MIX_1
+    x = (x ^ (x >> np.uint64(27))) * _MIX_2
+    return x ^ (x >> np.uint64(31))
+
+
+def judge_stream(selected_llm, seed=DEFAULT_SEED):
+    """uint64 stream id of a judge label and seed, stable across processes"""
+    digest = hashlib.blake2b(f"{selected_llm}\x1f{seed}".encode('utf-8'), digest_size=8).digest()
+    return np.uint64(int.from_bytes(digest, 'little'))
+
+
+def simulate_metric_matrix(keys, selected_llm, seed=DEFAULT_SEED):
+    """Simulated judge scores of the rows with ``row_keys`` ``keys``, as an (n_rows, n_metrics) array"""
+    low = np.array([spec[1] for spec in METRIC_SPECS])
+    high = np.array([spec[2] for spec in METRIC_SPECS])
+    state = splitmix64(np.asarray(keys, dtype=np.uint64) ^ judge_stream(selected_llm, seed))
+    # Metric j takes the (j + 1)-th output of the splitmix64 sequence seeded with the row's state
+    steps = np.arange(1, len(METRIC_SPECS) + 1, dtype=np.uint64) * _GOLDEN
+    bits = splitmix64(state[:, None] + steps)
+    # The top 53 bits give a double in [0, 1)
+    uniform = (bits >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+    return low + uniform * (high - low)
+
+
+def weighted_scores(matrix, weights=None):
+    """Weighted average of each row of a metric matrix, in the matrix's precision
+
+    All-zero weights give zero scores.
+    """
+    weights = METRIC_WEIGHTS if weights is None else weights
+    weights = np.asarray(weights, dtype=np.result_type(matrix.dtype, np.float32))
+    total = weights.sum()
+    if total == 0:
+        return np.zeros(len(matrix), dtype=weights.dtype)
+    return matrix @ (weights / total)
+
+
+def build_scored_frame(df, matrix, selected_llm, timestamp=None):
+    """Assemble the enriched output frame from source rows and their metric matrix"""
+    import pandas as pd
+
+    if timestamp is None:
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    data = {col: df[col].to_numpy() for col in REQUIRED_COLUMNS}
+    data['ADAMS_Score'] = np.round(weighted_scores(matrix), 2)
+    data['LLM_Judge'] = selected_llm
+    for j, col in enumerate(METRIC_COLUMNS):
+        data[col] = np.round(matrix[:, j], 2)
+    data['Processing_Timestamp'] = timestamp
+    data['Original_Data'] = False
+    return pd.DataFrame(data, index=pd.RangeIndex(len(df)), columns=OUTPUT_COLUMNS)
+
+
+def score_frame(df, selected_llm, seed=DEFAULT_SEED, timestamp=None):
+    """Score every row of ``df`` in one vectorized pass"""
+    matrix = simulate_metric_matrix(row_keys(df), selected_llm, seed)
+    return build_scored_frame(df, matrix, selected_llm, timestamp)
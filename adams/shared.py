@@ -0,0 +1,196 @@
+"""Scored uploads shared by every session of one server process
+
+Results are keyed by a hash of the uploaded file's bytes and the scoring
+backend (``pipeline.judge_id``), so a second user uploading the same file
+with the same judge gets the first user's ``ScoredDataset`` instead of
+scoring it again. Each dataset owner still gets their own store handle
+(``handle_for``), so the upload is listed and deleted per owner. Results
+for the same file under different judges share one copy of its text
+columns, which is most of a dataset's memory.
+
+Each session holds its results through a ``SessionToken``. An entry is
+referenced while any live token holds it; when a session ends and its
+token is garbage collected, its references are released. Unreferenced
+entries are evicted least recently used first once the cache grows past
+``max_bytes``. Referenced entries are never evicted, as their memory is
+in use by a session either way.
+"""
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+_HASH_BLOCK = 1 << 20
+
+
+def content_hash(file):
+    """BLAKE2b digest of a seekable file's bytes; the position is restored"""
+    pos = file.tell()
+    file.seek(0)
+    digest = hashlib.blake2b(digest_size=16)
+    while block := file.read(_HASH_BLOCK):
+        digest.update(block)
+    file.seek(pos)
+    return digest.hexdigest()
+
+
+class SessionToken:
+    """Stands for one session; its references are released when it is collected"""
+    __slots__ = ('__weakref__',)
+
+
+@dataclass
+class SharedResult:
+    """One scored upload and its store handle per dataset owner"""
+    key: tuple
+    dataset: object
+    handles: dict = field(default_factory=dict)
+    owners: set = field(default_factory=set)
+
+
+class SharedResults:
+    """Thread-safe, refcounted, memory-bounded cache of scored uploads"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        # Text columns per content hash, shared by that file's results under every judge
+        self._texts = {}
+        self._held = {}
+        # Owners whose token was collected; finalizers may run inside a locked
+        # section (garbage collection), so they only queue the owner here
+        self._ended = []
+        self._lock = threading.Lock()
+
+    def _hold(self, entry, token):
+        owner = id(token)
+        if owner not in self._held:
+            self._held[owner] = set()
+            weakref.finalize(token, self._ended.append, owner)
+        self._held[owner].add(entry.key)
+        entry.owners.add(owner)
+        self._entries.move_to_end(entry.key)
+
+    def _release_ended(self):
+        while self._ended:
+            owner = self._ended.pop()
+            for key in self._held.pop(owner, ()):
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.owners.discard(owner)
+
+    def acquire(self, key, token):
+        """The result for ``key``, now held by ``token``; None on a miss"""
+        with self._lock:
+            self._release_ended()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._hold(entry, token)
+            return entry
+
+    def add(self, key, dataset, handle, token, owner=None):
+        """Share a freshly scored ``dataset``, stored as ``owner``'s ``handle``, under ``key``, held by ``token``
+
+        If another session added the same key in the meantime its result is
+        returned instead, so one copy is kept.
+        """
+        with self._lock:
+            self._release_ended()
+            entry = self._entries.get(key)
+            if entry is None:
+                text = self._texts.get(key[0])
+                if text is not None and len(text['Question']) == len(dataset):
+                    dataset = dataset.with_text(text)
+                else:
+                    self._texts[key[0]] = dataset.text
+                entry = self._entries[key] = SharedResult(key, dataset)
+            entry.handles.setdefault(owner, handle)
+            self._hold(entry, token)
+            self._evict()
+            return entry
+
+    def handle_for(self, entry, owner, link):
+        """``owner``'s store handle for ``entry``
+
+        An owner without one gets ``link(handles)``, given the handles of the
+        other owners (empty once the entry was forgotten), e.g. a new index row
+        for the same stored file.
+        """
+        with self._lock:
+            handle = entry.handles.get(owner)
+            if handle is None:
+                handle = entry.handles[owner] = link(list(entry.handles.values()))
+            return handle
+
+    def release(self, key, token):
+        """Drop ``token``'s reference to ``key``"""
+        owner = id(token)
+        with self._lock:
+            self._release_ended()
+            self._held.get(owner, set()).discard(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.owners.discard(owner)
+            self._evict()
+
+    def forget(self, dataset_id):
+        """Drop store id ``dataset_id`` from the results, e.g. after it was deleted
+
+        A result no other owner has a handle for is dropped: sessions holding
+        it keep their dataset, and the next upload of the same file is scored
+        and saved again.
+        """
+        with self._lock:
+            self._release_ended()
+            for entry in self._entries.values():
+                for owner in [owner for owner, handle in entry.handles.items() if handle['id'] == dataset_id]:
+                    del entry.handles[owner]
+            for key in [key for key, entry in self._entries.items() if not entry.handles]:
+                del self._entries[key]
+                if not any(other[0] == key[0] for other in self._entries):
+                    self._texts.pop(key[0], None)
+
+    def _nbytes(self):
+        """Bytes of every cached result, each file's text counted once"""
+        texts = {}
+        total = 0
+        for key, entry in self._entries.items():
+            total += entry.dataset.nbytes - entry.dataset.text_nbytes
+            texts[key[0]] = entry.dataset.text_nbytes
+        return total + sum(texts.values())
+
+    def _evict(self):
+        self._release_ended()
+        total = self._nbytes()
+        for key in [key for key, entry in self._entries.items() if not entry.owners]:
+            if total <= self.max_bytes:
+                break
+            dataset = self._entries.pop(key).dataset
+            self.evictions += 1
+            total -= dataset.nbytes - dataset.text_nbytes
+            if not any(other[0] == key[0] for other in self._entries):
+                total -= dataset.text_nbytes
+                self._texts.pop(key[0], None)
+
+    def stats(self):
+        with self._lock:
+            self._release_ended()
+            return {
+                'entries': len(self._entries),
+                'referenced': sum(1 for entry in self._entries.values() if entry.owners),
+                'sessions': len(self._held),
+                'bytes': self._nbytes(),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
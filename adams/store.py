@@ -0,0 +1,166 @@
+"""Persistent store of processed datasets
+
+Each scored dataset is written once to ``ADAMS_HOME/datasets/<id>.parquet``
+(pickle when pyarrow is not installed) and described by a row in a SQLite
+index. Sessions keep only the lightweight handles returned by ``save`` and
+``list``; datasets are loaded lazily, through a small LRU cache, when a page
+actually needs them.
+
+Datasets are saved under an ``owner`` (the signed-in user, or None for
+anonymous use) and listed per owner, so one server can hold several
+people's uploads without mixing them. When several owners upload the same
+file, each gets its own index row (``link``) pointing at one file on disk,
+which is removed only with its last row.
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from importlib.util import find_spec
+
+import pandas as pd
+
+from adams.paths import data_dir
+from adams.profiler import section
+from adams.results import ScoredDataset
+
+HANDLE_FIELDS = ('id', 'name', 'llm_judge', 'timestamp', 'filename', 'sample_count')
+
+
+class DatasetNotFoundError(KeyError):
+    """No stored dataset has the requested id"""
+
+
+class DatasetStore:
+    """Datasets on disk plus a metadata index; safe to share between sessions"""
+
+    def __init__(self, root=None, cache_size=4):
+        self.root = root or data_dir('datasets')
+        os.makedirs(self.root, exist_ok=True)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(self.root, 'index.sqlite'), check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS datasets ('
+            ' id TEXT PRIMARY KEY, name TEXT, llm_judge TEXT, timestamp TEXT,'
+            ' filename TEXT, sample_count INTEGER, path TEXT, created REAL, owner TEXT)'
+        )
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(datasets)')]
+        if 'owner' not in columns:
+            # Indexes written before datasets had owners; their rows stay anonymous
+            self._conn.execute('ALTER TABLE datasets ADD COLUMN owner TEXT')
+        self._conn.commit()
+
+    def _write_frame(self, dataset_id, df):
+        if find_spec('pyarrow') is not None:
+            path = os.path.join(self.root, f"{dataset_id}.parquet")
+            df.to_parquet(path, index=False)
+        else:
+            path = os.path.join(self.root, f"{dataset_id}.pkl")
+            df.to_pickle(path)
+        return path
+
+    def save(self, dataset, filename, llm_judge, timestamp=None, owner=None):
+        """Persist a ``ScoredDataset`` and return its handle"""
+        dataset_id = uuid.uuid4().hex[:12]
+        handle = {
+            'id': dataset_id,
+            'name': f"{filename} ({llm_judge})",
+            'llm_judge': llm_judge,
+            'timestamp': timestamp or time.strftime("%Y-%m-%d %H:%M:%S"),
+            'filename': filename,
+            'sample_count': len(dataset),
+        }
+        with section('store.save'):
+            path = self._write_frame(dataset_id, dataset.frame)
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO datasets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (*(handle[field] for field in HANDLE_FIELDS), path, time.time(), owner),
+            )
+            self._conn.commit()
+            self._remember(dataset_id, dataset)
+        return handle
+
+    def link(self, dataset_id, owner=None):
+        """Index the stored dataset ``dataset_id`` under ``owner`` too and return the new handle
+
+        The new row shares the existing file, so the same upload by another
+        owner is listed, seeded and deleted for them without writing it again.
+        """
+        new_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(HANDLE_FIELDS)}, path FROM datasets WHERE id = ?", (dataset_id,)
+            ).fetchone()
+            if row is None:
+                raise DatasetNotFoundError(dataset_id)
+            handle = dict(zip(HANDLE_FIELDS, row[:-1]), id=new_id, timestamp=time.strftime("%Y-%m-%d %H:%M:%S"))
+            self._conn.execute(
+                'INSERT INTO datasets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (*(handle[field] for field in HANDLE_FIELDS), row[-1], time.time(), owner),
+            )
+            self._conn.commit()
+            if dataset_id in self._cache:
+                self._remember(new_id, self._cache[dataset_id])
+        return handle
+
+    def list(self, owner=None, limit=None):
+        """Handles of ``owner``'s stored datasets, oldest first; ``limit`` keeps the most recent"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(HANDLE_FIELDS)} FROM datasets WHERE owner IS ? ORDER BY created DESC LIMIT ?",
+                (owner, -1 if limit is None else limit),
+            ).fetchall()
+        return [dict(zip(HANDLE_FIELDS, row)) for row in reversed(rows)]
+
+    def existing(self, dataset_ids):
+        """The subset of ``dataset_ids`` that is still stored"""
+        dataset_ids = list(dataset_ids)
+        if not dataset_ids:
+            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM datasets WHERE id IN ({','.join('?' * len(dataset_ids))})", dataset_ids
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def _remember(self, dataset_id, dataset):
+        self._cache[dataset_id] = dataset
+        self._cache.move_to_end(dataset_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def load(self, dataset_id):
+        """The stored ``ScoredDataset`` for ``dataset_id``"""
+        with self._lock:
+            if dataset_id in self._cache:
+                self._cache.move_to_end(dataset_id)
+                return self._cache[dataset_id]
+            row = self._conn.execute('SELECT path FROM datasets WHERE id = ?', (dataset_id,)).fetchone()
+        if row is None:
+            raise DatasetNotFoundError(dataset_id)
+        path = row[0]
+        with section('store.load'):
+            df = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_pickle(path)
+            dataset = ScoredDataset.from_frame(df)
+        with self._lock:
+            self._remember(dataset_id, dataset)
+        return dataset
+
+    def delete(self, dataset_id):
+        """Remove a dataset's index row, and its file unless another row still uses it; unknown ids are ignored"""
+        with self._lock:
+            row = self._conn.execute('SELECT path FROM datasets WHERE id = ?', (dataset_id,)).fetchone()
+            self._conn.execute('DELETE FROM datasets WHERE id = ?', (dataset_id,))
+            shared = row is not None and self._conn.execute(
+                'SELECT 1 FROM datasets WHERE path = ? LIMIT 1', (row[0],)
+            ).fetchone() is not None
+            self._conn.commit()
+            self._cache.pop(dataset_id, None)
+            # Removed under the lock, so a concurrent link() either sees the row or the file survives
+            if row is not None and not shared and os.path.exists(row[0]):
+                os.remove(row[0])
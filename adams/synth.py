@@ -0,0 +1,124 @@
+"""Synthetic Question/Reference_Answer/Model_Answer datasets for benchmarks
+
+Rows are assembled from pools of templated sentences about RAG and ML
+topics. Every question is unique, and model answers restate part of the
+reference answer before adding their own sentences, like the sample
+dataset. Sentence indices for every row are drawn with NumPy up front, so
+building a million rows is dominated by the string joins.
+
+    python -m adams synth bench_100k.csv --rows 100000
+"""
+import numpy as np
+
+from adams.scoring import REQUIRED_COLUMNS
+
+TOPICS = [
+    'retrieval-augmented generation', 'transformer architectures', 'transfer learning', 'vector databases',
+    'dense retrieval', 'hybrid search', 'knowledge distillation', 'instruction tuning', 'prompt engineering',
+    'document chunking', 'embedding models', 'reranking', 'hallucination detection', 'evaluation metrics',
+    'context windows', 'fine-tuning', 'quantization', 'active learning', 'semi-supervised learning',
+    'graph neural networks', 'reinforcement learning from human feedback', 'citation grounding',
+]
+DOMAINS = [
+    'healthcare', 'legal research', 'customer support', 'financial analysis', 'scientific literature',
+    'software documentation', 'education', 'e-commerce search', 'regulatory compliance', 'clinical trials',
+]
+QUESTION_TEMPLATES = [
+    "What are the key benefits of using {topic} in {domain} applications?",
+    "How does {topic} affect answer quality in {domain}?",
+    "What are the main challenges in implementing {topic} for {domain}?",
+    "Explain the role of {topic} in {domain} systems.",
+    "When should {domain} teams prefer {topic} over simpler baselines?",
+    "How can {topic} be evaluated for {domain} use cases?",
+]
+SENTENCE_TEMPLATES = [
+    "{Topic} improves {quality} by grounding responses in {source}.",
+    "In {domain}, {topic} must balance {quality} against {cost}.",
+    "A common failure mode of {topic} is poor {quality} when {source} is outdated.",
+    "Teams adopting {topic} usually monitor {quality} and {cost} together.",
+    "{Topic} reduces {cost} when combined with careful curation of {source}.",
+    "Regulated {domain} settings require traceable {source} for {topic}.",
+    "Benchmarks for {topic} should report {quality} separately from {cost}.",
+    "{Topic} depends on the coverage and freshness of {source}.",
+]
+QUALITIES = ['factual accuracy', 'relevance', 'coherence', 'completeness', 'citation quality', 'clarity']
+COSTS = ['latency', 'compute cost', 'annotation effort', 'memory footprint', 'maintenance overhead']
+SOURCES = ['retrieved documents', 'the knowledge base', 'curated guidelines', 'domain corpora', 'cited references']
+
+SENTENCE_POOL_SIZE = 4096
+DEFAULT_ANSWER_CHARS = 300
+
+
+def _sentence_pool(rng, size=SENTENCE_POOL_SIZE):
+    """Distinct sentences, each with a leading space so they concatenate directly"""
+    pool = set()
+    while len(pool) < size:
+        topic = TOPICS[rng.integers(len(TOPICS))]
+        pool.add(' ' + SENTENCE_TEMPLATES[rng.integers(len(SENTENCE_TEMPLATES))].format(
+            topic=topic,
+            Topic=topic[0].upper() + topic[1:],
+            domain=DOMAINS[rng.integers(len(DOMAINS))],
+            quality=QUALITIES[rng.integers(len(QUALITIES))],
+            cost=COSTS[rng.integers(len(COSTS))],
+            source=SOURCES[rng.integers(len(SOURCES))],
+        ))
+    return np.array(sorted(pool), dtype=object)
+
+
+def _join(pool, picks, counts):
+    """Row ``i`` joins ``pool[picks[i, :counts[i]]]``"""
+    # Unused slots point at an empty sentence appended to the pool
+    pool = np.append(pool, '')
+    picks = np.where(np.arange(picks.shape[1]) < counts[:, None], picks, len(pool) - 1)
+    return np.array([''.join(sentences)[1:] for sentences in pool[picks].tolist()], dtype=object)
+
+
+def synthetic_frame(n_rows, answer_chars=DEFAULT_ANSWER_CHARS, seed=0):
+    """A DataFrame of ``n_rows`` unique question/answer rows
+
+    ``answer_chars`` is the mean length of a reference answer; model answers
+    run about half as long again.
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    pool = _sentence_pool(rng)
+    sentence_chars = np.mean([len(sentence) for sentence in pool])
+
+    questions = np.array([
+        template.format(topic=topic, domain=domain)
+        for template in QUESTION_TEMPLATES for topic in TOPICS for domain in DOMAINS
+    ], dtype=object)
+    # A case number keeps every question, and so every row, distinct
+    case_ids = np.array([f' (case {i})' for i in range(1, n_rows + 1)], dtype=object)
+    question = questions[rng.integers(len(questions), size=n_rows)] + case_ids
+
+    mean_sentences = max(answer_chars / sentence_chars, 1.0)
+    reference_counts = np.maximum(rng.poisson(mean_sentences, size=n_rows), 1)
+    reference_picks = rng.integers(len(pool), size=(n_rows, int(reference_counts.max())))
+    reference = _join(pool, reference_picks, reference_counts)
+
+    # Restate a prefix of the reference, then add new sentences
+    kept = rng.binomial(reference_counts, 0.7)
+    added = np.maximum(rng.poisson(mean_sentences * 0.8, size=n_rows), 1)
+    width = int((kept + added).max())
+    model_picks = rng.integers(len(pool), size=(n_rows, width))
+    shared = min(width, reference_picks.shape[1])
+    restated = np.arange(shared) < kept[:, None]
+    model_picks[:, :shared][restated] = reference_picks[:, :shared][restated]
+    model = _join(pool, model_picks, kept + added)
+
+    return pd.DataFrame(dict(zip(REQUIRED_COLUMNS, (question, reference, model))))
+
+
+def write_synthetic(path, n_rows, fmt=None, answer_chars=DEFAULT_ANSWER_CHARS, seed=0):
+    """Write a synthetic dataset to ``path`` in any export format (default: from the extension)"""
+    from adams.export import EXPORT_FORMATS, write_export
+
+    if fmt is None:
+        fmt = next((name for name, spec in sorted(EXPORT_FORMATS.items(), key=lambda item: -len(item[1]['ext']))
+                    if path.endswith(spec['ext'])), 'csv')
+    df = synthetic_frame(n_rows, answer_chars, seed)
+    with open(path, 'wb') as f:
+        write_export(df, fmt, f)
+    return df
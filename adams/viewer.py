@@ -0,0 +1,67 @@
+"""Server-side filtering, sorting and paging for the dataset viewer
+
+Only the rows of the visible page leave the server, with long text columns
+truncated; the full row is fetched on demand when it is expanded.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+TEXT_COLUMNS = ['Question', 'Reference_Answer', 'Model_Answer']
+HIDDEN_COLUMNS = ['Original_Data']
+DEFAULT_TRUNCATE = 120
+
+
+@dataclass(frozen=True)
+class ViewFilter:
+    """Row selection and ordering; hashable so results can be memoized"""
+    score_min: float = 0.0
+    score_max: float = 10.0
+    judges: tuple = ()
+    question_contains: str = ''
+    sort_by: str = None
+    descending: bool = False
+
+
+def filter_mask(df, view_filter):
+    """Boolean mask of the rows matching ``view_filter``"""
+    scores = df['ADAMS_Score'].to_numpy()
+    mask = (scores >= view_filter.score_min) & (scores <= view_filter.score_max)
+    if view_filter.judges:
+        mask &= df['LLM_Judge'].isin(view_filter.judges).to_numpy()
+    if view_filter.question_contains:
+        mask &= df['Question'].astype(str).str.contains(
+            view_filter.question_contains, case=False, regex=False
+        ).to_numpy()
+    return mask
+
+
+def select_rows(df, view_filter):
+    """Positions of the matching rows in display order"""
+    positions = np.flatnonzero(filter_mask(df, view_filter))
+    if view_filter.sort_by:
+        column = df[view_filter.sort_by].iloc[positions].reset_index(drop=True)
+        order = column.sort_values(ascending=not view_filter.descending, kind='stable').index.to_numpy()
+        positions = positions[order]
+    return positions
+
+
+def truncate_text(series, width=DEFAULT_TRUNCATE):
+    """Cut strings longer than ``width`` and mark them with an ellipsis"""
+    text = series.astype(str)
+    long = text.str.len() > width
+    return text.where(~long, text.str.slice(0, width - 1) + '…')
+
+
+def page_frame(df, positions, page, page_size, width=DEFAULT_TRUNCATE):
+    """The visible page: selected rows, hidden columns dropped, text truncated"""
+    page_positions = positions[page * page_size:(page + 1) * page_size]
+    page_df = df.iloc[page_positions].drop(columns=HIDDEN_COLUMNS, errors='ignore')
+    for col in TEXT_COLUMNS:
+        if col in page_df.columns:
+            page_df[col] = truncate_text(page_df[col], width)
+    return page_df
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
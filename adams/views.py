@@ -0,0 +1,28 @@
+"""Memoized views derived from the current processed dataset"""
+
+
+class ViewCache:
+    """Derived views and export payloads of one dataset version
+
+    Every time the processed dataset is replaced its version changes, which
+    drops all cached views; otherwise each view is built at most once.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._views = {}
+        self.builds = 0
+
+    def get(self, version, name, build):
+        """Return view ``name`` for ``version``, calling ``build()`` only on a miss"""
+        if version != self.version:
+            self._views.clear()
+            self.version = version
+        if name not in self._views:
+            self._views[name] = build()
+            self.builds += 1
+        return self._views[name]
+
+    def clear(self):
+        self._views.clear()
+        self.version = None
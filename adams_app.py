@@ -1,9 +1,34 @@
 import streamlit as st
+import copy
 import time
 import json
+import numpy as np
 import pandas as pd
 import io
-import random
+
+import adams
+
+from adams.bootstrap import DEFAULT_RESAMPLES
+from adams.cache import JudgmentCache
+from adams.compare import (DISAGREEMENT_THRESHOLD, SIGNIFICANCE_LEVEL, SUMMARY_COLUMNS, ComparisonCache,
+                           compare_all, compare_pair)
+from adams.export import EXPORT_FORMATS, available_formats, available_report_formats, export_bytes, export_file_name
+from adams.ingest import MissingColumnsError, UnsupportedFormatError
+from adams.jobs import DONE, JobManager
+from adams.judge import JudgeConfig, JudgeError
+from adams.optimize import DEFAULT_LABEL_COLUMN, FIT_MODES, LabelError, fit_weights, read_labels
+from adams.pipeline import judge_id, score_upload
+from adams.scoring import METRIC_COLUMNS, OUTPUT_COLUMNS
+from adams.store import DatasetNotFoundError, DatasetStore
+from adams.profiler import Profiler, payload, section
+from adams.profiles import DEFAULT_METRICS, ProfileScores, ProfileStore, row_weights
+from adams.progress import ProgressTracker, format_duration
+from adams.report import (comparison_report, config_report, final_score, metric_rows, performance_rating,
+                          score_stats, timestamp, top_metrics)
+from adams.results import ScoredDataset
+from adams.shared import SessionToken, SharedResults, content_hash
+from adams.viewer import ViewFilter, page_count, page_frame, select_rows
+from adams.views import ViewCache
 
 # Configure page
 st.set_page_config(
@@ -137,97 +162,399 @@ if 'processing_complete' not in st.session_state:
     st.session_state.processing_complete = False
 if 'dataset_processed' not in st.session_state:
     st.session_state.dataset_processed = None
+if 'dataset_version' not in st.session_state:
+    st.session_state.dataset_version = 0
+if 'dataset_views' not in st.session_state:
+    st.session_state.dataset_views = ViewCache()
 if 'selected_llm' not in st.session_state:
     st.session_state.selected_llm = 'Qwen'
 if 'reviewer_comments' not in st.session_state:
     st.session_state.reviewer_comments = {}
-if 'processed_datasets_history' not in st.session_state:
-    st.session_state.processed_datasets_history = []
 if 'comparison_selection' not in st.session_state:
     st.session_state.comparison_selection = {'dataset_a': None, 'dataset_b': None}
+if 'job_ids' not in st.session_state:
+    st.session_state.job_ids = []
+if 'loaded_job_ids' not in st.session_state:
+    st.session_state.loaded_job_ids = []
+if 'weight_fit' not in st.session_state:
+    st.session_state.weight_fit = None
+if 'active_profile' not in st.session_state:
+    st.session_state.active_profile = None
+if 'profile_scores' not in st.session_state:
+    st.session_state.profile_scores = None
+if 'session_token' not in st.session_state:
+    # Collected with the session, which releases its shared results
+    st.session_state.session_token = SessionToken()
+if 'shared_key' not in st.session_state:
+    st.session_state.shared_key = None
+if 'profiler' not in st.session_state:
+    # Opt-in rerun profiling; ADAMS_PROFILE=1 turns it on for new sessions
+    st.session_state.profiler = Profiler.from_env()
+
+# Time this rerun's instrumented sections when profiling is on
+if st.session_state.profiler is not None:
+    st.session_state.profiler.start_run()
+else:
+    Profiler.stop()
+
+@st.cache_resource
+def get_judgment_cache():
+    """Process-wide judgment cache shared by all sessions"""
+    return JudgmentCache()
+
+@st.cache_resource
+def get_shared_results():
+    """Process-wide scored uploads, shared by sessions that upload the same file with the same judge"""
+    return SharedResults()
 
-# Sample metrics data
-default_metrics = {
-    'Factual Accuracy': {'score': 8.7, 'weight': 0.9},
-    'Coherence': {'score': 9.2, 'weight': 0.8},
-    'Relevance': {'score': 8.9, 'weight': 0.85},
-    'Completeness': {'score': 7.8, 'weight': 0.7},
-    'Citation Quality': {'score': 8.1, 'weight': 0.75},
-    'Domain Specificity': {'score': 8.5, 'weight': 0.8},
-    'Clarity': {'score': 9.0, 'weight': 0.7},
-    'Consistency': {'score': 8.3, 'weight': 0.6},
-    'Novelty': {'score': 7.5, 'weight': 0.5},
-    'Readability': {'score': 8.8, 'weight': 0.6},
-    'Technical Depth': {'score': 8.0, 'weight': 0.7},
-    'Evidence Support': {'score': 8.4, 'weight': 0.8},
-    'Contextual Fit': {'score': 8.6, 'weight': 0.7},
-    'Timeliness': {'score': 7.9, 'weight': 0.6},
-    'Bias Detection': {'score': 8.2, 'weight': 0.7}
-}
+def process_uploaded_dataset(uploaded_file, selected_llm, on_progress=None):
+    """Process uploaded dataset and add ADAMS scores and metrics
 
-def process_uploaded_dataset(uploaded_file, selected_llm):
-    """Process uploaded dataset and add ADAMS scores and metrics"""
+    Returns a ``SharedResult`` held by this session and this owner's store
+    handle for it, or None when the file could not be scored.
+    """
     try:
-        # Read the uploaded file
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
-        elif uploaded_file.name.endswith('.json'):
-            df = pd.read_json(uploaded_file)
-        else:
-            return None
-        
-        # Ensure required columns exist
-        required_columns = ['Question', 'Reference_Answer', 'Model_Answer']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        
-        if missing_columns:
-            st.error(f"Missing required columns: {missing_columns}")
-            return None
-        
-        # Add ADAMS processing results
-        processed_data = []
-        for _, row in df.iterrows():
-            # Simulate ADAMS metric evaluation with some randomness but realistic scores
-            base_scores = {
-                'Factual_Accuracy': random.uniform(7.5, 9.5),
-                'Coherence': random.uniform(8.0, 9.8),
-                'Relevance': random.uniform(8.2, 9.6),
-                'Completeness': random.uniform(7.0, 9.0),
-                'Citation_Quality': random.uniform(6.5, 8.5),
-                'Clarity': random.uniform(8.5, 9.7),
-                'Technical_Depth': random.uniform(7.2, 8.8)
-            }
-            
-            # Calculate overall ADAMS score (weighted average)
-            weights = [0.9, 0.8, 0.85, 0.7, 0.75, 0.7, 0.7]
-            adams_score = sum(score * weight for score, weight in zip(base_scores.values(), weights)) / sum(weights)
-            
-            processed_row = {
-                'Question': row['Question'],
-                'Reference_Answer': row['Reference_Answer'], 
-                'Model_Answer': row['Model_Answer'],
-                'ADAMS_Score': round(adams_score, 2),
-                'LLM_Judge': selected_llm,
-                'Factual_Accuracy': round(base_scores['Factual_Accuracy'], 2),
-                'Coherence': round(base_scores['Coherence'], 2),
-                'Relevance': round(base_scores['Relevance'], 2),
-                'Completeness': round(base_scores['Completeness'], 2),
-                'Citation_Quality': round(base_scores['Citation_Quality'], 2),
-                'Clarity': round(base_scores['Clarity'], 2),
-                'Technical_Depth': round(base_scores['Technical_Depth'], 2),
-                'Processing_Timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-                'Original_Data': False
-            }
-            processed_data.append(processed_row)
-            
-        return processed_data
+        # Another session may already have scored the same bytes with the same judge
+        judge_config = JudgeConfig.from_env()
+        key = (content_hash(uploaded_file), judge_id(selected_llm, judge_config))
+        owner = dataset_owner()
+        shared = get_shared_results().acquire(key, st.session_state.session_token)
+        if shared is None:
+            # Stream the file in chunks, validating the header on the first one.
+            # Scores come from a live judge endpoint when ADAMS_JUDGE_URL is set.
+            # Rows a live judge already scored in an earlier run are served from the
+            # judgment cache; simulated scores are cheaper to recompute than to look up.
+            # Kept as a compact columnar dataset: float32 metrics, categorical judge/timestamp.
+            scored = score_upload(uploaded_file, uploaded_file.name, selected_llm, on_progress=on_progress,
+                                  judge_config=judge_config,
+                                  cache=get_judgment_cache() if judge_config is not None else None)
+            dataset = ScoredDataset.from_frame(scored)
+            handle = get_dataset_store().save(dataset, uploaded_file.name, selected_llm, owner=owner)
+            shared = get_shared_results().add(key, dataset, handle, st.session_state.session_token, owner=owner)
+            if shared.handles.get(owner, handle) is not handle:
+                # This owner's other session shared the same result first
+                get_dataset_store().delete(handle['id'])
+        
+        def link(handles):
+            # The same upload from another owner: index its stored file under this owner too
+            for handle in handles:
+                try:
+                    return get_dataset_store().link(handle['id'], owner=owner)
+                except DatasetNotFoundError:
+                    continue
+            return get_dataset_store().save(shared.dataset, uploaded_file.name, selected_llm, owner=owner)
         
+        return shared, get_shared_results().handle_for(shared, owner, link)
+        
+    except UnsupportedFormatError:
+        return None
+    except MissingColumnsError as e:
+        st.error(f"Missing required columns: {e.missing}")
+        return None
+    except JudgeError as e:
+        st.error(f"LLM judge failed: {str(e)}")
+        return None
     except Exception as e:
         st.error(f"Error processing file: {str(e)}")
         return None
 
+@st.cache_resource
+def get_job_manager():
+    """Process-wide background job pool shared by all sessions"""
+    return JobManager(cache_path=get_judgment_cache().path)
+
+def set_processed_dataset(processed_data, shared_key=None):
+    """Replace the current dataset; bumping the version invalidates its cached views
+
+    ``shared_key`` is the dataset's entry in the shared results, if any; the
+    previous entry is released.
+    """
+    previous = st.session_state.shared_key
+    if previous is not None and previous != shared_key:
+        get_shared_results().release(previous, st.session_state.session_token)
+    st.session_state.shared_key = shared_key
+    st.session_state.dataset_processed = processed_data
+    st.session_state.dataset_version += 1
+
+def current_weights():
+    """Configuration weights keyed by metric name"""
+    return {metric_name: data['weight'] for metric_name, data in st.session_state.metrics_data.items()}
+
+def row_metric_weights():
+    """Weights of the per-row metric columns, taken from the matching Configuration sliders"""
+    return row_weights(current_weights())
+
+def dataset_view_version():
+    """Views depend on the dataset and on the weights its ADAMS scores are computed with"""
+    return (st.session_state.dataset_version, row_metric_weights())
+
+def dataset_view(name, build):
+    """Memoized view of the current dataset version under the current weights"""
+    return st.session_state.dataset_views.get(dataset_view_version(), name, build)
+
+def apply_metric_weights(weights):
+    """Callback: set slider weights by metric name (new entries, nothing edited in place)
+
+    Runs before the script so the keyed sliders can be updated too.
+    """
+    st.session_state.metrics_data = {
+        metric_name: {**data, 'weight': weights.get(metric_name, data['weight'])}
+        for metric_name, data in st.session_state.metrics_data.items()
+    }
+    for metric_name, weight in weights.items():
+        st.session_state[f"slider_{metric_name}"] = weight
+
+def apply_slider_weights():
+    """Callback: apply every weight editor slider at once, before the page is drawn"""
+    apply_metric_weights({metric_name: st.session_state[f"slider_{metric_name}"] for metric_name in st.session_state.metrics_data})
+
+def load_selected_profile():
+    """Callback: load the profile chosen in the profile selectbox into the sliders"""
+    profile = st.session_state.profile_select
+    apply_metric_weights(profile.as_dict())
+    st.session_state.active_profile = profile.key
+
+def reset_metrics():
+    """Callback: restore the default metrics; a deep copy, so later edits never reach the defaults"""
+    st.session_state.metrics_data = copy.deepcopy(DEFAULT_METRICS)
+    for metric_name, data in DEFAULT_METRICS.items():
+        st.session_state[f"slider_{metric_name}"] = data['weight']
+    st.session_state.active_profile = None
+
+def toggle_profiling():
+    """Callback: start or drop this session's rerun profiler"""
+    if st.session_state.profiling_enabled:
+        st.session_state.profiler = Profiler(track_memory=st.session_state.profiling_memory)
+    else:
+        # Stop tracing now rather than when the profiler is collected
+        if st.session_state.profiler is not None:
+            st.session_state.profiler.track_memory = False
+        st.session_state.profiler = None
+
+def set_profiling_memory():
+    """Callback: trace allocations from the next rerun on"""
+    if st.session_state.profiler is not None:
+        st.session_state.profiler.track_memory = st.session_state.profiling_memory
+
+def render_diagnostics():
+    """Sidebar panel with the sections of the last profiled rerun and the metrics downloads"""
+    st.markdown("### 🩺 Diagnostics")
+    profiler = st.session_state.profiler
+    st.session_state.setdefault('profiling_enabled', profiler is not None)
+    st.session_state.setdefault('profiling_memory', profiler is not None and profiler.track_memory)
+    st.toggle("Profile reruns", key="profiling_enabled", on_change=toggle_profiling)
+    st.checkbox("Track memory (slower)", key="profiling_memory", on_change=set_profiling_memory,
+                disabled=profiler is None, help="Traces Python and NumPy allocations with tracemalloc")
+    if profiler is None or profiler.last_run is None:
+        return
+    run = profiler.last_run
+    st.markdown(f"**Last rerun:** {run.seconds * 1000:,.0f} ms • {profiler.reruns:,} profiled")
+    if run.sections:
+        st.dataframe(pd.DataFrame({
+            'Section': list(run.sections),
+            'ms': [stats.seconds * 1000 for stats in run.sections.values()],
+            'Calls': [stats.calls for stats in run.sections.values()],
+            'Payload KB': [stats.payload_bytes / 1024 for stats in run.sections.values()],
+            'Memory Δ KB': [stats.memory_bytes / 1024 for stats in run.sections.values()]
+        }).round(1), use_container_width=True, hide_index=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("JSON", data=lambda: json.dumps(profiler.to_json(), indent=2),
+                           file_name=f"adams_profile_{time.strftime('%Y%m%d_%H%M%S')}.json",
+                           mime="application/json", on_click="ignore", use_container_width=True)
+    with col2:
+        st.download_button("Prometheus", data=profiler.to_prometheus,
+                           file_name="adams_profile.prom", mime="text/plain; version=0.0.4",
+                           on_click="ignore", use_container_width=True)
+
+def reset_session():
+    """Callback: start over with default metrics and no dataset"""
+    reset_metrics()
+    st.session_state.processing_complete = False
+    set_processed_dataset(None)
+    st.session_state.reviewer_comments = {}
+    st.session_state.page = 'upload'
+
+@st.cache_resource
+def get_profile_store():
+    """Process-wide store of named, versioned weight profiles"""
+    return ProfileStore()
+
+def active_dataset():
+    """The current dataset, re-scored from its metric matrix with the current weights
+
+    Scores under every saved profile are computed together when a dataset is
+    first shown, so switching profiles afterwards is a lookup.
+    """
+    dataset = st.session_state.dataset_processed
+    if dataset is None:
+        return None
+    profile_scores = st.session_state.profile_scores
+    if profile_scores is None or profile_scores.dataset is not dataset:
+        profile_scores = ProfileScores(dataset)
+        profile_scores.precompute([row_metric_weights(), *(profile.row_weights() for profile in get_profile_store().latest())])
+        st.session_state.profile_scores = profile_scores
+    return profile_scores.get(row_metric_weights())
+
+# Stored datasets offered to a session: its history is seeded with (signed-in
+# users) and the stored datasets picker lists at most this many
+RECENT_DATASETS = 20
+
+@st.cache_resource
+def get_dataset_store():
+    """Process-wide persistent store of processed datasets"""
+    return DatasetStore()
+
+def dataset_owner():
+    """Signed-in user's email when the app uses Streamlit authentication, else None (anonymous)"""
+    if not getattr(st.user, 'is_logged_in', False):
+        return None
+    return st.user.get('email')
+
+def reset_comparison_selection():
+    st.session_state.comparison_selection = {'dataset_a': None, 'dataset_b': None}
+    for key in ('dataset_a_select', 'dataset_b_select'):
+        st.session_state.pop(key, None)
+
+def add_stored_dataset(dataset_entry):
+    """Callback: add a stored dataset to this session's comparison history"""
+    history = st.session_state.processed_datasets_history
+    if all(entry['id'] != dataset_entry['id'] for entry in history):
+        history.append(dataset_entry)
+
+def remove_from_history(dataset_id):
+    """Callback: drop a dataset from this session's history; it stays in the store"""
+    st.session_state.processed_datasets_history = [
+        entry for entry in st.session_state.processed_datasets_history if entry['id'] != dataset_id
+    ]
+    reset_comparison_selection()
+
+def delete_stored_dataset(dataset_id):
+    """Callback: delete a dataset from the store, for every session"""
+    remove_from_history(dataset_id)
+    get_dataset_store().delete(dataset_id)
+    get_comparison_cache().invalidate(dataset_id)
+    get_shared_results().forget(dataset_id)
+
+def prune_history():
+    """Drop history entries whose dataset was deleted, possibly by another session"""
+    history = st.session_state.processed_datasets_history
+    stored = get_dataset_store().existing(entry['id'] for entry in history)
+    if len(stored) < len({entry['id'] for entry in history}):
+        st.session_state.processed_datasets_history = [entry for entry in history if entry['id'] in stored]
+        reset_comparison_selection()
+
+def render_stored_datasets():
+    """Sidebar list of this session's datasets and of recent stored ones, with add/remove/delete"""
+    history = st.session_state.processed_datasets_history
+    in_history = {entry['id'] for entry in history}
+    for entry in history:
+        col1, col2 = st.columns([5, 1])
+        col1.markdown(f"{entry['name']} ({entry['sample_count']} samples)")
+        col2.button("✖", key=f"remove_{entry['id']}", on_click=remove_from_history, args=(entry['id'],),
+                    help="Remove from this session (the stored copy is kept)")
+    stored = [entry for entry in reversed(get_dataset_store().list(dataset_owner(), RECENT_DATASETS))
+              if entry['id'] not in in_history]
+    if not stored:
+        return
+    owner = dataset_owner()
+    with st.expander(f"📂 Stored datasets ({'yours' if owner else 'shared, not signed in'})"):
+        for entry in stored:
+            st.markdown(f"**{entry['name']}** • {entry['sample_count']:,} samples • {entry['timestamp']}")
+            col1, col2 = st.columns(2)
+            col1.button("➕ Add", key=f"add_{entry['id']}", on_click=add_stored_dataset, args=(entry,),
+                        use_container_width=True)
+            col2.button("🗑️ Delete", key=f"delete_{entry['id']}", on_click=delete_stored_dataset,
+                        args=(entry['id'],), use_container_width=True)
+
+def load_dataset(dataset_entry):
+    """Dataset behind a history handle, read from the dataset store on first use"""
+    return get_dataset_store().load(dataset_entry['id'])
+
+@st.cache_resource
+def get_comparison_cache():
+    """Process-wide comparison summaries and paired results, keyed by dataset id"""
+    return ComparisonCache()
+
+def dataset_summary(dataset_entry):
+    """Cached summary statistics of a stored dataset; rows are loaded only on a miss"""
+    return get_comparison_cache().summary(dataset_entry['id'], lambda: load_dataset(dataset_entry))
+
+def paired_comparison(entry_a, entry_b):
+    """Cached row-aligned comparison of two stored datasets"""
+    return get_comparison_cache().paired(entry_a['id'], entry_b['id'],
+                                         lambda: load_dataset(entry_a), lambda: load_dataset(entry_b))
+
+def register_processed_dataset(processed_data, filename, selected_llm):
+    """Make a scored dataset the current one and add it to the comparison history"""
+    set_processed_dataset(processed_data)
+    st.session_state.processing_complete = True
+    
+    # Persist the data and keep only a lightweight handle in the history for comparison
+    dataset_entry = get_dataset_store().save(processed_data, filename, selected_llm, owner=dataset_owner())
+    st.session_state.processed_datasets_history.append(dataset_entry)
+
+def register_shared_result(shared, handle):
+    """Make a shared upload result the current dataset; ``handle`` is this owner's entry for it in the dataset store"""
+    set_processed_dataset(shared.dataset, shared.key)
+    st.session_state.processing_complete = True
+    history = st.session_state.processed_datasets_history
+    if all(entry['id'] != handle['id'] for entry in history):
+        history.append(handle)
+
+def render_job_panel(polling=False):
+    """Status of this session's background jobs, with a load button once results are ready"""
+    manager = get_job_manager()
+    jobs = [manager.get(job_id) for job_id in st.session_state.job_ids]
+    
+    st.markdown("### ⏳ Background Jobs")
+    for job in jobs:
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.markdown(f"**{job.name}** • {job.status.title()} • {job.rows_done:,} rows • {format_duration(job.elapsed)}")
+            if job.active:
+                st.progress(job.fraction)
+            elif job.error:
+                st.error(f"Job failed: {job.error}")
+        with col2:
+            # Failed or interrupted jobs keep the chunks they finished
+            loadable = job.status == DONE or (not job.active and job.parts > 0)
+            if loadable and job.id not in st.session_state.loaded_job_ids:
+                label = "📂 Load" if job.status == DONE else "📂 Load Partial"
+                if st.button(label, key=f"load_job_{job.id}", use_container_width=True):
+                    register_processed_dataset(ScoredDataset.from_frame(manager.result(job.id)), job.filename, job.judge)
+                    st.session_state.loaded_job_ids.append(job.id)
+                    st.session_state.page = 'dataset'
+                    st.rerun()
+    
+    # Stop polling once every job has settled
+    if polling and not any(job.active for job in jobs):
+        st.rerun()
+
+@st.fragment(run_every="2s")
+def poll_job_panel():
+    render_job_panel(polling=True)
+
+def show_job_panel():
+    """Render the job panel, refreshing it every few seconds while jobs are active"""
+    if not st.session_state.job_ids:
+        return
+    manager = get_job_manager()
+    if any(manager.get(job_id).active for job_id in st.session_state.job_ids):
+        poll_job_panel()
+    else:
+        render_job_panel()
+
 if st.session_state.metrics_data is None:
-    st.session_state.metrics_data = default_metrics.copy()
+    st.session_state.metrics_data = copy.deepcopy(DEFAULT_METRICS)
+if 'processed_datasets_history' not in st.session_state:
+    # Handles only; frames stay on disk until the Compare page loads them. A
+    # signed-in user starts with their recent datasets; anonymous sessions
+    # start empty and add stored ones explicitly from the sidebar.
+    owner = dataset_owner()
+    st.session_state.processed_datasets_history = (
+        get_dataset_store().list(owner, RECENT_DATASETS) if owner is not None else []
+    )
 
 # Header
 st.markdown('<h1 class="main-title">ADAMS</h1>', unsafe_allow_html=True)
@@ -274,8 +601,8 @@ if st.session_state.page == 'upload':
     # File uploader
     uploaded_file = st.file_uploader(
         "Drop your data into the evaluation system",
-        type=['csv', 'json'],
-        help="Supports CSV, JSON formats • Max 200MB"
+        type=['csv', 'json', 'jsonl'],
+        help="Supports CSV, JSON, JSON Lines formats • Max 200MB"
     )
     
     # LLM Judge Selection
@@ -286,6 +613,11 @@ if st.session_state.page == 'upload':
         llm_options,
         index=llm_options.index(st.session_state.selected_llm)
     )
+    judge_config = JudgeConfig.from_env()
+    if judge_config is not None:
+        st.caption(f"Judge backend: live endpoint `{judge_config.base_url}` • concurrency {judge_config.concurrency}")
+    else:
+        st.caption("Judge backend: simulated scores (set `ADAMS_JUDGE_URL` to use a live endpoint)")
     
     if uploaded_file is not None:
         # Show uploaded file info with delete option
@@ -296,52 +628,46 @@ if st.session_state.page == 'upload':
             if st.button("🗑️ Remove", help="Remove uploaded file", key="delete_upload"):
                 uploaded_file = None
                 st.session_state.processing_complete = False
-                st.session_state.dataset_processed = None
+                set_processed_dataset(None)
                 st.rerun()
         
-        # Simulate processing
+        run_in_background = st.checkbox(
+            "Run as background job",
+            help="Score on a worker process so you can keep working or queue more datasets"
+        )
+        
+        # Run the ADAMS pipeline; progress is driven by the scored chunks
         if st.button("🚀 Launch ADAMS Analysis", use_container_width=True, type="primary"):
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            stages = [
-                f"Initializing {st.session_state.selected_llm} evaluation matrix...",
-                "Deploying multi-agent analysis swarm...",
-                "Processing domain-specific parameters...",
-                "Calibrating metric weighting algorithms...",
-                "Synthesizing evaluation confidence scores...",
-                "ADAMS processing complete ⚡"
-            ]
-            
-            for i, stage in enumerate(stages):
-                progress = (i + 1) / len(stages)
-                progress_bar.progress(progress)
-                status_text.markdown(f'<p class="neon-text">{stage}</p>', unsafe_allow_html=True)
-                time.sleep(0.8)
-            
-            # Process the uploaded dataset
-            processed_data = process_uploaded_dataset(uploaded_file, st.session_state.selected_llm)
-            if processed_data:
-                st.session_state.dataset_processed = processed_data
-                st.session_state.processing_complete = True
+            if run_in_background:
+                job_id = get_job_manager().submit(uploaded_file, uploaded_file.name, st.session_state.selected_llm,
+                                                  JudgeConfig.from_env())
+                st.session_state.job_ids.append(job_id)
+                st.toast(f"⏳ Queued {uploaded_file.name} for {st.session_state.selected_llm} (job {job_id})")
+            else:
+                progress_bar = st.progress(0)
+                status_text = st.empty()
+                tracker = ProgressTracker(st.session_state.selected_llm)
+                status_text.markdown(f'<p class="neon-text">{tracker.summary()}</p>', unsafe_allow_html=True)
                 
-                # Add to history for comparison
-                dataset_entry = {
-                    'name': f"{uploaded_file.name} ({st.session_state.selected_llm})",
-                    'data': processed_data,
-                    'llm_judge': st.session_state.selected_llm,
-                    'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-                    'filename': uploaded_file.name,
-                    'sample_count': len(processed_data)
-                }
-                st.session_state.processed_datasets_history.append(dataset_entry)
+                def report_progress(rows_done, fraction):
+                    tracker.update(rows_done, fraction)
+                    progress_bar.progress(fraction)
+                    status_text.markdown(f'<p class="neon-text">{tracker.summary()}</p>', unsafe_allow_html=True)
                 
-                st.success(f"✅ Successfully processed {len(processed_data)} samples with {st.session_state.selected_llm}!")
-                time.sleep(1)
-                st.session_state.page = 'dataset'
-                st.rerun()
-            else:
-                st.error("❌ Failed to process dataset. Please check file format.")
+                result = process_uploaded_dataset(uploaded_file, st.session_state.selected_llm, on_progress=report_progress)
+                if result is not None:
+                    shared, handle = result
+                    register_shared_result(shared, handle)
+                    
+                    # A toast survives the rerun, so no wait is needed before switching pages
+                    st.toast(f"✅ Successfully processed {len(shared.dataset):,} samples with {st.session_state.selected_llm} "
+                             f"in {format_duration(tracker.elapsed)} ({tracker.rows_per_second:,.0f} rows/s)!")
+                    st.session_state.page = 'dataset'
+                    st.rerun()
+                else:
+                    st.error("❌ Failed to process dataset. Please check file format.")
+    
+    show_job_panel()
     
     if not st.session_state.processing_complete:
         st.markdown("</div>", unsafe_allow_html=True)
@@ -358,7 +684,7 @@ elif st.session_state.page == 'dataset':
     st.markdown("## 📋 Dataset Review & ADAMS Reconfiguration")
     st.markdown("Review the processed dataset with ADAMS scores and download results")
     
-    if st.session_state.dataset_processed:
+    if st.session_state.dataset_processed is not None:
         # Add clear dataset option
         col1, col2 = st.columns([4, 1])
         with col1:
@@ -367,51 +693,102 @@ elif st.session_state.page == 'dataset':
         with col2:
             st.markdown('<div style="padding-top: 2rem;">', unsafe_allow_html=True)
             if st.button("🗑️ Clear Dataset", help="Clear processed dataset and start over", type="secondary"):
-                st.session_state.dataset_processed = None
+                set_processed_dataset(None)
                 st.session_state.processing_complete = False
                 st.session_state.page = 'upload'
                 st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
         
-        # Display dataset as table
-        df = pd.DataFrame(st.session_state.dataset_processed)
+        # Display dataset as table; the frame is a zero-copy view of the columnar dataset,
+        # with ADAMS scores under the weights set on the Configuration page
+        dataset = active_dataset()
+        df = dataset.frame
         
         # Show comparison between original and ADAMS-processed data
         st.markdown("#### 📊 ADAMS-Enhanced Dataset")
         st.markdown("*This dataset has been processed by ADAMS with additional evaluation metrics and scores.*")
         
-        # Display the enhanced dataset
-        display_df = df.copy()
-        if 'Original_Data' in display_df.columns:
-            display_df = display_df.drop('Original_Data', axis=1)
+        # Display the enhanced dataset one page at a time; filtering and sorting run on the
+        # server and only the visible rows, with long text truncated, are sent to the browser
+        with st.expander("🔎 Filter & Sort", expanded=False):
+            filter_col1, filter_col2 = st.columns(2)
+            with filter_col1:
+                score_range = st.slider("ADAMS Score range", 0.0, 10.0, (0.0, 10.0), step=0.1, key="viewer_score_range")
+                judge_filter = st.multiselect(
+                    "LLM Judge",
+                    dataset_view('judges', lambda: sorted(dataset.judges)),
+                    key="viewer_judges"
+                )
+                question_filter = st.text_input("Question contains", key="viewer_question")
+            with filter_col2:
+                sort_by = st.selectbox("Sort by", ['Original order', 'ADAMS_Score', *METRIC_COLUMNS, 'Question'], key="viewer_sort")
+                descending = st.toggle("Descending", value=True, key="viewer_descending")
+                page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1, key="viewer_page_size")
         
-        st.dataframe(display_df, use_container_width=True)
+        view_filter = ViewFilter(
+            score_min=score_range[0],
+            score_max=score_range[1],
+            judges=tuple(judge_filter),
+            question_contains=question_filter.strip(),
+            sort_by=None if sort_by == 'Original order' else sort_by,
+            descending=descending
+        )
+        with section('dataset.view'):
+            positions = dataset_view(('rows', view_filter), lambda: select_rows(df, view_filter))
+        n_pages = page_count(len(positions), page_size)
+        
+        # Return to the first page whenever the selection changes
+        view_signature = (st.session_state.dataset_version, view_filter, page_size)
+        if st.session_state.get('viewer_signature') != view_signature:
+            st.session_state.viewer_signature = view_signature
+            st.session_state.viewer_page = 1
+        
+        page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, step=1, key="viewer_page") - 1
+        with section('dataset.view'):
+            page_df = page_frame(df, positions, page, page_size)
+        st.dataframe(payload('dataset.table', page_df), use_container_width=True)
+        first_row = page * page_size
+        st.caption(f"Rows {min(first_row + 1, len(positions)):,}–{first_row + len(page_df):,} of {len(positions):,} matching ({len(df):,} total)")
+        
+        expanded_row = st.selectbox(
+            "Expand row:",
+            page_df.index,
+            index=None,
+            format_func=lambda i: f"Row {i}",
+            placeholder="Select a row to read its full text",
+            key="viewer_expanded_row"
+        )
+        if expanded_row is not None:
+            full_row = df.loc[expanded_row]
+            st.markdown(f"**Question:** {full_row['Question']}")
+            st.markdown(f"**Reference Answer:** {full_row['Reference_Answer']}")
+            st.markdown(f"**Model Answer:** {full_row['Model_Answer']}")
         
         # Download options
         st.markdown("### 💾 Download Options")
         col1, col2 = st.columns(2)
         
         with col1:
-            # Download as CSV
-            csv_data = df.to_csv(index=False)
-            st.download_button(
-                label="📥 Download CSV",
-                data=csv_data,
-                file_name=f"adams_dataset_{st.session_state.selected_llm.lower().replace(' ', '_')}.csv",
-                mime="text/csv",
-                use_container_width=True
+            export_format = st.selectbox(
+                "Export format:",
+                available_formats(),
+                format_func=lambda fmt: EXPORT_FORMATS[fmt]['label'],
+                key="dataset_export_format"
             )
         
         with col2:
-            # Download as JSON
-            json_data = df.to_json(orient='records', indent=2)
+            # The payload is built only when the button is clicked, then memoized per dataset version
+            views, version = st.session_state.dataset_views, dataset_view_version()
+            st.markdown('<div style="padding-top: 1.7rem;">', unsafe_allow_html=True)
             st.download_button(
-                label="📥 Download JSON",
-                data=json_data,
-                file_name=f"adams_dataset_{st.session_state.selected_llm.lower().replace(' ', '_')}.json",
-                mime="application/json",
+                label=f"📥 Download {EXPORT_FORMATS[export_format]['label']}",
+                data=lambda: views.get(version, f'export:{export_format}', lambda: export_bytes(df, export_format)),
+                file_name=export_file_name(f"adams_dataset_{st.session_state.selected_llm.lower().replace(' ', '_')}", export_format),
+                mime=EXPORT_FORMATS[export_format]['mime'],
+                on_click="ignore",
                 use_container_width=True
             )
+            st.markdown('</div>', unsafe_allow_html=True)
         
         st.markdown("</div>", unsafe_allow_html=True)
         
@@ -419,24 +796,35 @@ elif st.session_state.page == 'dataset':
         st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
         st.markdown("### 📈 Dataset Statistics")
         
+        with section('dataset.stats'):
+            dataset_stats = dataset_view('score_stats', lambda: score_stats(dataset))
+        
         col1, col2, col3, col4 = st.columns(4)
         with col1:
             st.metric("Total Samples", len(df))
         with col2:
-            st.metric("Average ADAMS Score", f"{df['ADAMS_Score'].mean():.2f}")
+            st.metric("Average ADAMS Score", f"{dataset_stats['mean']:.2f}")
         with col3:
-            st.metric("Highest Score", f"{df['ADAMS_Score'].max():.2f}")
+            st.metric("Highest Score", f"{dataset_stats['max']:.2f}")
         with col4:
-            st.metric("Lowest Score", f"{df['ADAMS_Score'].min():.2f}")
+            st.metric("Lowest Score", f"{dataset_stats['min']:.2f}")
+        
+        with section('dataset.stats'):
+            memory = dataset_view('memory', dataset.memory_report)
+        st.caption(f"In memory: {memory['columnar_bytes'] / 2**20:,.1f} MB columnar vs. "
+                   f"~{memory['legacy_bytes'] / 2**20:,.1f} MB as per-row dicts ({memory['ratio']:.1f}× smaller)")
         
         st.markdown("</div>", unsafe_allow_html=True)
         
+        show_job_panel()
+        
         if st.button("🎛️ Proceed to Configuration", use_container_width=True, type="primary"):
             st.session_state.page = 'config'
             st.rerun()
     
     else:
         st.warning("⚠️ No processed dataset available. Please upload and process a dataset first.")
+        show_job_panel()
         if st.button("← Back to Upload", use_container_width=True):
             st.session_state.page = 'upload'
             st.rerun()
@@ -450,33 +838,108 @@ elif st.session_state.page == 'config':
     col1, col2 = st.columns([2, 1])
     
     with col1:
+        # Named, versioned weight profiles
         st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
-        st.markdown("### 🧬 Metric Control Matrix")
+        st.markdown("### 🗂️ Weight Profiles")
+        profile_store = get_profile_store()
+        profile_options = [profile for name in profile_store.names() for profile in reversed(profile_store.versions(name))]
+        active_key = st.session_state.active_profile
+        active = next((profile for profile in profile_options if profile.key == active_key), None)
         
-        # Create sliders for each metric with real-time updates
-        updated_weights = {}
-        
-        for metric_name, data in st.session_state.metrics_data.items():
-            updated_weights[metric_name] = st.slider(
-                f"**{metric_name}**",
-                min_value=0.0,
-                max_value=1.0,
-                value=data['weight'],
-                step=0.05,
-                key=f"slider_{metric_name}",
-                help=f"Current score: {data['score']}"
+        profile_col1, profile_col2 = st.columns([3, 1])
+        with profile_col1:
+            selected_profile = st.selectbox(
+                "Profile:",
+                profile_options,
+                index=profile_options.index(active) if active is not None else 0,
+                format_func=lambda profile: profile.label + (" (built-in)" if profile.builtin else ""),
+                key="profile_select"
             )
+        with profile_col2:
+            st.markdown('<div style="padding-top: 1.7rem;">', unsafe_allow_html=True)
+            st.button("📂 Load", use_container_width=True, on_click=load_selected_profile)
+            st.markdown('</div>', unsafe_allow_html=True)
         
-        # Update the session state immediately when sliders change
-        for metric_name in st.session_state.metrics_data:
-            st.session_state.metrics_data[metric_name]['weight'] = updated_weights[metric_name]
+        if active is not None:
+            modified = active.as_dict() != current_weights()
+            st.caption(f"Active profile: **{active.label}**{' (modified)' if modified else ''}")
         
-        if st.button("↺ Reset to Defaults", use_container_width=True):
-            st.session_state.metrics_data = default_metrics.copy()
-            st.rerun()
+        save_col1, save_col2 = st.columns([3, 1])
+        with save_col1:
+            profile_name = st.text_input("Save current weights as:", value=active.name if active is not None else "",
+                                         placeholder="e.g. clinical-strict", key="profile_name")
+        with save_col2:
+            st.markdown('<div style="padding-top: 1.7rem;">', unsafe_allow_html=True)
+            if st.button("💾 Save", use_container_width=True, disabled=not profile_name.strip()):
+                saved = profile_store.save(profile_name, current_weights())
+                st.session_state.active_profile = saved.key
+                st.toast(f"💾 Saved weight profile {saved.label}")
+                st.rerun()
+            st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+        
+        st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
+        st.markdown("### 🧬 Metric Control Matrix")
+        
+        # Sliders sit in a form: dragging them does not rerun the app, and all edits
+        # are applied together, with a single re-score, when the form is submitted
+        with st.form("weight_editor", border=False):
+            for metric_name, data in st.session_state.metrics_data.items():
+                # Slider values live under their keys, so weights applied from code show up too
+                st.session_state.setdefault(f"slider_{metric_name}", data['weight'])
+                st.slider(
+                    f"**{metric_name}**",
+                    min_value=0.0,
+                    max_value=1.0,
+                    step=0.05,
+                    key=f"slider_{metric_name}",
+                    help=f"Current score: {data['score']}"
+                )
+            
+            st.form_submit_button("✅ Apply Weights", use_container_width=True, type="primary", on_click=apply_slider_weights)
+        
+        st.button("↺ Reset to Defaults", use_container_width=True, on_click=reset_metrics)
         
         st.markdown("</div>", unsafe_allow_html=True)
         
+        # Weight fitting against human reviewer labels
+        if st.session_state.dataset_processed is not None:
+            st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
+            st.markdown("### 🎯 Fit Weights to Reviewer Labels")
+            st.markdown("Upload the dataset's rows with a human score or preference column; "
+                        "rows are matched on Question, Reference and Model Answer.")
+            labels_file = st.file_uploader("Labelled rows", type=['csv', 'json', 'jsonl', 'parquet'], key="labels_file")
+            fit_col1, fit_col2 = st.columns(2)
+            with fit_col1:
+                label_column = st.text_input("Label column", value=DEFAULT_LABEL_COLUMN, key="label_column")
+            with fit_col2:
+                fit_mode = st.radio("Objective", list(FIT_MODES), format_func=FIT_MODES.get, horizontal=True, key="fit_mode")
+            
+            if st.button("🧮 Fit Weights", use_container_width=True, disabled=labels_file is None):
+                try:
+                    label_keys, labels = read_labels(labels_file, labels_file.name, label_column)
+                    st.session_state.weight_fit = fit_weights(st.session_state.dataset_processed, label_keys, labels,
+                                                              fit_mode, baseline=row_metric_weights())
+                except (LabelError, MissingColumnsError, UnsupportedFormatError) as e:
+                    st.session_state.weight_fit = None
+                    st.error(f"Could not fit weights: {e}")
+            
+            weight_fit = st.session_state.weight_fit
+            if weight_fit is not None:
+                # Snapped to the sliders' 0.05 steps
+                suggested = {col.replace('_', ' '): round(weight * 20) / 20 for col, weight in weight_fit.profile().items()}
+                st.dataframe(pd.DataFrame({
+                    'Metric': list(suggested),
+                    'Current': [st.session_state.metrics_data.get(name, {}).get('weight') for name in suggested],
+                    'Suggested': list(suggested.values())
+                }), use_container_width=True, hide_index=True)
+                st.markdown(f"**Fit on {weight_fit.n_rows:,} labelled rows** • "
+                            f"Spearman {weight_fit.spearman:.3f} (current {weight_fit.baseline_spearman:.3f}) • "
+                            f"Pearson {weight_fit.pearson:.3f} (current {weight_fit.baseline_pearson:.3f})")
+                st.button("✅ Apply Suggested Profile", use_container_width=True, type="primary",
+                          on_click=apply_metric_weights, args=(suggested,))
+            st.markdown("</div>", unsafe_allow_html=True)
+        
         # Reviewer Comments Section
         st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
         st.markdown("### 💬 Reviewer Comments & Notes")
@@ -505,26 +968,29 @@ elif st.session_state.page == 'config':
             if st.button("💾 Save Comments", use_container_width=True):
                 st.session_state.reviewer_comments['main_comment'] = reviewer_comment
                 st.session_state.reviewer_comments['mode'] = comment_mode
-                st.session_state.reviewer_comments['timestamp'] = time.strftime("%Y-%m-%d %H:%M:%S")
+                st.session_state.reviewer_comments['timestamp'] = timestamp()
                 st.success(f"Comments saved as '{comment_mode}' mode!")
         
         with col_load:
-            if st.button("📋 Export Comments", use_container_width=True):
-                if st.session_state.reviewer_comments:
-                    comment_data = {
-                        "comment": st.session_state.reviewer_comments.get('main_comment', ''),
-                        "mode": st.session_state.reviewer_comments.get('mode', ''),
-                        "timestamp": st.session_state.reviewer_comments.get('timestamp', ''),
-                        "llm_judge": st.session_state.selected_llm,
-                        "metric_weights": st.session_state.metrics_data
-                    }
-                    
-                    st.download_button(
-                        label="Download Comments",
-                        data=json.dumps(comment_data, indent=2),
-                        file_name=f"reviewer_comments_{comment_mode.lower()}_{time.strftime('%Y%m%d_%H%M%S')}.json",
-                        mime="application/json"
-                    )
+            # Built on click; download callables run off the script thread, so capture state now
+            comments = dict(st.session_state.reviewer_comments)
+            comment_judge = st.session_state.selected_llm
+            comment_weights = st.session_state.metrics_data
+            st.download_button(
+                label="📋 Export Comments",
+                data=lambda: json.dumps({
+                    "comment": comments.get('main_comment', ''),
+                    "mode": comments.get('mode', ''),
+                    "timestamp": comments.get('timestamp', ''),
+                    "llm_judge": comment_judge,
+                    "metric_weights": comment_weights
+                }, indent=2),
+                file_name=f"reviewer_comments_{comment_mode.lower()}_{time.strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json",
+                on_click="ignore",
+                disabled=not comments,
+                use_container_width=True
+            )
         
         st.markdown("</div>", unsafe_allow_html=True)
     
@@ -532,26 +998,30 @@ elif st.session_state.page == 'config':
         st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
         
         # Calculate final score in real-time
-        total_weighted_score = 0
-        total_weights = 0
-        
-        for metric_name, data in st.session_state.metrics_data.items():
-            total_weighted_score += data['score'] * data['weight']
-            total_weights += data['weight']
-        
-        final_score = total_weighted_score / total_weights if total_weights > 0 else 0
+        config_score, total_weights = final_score(st.session_state.metrics_data)
         
         # Display final score with real-time updates
         st.markdown(f"""
         <div class="score-display">
             <h3 style="color: #b8bcc8; margin-bottom: 1rem;">Final ADAMS Score</h3>
-            <div class="score-value">{final_score:.2f}</div>
+            <div class="score-value">{config_score:.2f}</div>
             <div style="font-size: 0.9rem; color: #b8bcc8; margin-top: 0.5rem;">
                 Based on {total_weights:.2f} total weight
             </div>
         </div>
         """, unsafe_allow_html=True)
         
+        # Every row of the loaded dataset is re-scored with the sliders' weights (no judge calls)
+        if st.session_state.dataset_processed is not None:
+            dataset = active_dataset()
+            rescored_stats = dataset_view('score_stats', lambda: score_stats(dataset))
+            stored_mean = score_stats(st.session_state.dataset_processed)['mean']
+            st.markdown("#### 📊 Loaded Dataset")
+            st.metric("Mean ADAMS Score", f"{rescored_stats['mean']:.2f}", f"{rescored_stats['mean'] - stored_mean:+.2f} vs. judged weights")
+            st.markdown(f"**Range:** {rescored_stats['min']:.2f} – {rescored_stats['max']:.2f} over {len(dataset):,} rows")
+            st.caption(f"Per-row scores use the {len(METRIC_COLUMNS)} metrics the judge scored: "
+                       f"{', '.join(col.replace('_', ' ') for col in METRIC_COLUMNS)}.")
+        
         # Sample analysis
         st.markdown("#### 📋 Sample Analysis")
         
@@ -563,8 +1033,7 @@ elif st.session_state.page == 'config':
             """)
         
         # Impact analysis
-        sorted_metrics = sorted(st.session_state.metrics_data.items(), key=lambda x: x[1]['weight'], reverse=True)
-        top_3_metrics = sorted_metrics[:3]
+        top_3_metrics = top_metrics(st.session_state.metrics_data)
         top_names = [metric[0] for metric in top_3_metrics]
         avg_top_weight = sum(metric[1]['weight'] for metric in top_3_metrics) / 3
         
@@ -596,7 +1065,7 @@ elif st.session_state.page == 'config':
         
         st.markdown(f"**Highest priority:** {highest_weight_metric[0]} ({highest_weight_metric[1]['weight']:.2f})")
         st.markdown(f"**Lowest priority:** {lowest_weight_metric[0]} ({lowest_weight_metric[1]['weight']:.2f})")
-        st.markdown(f"**Current final score:** {final_score:.2f}")
+        st.markdown(f"**Current final score:** {config_score:.2f}")
         
         st.markdown("</div>", unsafe_allow_html=True)
     
@@ -608,40 +1077,51 @@ elif st.session_state.page == 'config':
             st.session_state.page = 'dataset'
             st.rerun()
     with col2:
-        if st.button("💾 Save Configuration", use_container_width=True, type="primary"):
-            config_data = {
-                "metrics": st.session_state.metrics_data,
-                "final_score": final_score,
-                "llm_judge": st.session_state.selected_llm,
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            st.download_button(
-                label="Download Configuration",
-                data=json.dumps(config_data, indent=2),
-                file_name=f"adams_config_{time.strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json"
-            )
+        config_metrics = st.session_state.metrics_data
+        config_judge = st.session_state.selected_llm
+        config_profile = "{} v{}".format(*st.session_state.active_profile) if st.session_state.active_profile else None
+        st.download_button(
+            label="💾 Save Configuration",
+            data=lambda: json.dumps(config_report(config_metrics, config_profile, config_judge), indent=2),
+            file_name=f"adams_config_{time.strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json",
+            on_click="ignore",
+            type="primary",
+            use_container_width=True
+        )
     with col3:
-        if st.button("📤 Export Full Report", use_container_width=True, type="primary"):
-            full_report = {
-                "dataset": st.session_state.dataset_processed,
-                "metrics": st.session_state.metrics_data,
-                "final_score": final_score,
-                "llm_judge": st.session_state.selected_llm,
-                "reviewer_comments": st.session_state.reviewer_comments,
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            st.download_button(
-                label="Download Full Report",
-                data=json.dumps(full_report, indent=2),
-                file_name=f"adams_full_report_{time.strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json"
-            )
+        # Rows go into a columnar file (or JSON Lines); the settings travel as report metadata
+        report_format = st.selectbox(
+            "Report format:",
+            available_report_formats(),
+            format_func=lambda fmt: EXPORT_FORMATS[fmt]['label'],
+            key="report_format",
+            label_visibility="collapsed"
+        )
+        if st.session_state.dataset_processed is not None:
+            report_df = active_dataset().frame
+        else:
+            report_df = pd.DataFrame(columns=OUTPUT_COLUMNS)
+        report_metadata = {
+            "metrics": st.session_state.metrics_data,
+            "final_score": config_score,
+            "llm_judge": st.session_state.selected_llm,
+            "reviewer_comments": dict(st.session_state.reviewer_comments)
+        }
+        st.download_button(
+            label="📤 Export Full Report",
+            data=lambda: export_bytes(report_df, report_format,
+                                      {**report_metadata, "timestamp": timestamp()}),
+            file_name=export_file_name(f"adams_full_report_{time.strftime('%Y%m%d_%H%M%S')}", report_format),
+            mime=EXPORT_FORMATS[report_format]['mime'],
+            on_click="ignore",
+            type="primary",
+            use_container_width=True
+        )
 
 # Page 4: Dataset Comparison
 elif st.session_state.page == 'compare':
+    prune_history()
     st.markdown("## ⚖️ Dataset Comparison Analysis")
     st.markdown("Compare previously processed ADAMS datasets with advanced statistical analysis")
     
@@ -671,6 +1151,7 @@ elif st.session_state.page == 'compare':
             3. Return here to compare performance
             """)
         
+        st.caption("Datasets processed earlier can be added from **📂 Stored datasets** in the sidebar.")
         if st.button("📊 Go to Dataset Upload", use_container_width=True, type="primary"):
             st.session_state.page = 'upload'
             st.rerun()
@@ -749,8 +1230,13 @@ elif st.session_state.page == 'compare':
             
             dataset_a = st.session_state.comparison_selection['dataset_a']
             dataset_b = st.session_state.comparison_selection['dataset_b']
-            df_a = pd.DataFrame(dataset_a['data'])
-            df_b = pd.DataFrame(dataset_b['data'])
+            # Summaries are computed once per dataset; the pair is derived from them
+            summary_a = dataset_summary(dataset_a)
+            summary_b = dataset_summary(dataset_b)
+            with section('compare.pair'):
+                comparison = compare_pair(summary_a, summary_b)
+            # Rows shared by both datasets (same questions, different judges) allow a paired test
+            paired = paired_comparison(dataset_a, dataset_b)
             name_a = dataset_a['name']
             name_b = dataset_b['name']
             
@@ -763,7 +1249,7 @@ elif st.session_state.page == 'compare':
             with col1:
                 st.markdown(f"""
                 <div class="metric-display">
-                    <div class="metric-value">{len(df_a)}</div>
+                    <div class="metric-value">{summary_a.n}</div>
                     <div class="metric-name">{name_a.split('(')[0].strip()} Samples</div>
                 </div>
                 """, unsafe_allow_html=True)
@@ -771,13 +1257,13 @@ elif st.session_state.page == 'compare':
             with col2:
                 st.markdown(f"""
                 <div class="metric-display">
-                    <div class="metric-value">{len(df_b)}</div>
+                    <div class="metric-value">{summary_b.n}</div>
                     <div class="metric-name">{name_b.split('(')[0].strip()} Samples</div>
                 </div>
                 """, unsafe_allow_html=True)
                 
             with col3:
-                avg_diff = df_a['ADAMS_Score'].mean() - df_b['ADAMS_Score'].mean()
+                avg_diff = comparison.score_difference
                 color = "#00f5ff" if avg_diff >= 0 else "#ff006e"
                 st.markdown(f"""
                 <div class="metric-display">
@@ -787,17 +1273,16 @@ elif st.session_state.page == 'compare':
                 """, unsafe_allow_html=True)
                 
             with col4:
-                # Calculate statistical significance
-                try:
-                    from scipy import stats
-                    t_stat, p_value = stats.ttest_ind(df_a['ADAMS_Score'], df_b['ADAMS_Score'])
-                    significance = "Significant" if p_value < 0.05 else "Not Significant"
-                    sig_color = "#00f5ff" if p_value < 0.05 else "#b8bcc8"
-                    sig_display = f"p={p_value:.3f}"
-                except:
+                # Statistical significance of the ADAMS score difference, paired when the rows line up
+                significance_test = paired if paired.usable else comparison
+                if significance_test.significant is None:
                     significance = "N/A"
                     sig_color = "#b8bcc8"
                     sig_display = "N/A"
+                else:
+                    significance = "Significant" if significance_test.significant else "Not Significant"
+                    sig_color = "#00f5ff" if significance_test.significant else "#b8bcc8"
+                    sig_display = f"{'paired ' if paired.usable else ''}p={significance_test.score_p_value:.3f}"
                 
                 st.markdown(f"""
                 <div class="metric-display">
@@ -808,6 +1293,35 @@ elif st.session_state.page == 'compare':
             
             st.markdown("</div>", unsafe_allow_html=True)
             
+            # Paired Row-Level Analysis
+            if paired.n_pairs > 0:
+                st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
+                st.markdown("### 🔗 Paired Row-Level Analysis")
+                st.markdown(f"**{paired.n_pairs:,}** rows share the same question, reference and model answer "
+                            f"({paired.coverage:.0%} of the smaller dataset).")
+                
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Paired Mean Difference", f"{paired.score_difference:+.2f}")
+                with col2:
+                    st.metric("Paired p-value", "N/A" if np.isnan(paired.score_p_value) else f"{paired.score_p_value:.3f}")
+                with col3:
+                    st.metric("Score Correlation", "N/A" if np.isnan(paired.correlation) else f"{paired.correlation:.2f}")
+                with col4:
+                    st.metric(f"Rows Differing > {DISAGREEMENT_THRESHOLD:g}", f"{paired.disagreement_rate:.1%}")
+                
+                if not paired.usable:
+                    st.caption("Too few shared rows for the paired test to replace the independent one above.")
+                
+                with st.expander("Largest disagreements", expanded=False):
+                    questions = load_dataset(dataset_a).text['Question'].iloc[paired.top_positions_a]
+                    st.dataframe(pd.DataFrame({
+                        'Row (A)': paired.top_positions_a,
+                        'Question': questions.to_numpy(),
+                        f'{dataset_a["llm_judge"]} − {dataset_b["llm_judge"]}': paired.top_differences.round(2)
+                    }), use_container_width=True, hide_index=True)
+                st.markdown("</div>", unsafe_allow_html=True)
+            
             # LLM Judge Performance Comparison
             st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
             st.markdown("### 🤖 LLM Judge Performance")
@@ -816,48 +1330,28 @@ elif st.session_state.page == 'compare':
             
             with col1:
                 st.markdown(f"#### 🔵 {dataset_a['llm_judge']} Results")
-                st.markdown(f"**Mean ADAMS Score:** {df_a['ADAMS_Score'].mean():.2f}")
-                st.markdown(f"**Median Score:** {df_a['ADAMS_Score'].median():.2f}")
-                st.markdown(f"**Standard Deviation:** {df_a['ADAMS_Score'].std():.2f}")
-                st.markdown(f"**Score Range:** {df_a['ADAMS_Score'].min():.2f} - {df_a['ADAMS_Score'].max():.2f}")
-                
-                # Performance rating
-                avg_score_a = df_a['ADAMS_Score'].mean()
-                if avg_score_a >= 9.0:
-                    rating_a = "🟢 Excellent"
-                elif avg_score_a >= 8.0:
-                    rating_a = "🔵 Very Good"
-                elif avg_score_a >= 7.0:
-                    rating_a = "🟡 Good"
-                else:
-                    rating_a = "🔴 Needs Improvement"
+                avg_score_a = summary_a.score('mean')
+                st.markdown(f"**Mean ADAMS Score:** {avg_score_a:.2f}")
+                st.markdown(f"**Median Score:** {summary_a.score('median'):.2f}")
+                st.markdown(f"**Standard Deviation:** {summary_a.score('std'):.2f}")
+                st.markdown(f"**Score Range:** {summary_a.score('min'):.2f} - {summary_a.score('max'):.2f}")
                 
-                st.markdown(f"**Performance Rating:** {rating_a}")
+                st.markdown(f"**Performance Rating:** {performance_rating(avg_score_a)}")
             
             with col2:
                 st.markdown(f"#### 🔴 {dataset_b['llm_judge']} Results")
-                st.markdown(f"**Mean ADAMS Score:** {df_b['ADAMS_Score'].mean():.2f}")
-                st.markdown(f"**Median Score:** {df_b['ADAMS_Score'].median():.2f}")
-                st.markdown(f"**Standard Deviation:** {df_b['ADAMS_Score'].std():.2f}")
-                st.markdown(f"**Score Range:** {df_b['ADAMS_Score'].min():.2f} - {df_b['ADAMS_Score'].max():.2f}")
-                
-                # Performance rating
-                avg_score_b = df_b['ADAMS_Score'].mean()
-                if avg_score_b >= 9.0:
-                    rating_b = "🟢 Excellent"
-                elif avg_score_b >= 8.0:
-                    rating_b = "🔵 Very Good"
-                elif avg_score_b >= 7.0:
-                    rating_b = "🟡 Good"
-                else:
-                    rating_b = "🔴 Needs Improvement"
+                avg_score_b = summary_b.score('mean')
+                st.markdown(f"**Mean ADAMS Score:** {avg_score_b:.2f}")
+                st.markdown(f"**Median Score:** {summary_b.score('median'):.2f}")
+                st.markdown(f"**Standard Deviation:** {summary_b.score('std'):.2f}")
+                st.markdown(f"**Score Range:** {summary_b.score('min'):.2f} - {summary_b.score('max'):.2f}")
                 
-                st.markdown(f"**Performance Rating:** {rating_b}")
+                st.markdown(f"**Performance Rating:** {performance_rating(avg_score_b)}")
             
             # Winner determination
-            if avg_diff > 0.1:
+            if comparison.winner == 'a':
                 winner = f"🏆 **Winner: {dataset_a['llm_judge']}** (by {avg_diff:.2f} points)"
-            elif avg_diff < -0.1:
+            elif comparison.winner == 'b':
                 winner = f"🏆 **Winner: {dataset_b['llm_judge']}** (by {abs(avg_diff):.2f} points)"
             else:
                 winner = "🤝 **Result: Statistical Tie** (difference < 0.1)"
@@ -869,36 +1363,15 @@ elif st.session_state.page == 'compare':
             st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
             st.markdown("### 🧬 Detailed Metric Analysis")
             
-            # Get metric columns (excluding metadata)
-            metric_cols = [col for col in df_a.columns if col not in ['Question', 'Reference_Answer', 'Model_Answer', 'LLM_Judge', 'Processing_Timestamp', 'Original_Data']]
-            
-            if len(metric_cols) > 1:
-                comparison_data = []
-                for metric in metric_cols:
-                    if metric in df_b.columns:
-                        try:
-                            mean_a = df_a[metric].mean()
-                            mean_b = df_b[metric].mean()
-                            difference = mean_a - mean_b
-                            
-                            comparison_data.append({
-                                'Metric': metric.replace('_', ' ').title(),
-                                f'{dataset_a["llm_judge"]} Avg': round(mean_a, 2),
-                                f'{dataset_b["llm_judge"]} Avg': round(mean_b, 2),
-                                'Difference': round(difference, 2),
-                                'Better Judge': dataset_a['llm_judge'] if difference > 0 else dataset_b['llm_judge'] if difference < 0 else 'Tie'
-                            })
-                        except:
-                            continue
-                
+            # Per-metric means and differences come from the cached summaries
+            comparison_data = metric_rows(summary_a, summary_b, comparison, dataset_a['llm_judge'], dataset_b['llm_judge'])
+            if len(SUMMARY_COLUMNS) > 1:
                 if comparison_data:
                     comparison_df = pd.DataFrame(comparison_data)
-                    st.dataframe(comparison_df, use_container_width=True)
+                    st.dataframe(payload('compare.table', comparison_df), use_container_width=True)
                     
                     # Judge performance summary
-                    a_wins = sum(1 for row in comparison_data if row['Better Judge'] == dataset_a['llm_judge'])
-                    b_wins = sum(1 for row in comparison_data if row['Better Judge'] == dataset_b['llm_judge'])
-                    ties = sum(1 for row in comparison_data if row['Better Judge'] == 'Tie')
+                    a_wins, b_wins, ties = comparison.win_counts()
                     
                     st.markdown(f"""
                     **📊 Metric Performance Summary:**
@@ -911,6 +1384,45 @@ elif st.session_state.page == 'compare':
             
             st.markdown("</div>", unsafe_allow_html=True)
             
+            # Bootstrap Confidence Intervals
+            st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
+            st.markdown("### 📏 Bootstrap Confidence Intervals")
+            col1, col2 = st.columns([1, 2])
+            with col1:
+                n_resamples = st.number_input("Resamples", min_value=1_000, max_value=100_000,
+                                              value=DEFAULT_RESAMPLES, step=1_000, key="bootstrap_resamples")
+            with col2:
+                st.markdown('<div style="padding-top: 2rem;">', unsafe_allow_html=True)
+                show_bootstrap = st.toggle("Compute 95% intervals", key="bootstrap_enabled")
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            bootstrap = None
+            if show_bootstrap:
+                # Vectorized resampling on a worker pool; cached per dataset pair and resample count
+                with st.spinner(f"Resampling {n_resamples:,} times..."):
+                    bootstrap = get_comparison_cache().bootstrap(
+                        dataset_a['id'], dataset_b['id'], int(n_resamples),
+                        lambda: load_dataset(dataset_a), lambda: load_dataset(dataset_b)
+                    )
+                excludes_zero = bootstrap.excludes_zero()
+                st.dataframe(pd.DataFrame({
+                    'Metric': [col.replace('_', ' ').title() for col in SUMMARY_COLUMNS],
+                    f'{dataset_a["llm_judge"]} Mean CI': [f"{lo:.2f} – {hi:.2f}" for lo, hi in bootstrap.mean_a],
+                    f'{dataset_b["llm_judge"]} Mean CI': [f"{lo:.2f} – {hi:.2f}" for lo, hi in bootstrap.mean_b],
+                    'Difference CI': [f"{lo:+.3f} – {hi:+.3f}" for lo, hi in bootstrap.difference],
+                    'Excludes 0': excludes_zero
+                }), use_container_width=True, hide_index=True)
+                
+                score_low, score_high = bootstrap.difference[0]
+                if excludes_zero[0]:
+                    leader = dataset_a['llm_judge'] if score_low > 0 else dataset_b['llm_judge']
+                    st.markdown(f"**Bootstrap verdict:** {leader} scores higher (95% CI of the difference {score_low:+.3f} to {score_high:+.3f})")
+                else:
+                    st.markdown(f"**Bootstrap verdict:** no clear winner (95% CI of the difference {score_low:+.3f} to {score_high:+.3f} includes 0)")
+                st.caption(f"{bootstrap.n_resamples:,} {'paired ' if bootstrap.paired else ''}resamples")
+            
+            st.markdown("</div>", unsafe_allow_html=True)
+            
             # Export Comparison
             st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
             st.markdown("### 💾 Export Comparison Results")
@@ -918,36 +1430,12 @@ elif st.session_state.page == 'compare':
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                # Create comparison report
-                report_data = {
-                    "comparison_summary": {
-                        "dataset_a": {
-                            "name": name_a,
-                            "llm_judge": dataset_a['llm_judge'],
-                            "samples": len(df_a),
-                            "mean_score": df_a['ADAMS_Score'].mean(),
-                            "processing_time": dataset_a['timestamp']
-                        },
-                        "dataset_b": {
-                            "name": name_b,
-                            "llm_judge": dataset_b['llm_judge'],
-                            "samples": len(df_b),
-                            "mean_score": df_b['ADAMS_Score'].mean(),
-                            "processing_time": dataset_b['timestamp']
-                        },
-                        "comparison_results": {
-                            "score_difference": avg_diff,
-                            "statistical_significance": significance if 'significance' in locals() else "N/A",
-                            "winner": dataset_a['llm_judge'] if avg_diff > 0.1 else dataset_b['llm_judge'] if avg_diff < -0.1 else "Tie",
-                            "comparison_timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-                        }
-                    },
-                    "detailed_metrics": comparison_data if 'comparison_data' in locals() else []
-                }
+                report_data = comparison_report(dataset_a, dataset_b, summary_a, summary_b, comparison, paired,
+                                                significance, comparison_data, bootstrap)
                 
                 st.download_button(
                     label="📊 Download Report",
-                    data=json.dumps(report_data, indent=2),
+                    data=payload('export.report', json.dumps(report_data, indent=2)),
                     file_name=f"adams_comparison_{dataset_a['llm_judge'].lower()}_vs_{dataset_b['llm_judge'].lower()}_{time.strftime('%Y%m%d_%H%M%S')}.json",
                     mime="application/json",
                     use_container_width=True
@@ -983,11 +1471,67 @@ elif st.session_state.page == 'compare':
             - Pay attention to statistical significance indicators
             """)
             st.markdown("</div>", unsafe_allow_html=True)
+        
+        # N-way comparison of every processed dataset
+        st.markdown('<div class="cyber-card">', unsafe_allow_html=True)
+        st.markdown("### 🧮 All-Datasets Comparison Matrix")
+        if st.toggle(f"Compare all {len(st.session_state.processed_datasets_history)} datasets at once", key="compare_all"):
+            # Altair is only needed for this chart; importing it up front slows every cold start
+            import altair as alt
+            
+            history = st.session_state.processed_datasets_history
+            labels = [f"#{i} {entry['name']}" for i, entry in enumerate(history, 1)]
+            # Every pair is derived from the cached summaries in one broadcast pass
+            with section('compare.matrix'):
+                matrix = compare_all([dataset_summary(entry) for entry in history])
+            
+            matrix_metric = st.selectbox(
+                "Metric:",
+                SUMMARY_COLUMNS,
+                format_func=lambda col: col.replace('_', ' ').title(),
+                key="compare_all_metric"
+            )
+            c = matrix.column(matrix_metric)
+            
+            n_datasets = len(labels)
+            heatmap_df = pd.DataFrame({
+                'Dataset': np.repeat(labels, n_datasets),
+                'Compared with': np.tile(labels, n_datasets),
+                'Difference': matrix.difference[:, :, c].ravel().round(3),
+                'p-value': matrix.p_value[:, :, c].ravel().round(4),
+                'Metrics won': matrix.wins().ravel()
+            })
+            heatmap = alt.Chart(heatmap_df).mark_rect().encode(
+                x=alt.X('Compared with:N', sort=labels, title=None),
+                y=alt.Y('Dataset:N', sort=labels, title=None),
+                color=alt.Color('Difference:Q', scale=alt.Scale(scheme='redblue', domainMid=0), title="Row − column"),
+                tooltip=['Dataset', 'Compared with', 'Difference', 'p-value', 'Metrics won']
+            )
+            significant_marks = alt.Chart(heatmap_df[heatmap_df['p-value'] < SIGNIFICANCE_LEVEL]).mark_text(text='✱').encode(
+                x=alt.X('Compared with:N', sort=labels),
+                y=alt.Y('Dataset:N', sort=labels)
+            )
+            st.altair_chart(heatmap + significant_marks, use_container_width=True)
+            st.caption(f"Mean {matrix_metric.replace('_', ' ')} of the row dataset minus the column dataset; "
+                       f"✱ marks p < {SIGNIFICANCE_LEVEL}")
+            
+            st.markdown("#### 🏅 Standings")
+            standings = pd.DataFrame({
+                'Dataset': labels,
+                'LLM Judge': [entry['llm_judge'] for entry in history],
+                'Samples': [entry['sample_count'] for entry in history],
+                'Mean': matrix.mean[:, c].round(2),
+                'Significant wins': matrix.significant_wins(c),
+                'Significant losses': matrix.significant_losses(c),
+                'Metrics won (all pairs)': matrix.wins().sum(axis=1)
+            }).sort_values(['Significant wins', 'Mean'], ascending=False)
+            st.dataframe(payload('compare.table', standings), use_container_width=True, hide_index=True)
+        st.markdown("</div>", unsafe_allow_html=True)
 
 # Sidebar with additional info
 with st.sidebar:
     st.markdown("### 🧠 ADAMS Interface")
-    st.markdown("**Version:** 2.0.0")
+    st.markdown(f"**Version:** {adams.__version__}")
     st.markdown("**Status:** ✅ Online")
     st.markdown("**Mode:** Interactive Demo")
     
@@ -996,13 +1540,29 @@ with st.sidebar:
     st.markdown(f"**Metrics Loaded:** {len(st.session_state.metrics_data)}")
     st.markdown(f"**Page:** {st.session_state.page.title()}")
     st.markdown(f"**LLM Judge:** {st.session_state.selected_llm}")
+    if st.session_state.active_profile:
+        st.markdown("**Weight Profile:** {} v{}".format(*st.session_state.active_profile))
     
     if st.session_state.processing_complete:
         # Recalculate final score for sidebar display
-        weighted_sum = sum(data['score'] * data['weight'] for data in st.session_state.metrics_data.values())
-        total_weight = sum(data['weight'] for data in st.session_state.metrics_data.values())
-        current_final_score = weighted_sum / total_weight if total_weight > 0 else 0
-        st.markdown(f"**Current Score:** {current_final_score:.2f}")
+        st.markdown(f"**Current Score:** {final_score(st.session_state.metrics_data)[0]:.2f}")
+    
+    # Judgment cache counters
+    st.markdown("---")
+    st.markdown("### 🗄️ Judgment Cache")
+    cache_stats = get_judgment_cache().stats()
+    st.markdown(f"**Hits / Misses:** {cache_stats['hits']:,} / {cache_stats['misses']:,} ({cache_stats['hit_rate']:.0%} hit rate)")
+    st.markdown(f"**Entries:** {cache_stats['entries']:,} ({cache_stats['bytes'] / 2**20:.1f} of {cache_stats['max_bytes'] / 2**20:.0f} MB)")
+    if cache_stats['errors']:
+        st.caption(f"{cache_stats['errors']:,} cache operation(s) failed (database busy); those rows were scored without the cache")
+    
+    # Scored uploads shared between sessions
+    st.markdown("---")
+    shared_stats = get_shared_results().stats()
+    st.markdown("### 🤝 Shared Results")
+    st.markdown(f"**Hits / Misses:** {shared_stats['hits']:,} / {shared_stats['misses']:,}")
+    st.markdown(f"**Datasets:** {shared_stats['entries']:,} held by {shared_stats['sessions']:,} sessions "
+                f"({shared_stats['bytes'] / 2**20:.1f} of {shared_stats['max_bytes'] / 2**20:.0f} MB)")
     
     # Show comparison status
     if st.session_state.page == 'compare':
@@ -1012,8 +1572,7 @@ with st.sidebar:
             st.markdown("❌ **No datasets processed**")
         else:
             st.markdown(f"✅ **{len(st.session_state.processed_datasets_history)} datasets ready**")
-            for i, dataset in enumerate(st.session_state.processed_datasets_history, 1):
-                st.markdown(f"{i}. {dataset['llm_judge']} ({dataset['sample_count']} samples)")
+        render_stored_datasets()
         
         if (st.session_state.comparison_selection['dataset_a'] is not None and 
             st.session_state.comparison_selection['dataset_b'] is not None):
@@ -1023,24 +1582,22 @@ with st.sidebar:
     if st.session_state.metrics_data:
         st.markdown("---")
         st.markdown("### ⚖️ Weight Summary")
-        total_weight = sum(data['weight'] for data in st.session_state.metrics_data.values())
-        st.markdown(f"**Total Weight:** {total_weight:.2f}")
+        st.markdown(f"**Total Weight:** {final_score(st.session_state.metrics_data)[1]:.2f}")
         
         # Show top 3 metrics
-        top_metrics = sorted(st.session_state.metrics_data.items(), key=lambda x: x[1]['weight'], reverse=True)[:3]
         st.markdown("**Top 3 Priorities:**")
-        for i, (name, data) in enumerate(top_metrics, 1):
+        for i, (name, data) in enumerate(top_metrics(st.session_state.metrics_data), 1):
             st.markdown(f"{i}. {name}: {data['weight']:.2f}")
     
+    # Close the profiled rerun before drawing its panel
+    if st.session_state.profiler is not None:
+        st.session_state.profiler.end_run()
+    st.markdown("---")
+    render_diagnostics()
+    
     st.markdown("---")
     st.markdown("### ⚡ Quick Actions")
-    if st.button("🔄 Reset Session", use_container_width=True):
-        st.session_state.metrics_data = default_metrics.copy()
-        st.session_state.processing_complete = False
-        st.session_state.dataset_processed = None
-        st.session_state.reviewer_comments = {}
-        st.session_state.page = 'upload'
-        st.rerun()
+    st.button("🔄 Reset Session", use_container_width=True, on_click=reset_session)
     
     st.markdown("---")
     st.markdown("### 🎯 Demo Instructions")
@@ -0,0 +1,86 @@
+"""Cold import time of the adams modules and per-rerun time of the app
+
+Each module is imported in a fresh interpreter; the heavy libraries it
+pulled in are listed next to the time. With Streamlit installed the app is
+also run headless and rerun to time a warm script execution.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --modules adams adams.compare --repeat 10 --reruns 0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULES = [
+    'adams', 'adams.scoring', 'adams.compare', 'adams.bootstrap', 'adams.profiles', 'adams.report',
+    'adams.judge', 'adams.results', 'adams.optimize', 'adams.store', 'adams.export',
+]
+HEAVY_MODULES = ['numpy', 'pandas', 'pyarrow', 'scipy', 'altair', 'streamlit']
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def cold_import(module, repeat=5):
+    """Best import time of ``module`` in a fresh interpreter, and the heavy modules it loaded"""
+    best, loaded = float('inf'), []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out)
+        best, loaded = min(best, result['seconds']), result['loaded']
+    return best, loaded
+
+
+def app_reruns(script, reruns):
+    """Seconds of the first run of ``script`` and of each warm rerun"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.abspath(script), default_timeout=120)
+    start = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - start
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        times.append(time.perf_counter() - start)
+    return first, times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', nargs='+', default=DEFAULT_MODULES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--app', default='adams_app.py')
+    parser.add_argument('--reruns', type=int, default=10, help="Warm reruns of the app (0 skips the app)")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<18} {'cold import':>12}  heavy modules loaded")
+    for module in args.modules:
+        seconds, loaded = cold_import(module, args.repeat)
+        print(f"{module:<18} {seconds * 1000:>9.1f} ms  {', '.join(loaded) or '-'}")
+
+    if args.reruns > 0:
+        try:
+            first, times = app_reruns(args.app, args.reruns)
+        except ImportError:
+            print("\nStreamlit is not installed; skipping the app reruns")
+            return
+        print(f"\n{args.app}: first run {first * 1000:.0f} ms, "
+              f"rerun median {statistics.median(times) * 1000:.1f} ms over {len(times)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Judgments/second and tail latency of the async judge client against the mock server
+
+Run from the repository root (requires aiohttp):
+
+    python -m benchmarks.bench_judge
+    python -m benchmarks.bench_judge --rows 5000 --concurrency 16 64 256 --latency 0.1
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from adams.judge import JudgeClient, JudgeConfig
+from adams.mock_judge import BackgroundServer
+
+
+async def run_once(config, judge, rows):
+    async with JudgeClient(config) as client:
+        start = time.perf_counter()
+        await client.judge_many(judge, rows)
+        elapsed = time.perf_counter() - start
+        return elapsed, np.array(client.latencies), client.retries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32, 128])
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--rps', type=float, default=None, help="Per-judge rate limit")
+    args = parser.parse_args(argv)
+
+    rows = [(f"Question {i}", f"Reference {i}", f"Answer {i}") for i in range(args.rows)]
+    with BackgroundServer(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate) as server:
+        print(f"{'concurrency':>11} {'judgments/s':>12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'retries':>8}")
+        for concurrency in args.concurrency:
+            config = JudgeConfig(base_url=server.base_url, concurrency=concurrency,
+                                 default_rate_limit=args.rps, backoff_base=0.05)
+            elapsed, latencies, retries = asyncio.run(run_once(config, 'Qwen', rows))
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+            print(f"{concurrency:>11} {len(rows) / elapsed:>12,.0f} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {retries:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Rows/second of the columnar scoring engine vs the legacy iterrows loop
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scoring
+    python -m benchmarks.bench_scoring --sizes 10000 100000 --legacy-max 100000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from adams.scoring import METRIC_COLUMNS, METRIC_SPECS, score_frame
+
+
+def make_frame(n_rows):
+    """Minimal Question/Reference_Answer/Model_Answer frame of ``n_rows``"""
+    ids = np.arange(n_rows).astype(str)
+    return pd.DataFrame({
+        'Question': np.char.add('Question ', ids),
+        'Reference_Answer': np.char.add('Reference ', ids),
+        'Model_Answer': np.char.add('Answer ', ids),
+    })
+
+
+def legacy_score(df, selected_llm):
+    """The original per-row implementation, kept as the baseline"""
+    processed_data = []
+    weights = [spec[3] for spec in METRIC_SPECS]
+    for _, row in df.iterrows():
+        base_scores = {col: random.uniform(low, high) for col, low, high, _ in METRIC_SPECS}
+        adams_score = sum(score * weight for score, weight in zip(base_scores.values(), weights)) / sum(weights)
+        processed_row = {
+            'Question': row['Question'],
+            'Reference_Answer': row['Reference_Answer'],
+            'Model_Answer': row['Model_Answer'],
+            'ADAMS_Score': round(adams_score, 2),
+            'LLM_Judge': selected_llm,
+        }
+        for col in METRIC_COLUMNS:
+            processed_row[col] = round(base_scores[col], 2)
+        processed_row['Processing_Timestamp'] = time.strftime("%Y-%m-%d %H:%M:%S")
+        processed_row['Original_Data'] = False
+        processed_data.append(processed_row)
+    return processed_data
+
+
+def time_call(func, *args, repeat=3):
+    """Best wall-clock time of ``repeat`` calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-max', type=int, default=100_000,
+                        help="Skip the legacy loop above this many rows (0 disables it)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} {'columnar rows/s':>16} {'legacy rows/s':>14} {'speedup':>8}")
+    for n_rows in args.sizes:
+        df = make_frame(n_rows)
+        columnar = time_call(score_frame, df, 'Qwen', repeat=args.repeat)
+        line = f"{n_rows:>10} {n_rows / columnar:>16,.0f}"
+        if 0 < n_rows <= args.legacy_max:
+            legacy = time_call(legacy_score, df, 'Qwen', repeat=1)
+            line += f" {n_rows / legacy:>14,.0f} {legacy / columnar:>7.1f}x"
+        else:
+            line += f" {'-':>14} {'-':>8}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
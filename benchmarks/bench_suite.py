@@ -0,0 +1,220 @@
+"""End-to-end timings of each stage on synthetic datasets, saved per version
+
+Every size gets a dataset from ``adams.synth`` and each stage is timed,
+best of ``--repeat``:
+
+    ingest              read the CSV upload in chunks
+    score               ingest, score and build the ScoredDataset (one judge)
+    reweight            re-score under every built-in weight profile
+    compare             summaries, the unpaired and paired tests of two judges on the same rows
+    compare_unpaired    the same for two datasets with no rows in common
+    bootstrap           paired bootstrap intervals (--resamples)
+    bootstrap_unpaired  independent bootstrap intervals of the two unrelated datasets
+    export              the scored frame as CSV and, if pyarrow is installed, Parquet
+
+Results are written to ``benchmarks/results/<label>.json`` (the label
+defaults to the package version and git commit) and compared with a
+baseline run: ``--baseline``, else the most recent other result. Stages
+slower than the baseline by more than ``--threshold`` are reported as
+regressions and the exit status is 1.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --sizes 1000 10000 --repeat 5 --label candidate --baseline 2.0.0-92f94b4
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import adams
+from adams.bootstrap import bootstrap_pair
+from adams.compare import DatasetSummary, compare_pair, compare_paired
+from adams.export import available_formats, export_bytes
+from adams.ingest import iter_chunks
+from adams.pipeline import score_upload
+from adams.profiles import BUILTIN_PROFILES, ProfileScores, row_weights
+from adams.results import ScoredDataset
+from adams.synth import synthetic_frame
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+# Differences below this many seconds are timer noise, whatever the ratio
+NOISE_SECONDS = 0.005
+
+
+def time_call(func, *args, repeat=3):
+    """Best wall-clock time of ``repeat`` calls, and the last result"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _ingest(data):
+    for _ in iter_chunks(io.BytesIO(data), 'bench.csv'):
+        pass
+
+
+def _score(data, judge):
+    return ScoredDataset.from_frame(score_upload(io.BytesIO(data), 'bench.csv', judge))
+
+
+def _reweight(dataset, weight_sets):
+    ProfileScores(dataset, max_entries=len(weight_sets)).precompute(weight_sets)
+
+
+def _compare(a, b):
+    compare_pair(DatasetSummary.from_dataset('a', a), DatasetSummary.from_dataset('b', b))
+    return compare_paired(a, b)
+
+
+def _export(frame, formats):
+    for fmt in formats:
+        export_bytes(frame, fmt)
+
+
+def run_size(n_rows, repeat, resamples, answer_chars):
+    """Seconds of each stage for ``n_rows`` synthetic rows"""
+    data = synthetic_frame(n_rows, answer_chars).to_csv(index=False).encode('utf-8')
+    # Different questions, so no rows line up with the first dataset
+    other = synthetic_frame(n_rows, answer_chars, seed=1)
+    other['Question'] = 'Other ' + other['Question']
+    other_data = other.to_csv(index=False).encode('utf-8')
+    formats = [fmt for fmt in ('csv', 'parquet') if fmt in available_formats()]
+    weight_sets = [row_weights(weights) for weights in BUILTIN_PROFILES.values()]
+
+    timings = {}
+    timings['ingest'], _ = time_call(_ingest, data, repeat=repeat)
+    timings['score'], dataset_a = time_call(_score, data, 'Qwen', repeat=repeat)
+    dataset_b = _score(data, 'Llama')
+    dataset_c = _score(other_data, 'Llama')
+    timings['reweight'], _ = time_call(_reweight, dataset_a, weight_sets, repeat=repeat)
+    timings['compare'], _ = time_call(_compare, dataset_a, dataset_b, repeat=repeat)
+    timings['compare_unpaired'], _ = time_call(_compare, dataset_a, dataset_c, repeat=repeat)
+    if resamples > 0:
+        timings['bootstrap'], _ = time_call(bootstrap_pair, dataset_a, dataset_b, resamples, repeat=repeat)
+        timings['bootstrap_unpaired'], _ = time_call(bootstrap_pair, dataset_a, dataset_c, resamples,
+                                                     repeat=repeat)
+    timings['export'], _ = time_call(_export, dataset_a.frame, formats, repeat=repeat)
+    return timings
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    import pandas as pd
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def load_results(results_dir):
+    """Stored runs by label, oldest first"""
+    runs = []
+    if os.path.isdir(results_dir):
+        for name in os.listdir(results_dir):
+            if name.endswith('.json'):
+                with open(os.path.join(results_dir, name)) as f:
+                    runs.append(json.load(f))
+    return {run['label']: run for run in sorted(runs, key=lambda run: run['created'])}
+
+
+def regressions(current, baseline, threshold):
+    """``(rows, stage, seconds, baseline_seconds)`` for each stage slower than ``threshold`` allows"""
+    slower = []
+    for rows, stages in current['timings'].items():
+        for stage, seconds in stages.items():
+            before = baseline['timings'].get(rows, {}).get(stage)
+            if before is not None and seconds > before * (1 + threshold) and seconds - before > NOISE_SECONDS:
+                slower.append((rows, stage, seconds, before))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--resamples', type=int, default=1000, help="Bootstrap resamples (0 skips the stage)")
+    parser.add_argument('--answer-chars', type=int, default=300)
+    parser.add_argument('--label', help="Name of this run (default: version-commit)")
+    parser.add_argument('--baseline', help="Label of the run to compare with (default: the latest other run)")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown (default: 0.2 = 20%%)")
+    parser.add_argument('--results-dir', default=RESULTS_DIR)
+    parser.add_argument('--no-save', action='store_true', help="Compare only; don't write this run")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    label = args.label or '-'.join(filter(None, [adams.__version__, commit]))
+    current = {
+        'label': label,
+        'version': adams.__version__,
+        'commit': commit,
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'environment': environment(),
+        'repeat': args.repeat,
+        'resamples': args.resamples,
+        'answer_chars': args.answer_chars,
+        'timings': {},
+    }
+
+    print(f"{'rows':>10} {'stage':<18} {'seconds':>9} {'rows/s':>13}")
+    for n_rows in args.sizes:
+        timings = run_size(n_rows, args.repeat, args.resamples, args.answer_chars)
+        # JSON object keys are strings, so use them here too
+        current['timings'][str(n_rows)] = timings
+        for stage, seconds in timings.items():
+            print(f"{n_rows:>10} {stage:<18} {seconds:>9.4f} {n_rows / seconds:>13,.0f}")
+
+    runs = load_results(args.results_dir)
+    if args.baseline is not None:
+        if args.baseline not in runs:
+            parser.error(f"no stored run labelled {args.baseline!r} in {args.results_dir}")
+        baseline = runs[args.baseline]
+    else:
+        others = [run for run in runs.values() if run['label'] != label]
+        baseline = others[-1] if others else None
+
+    if not args.no_save:
+        os.makedirs(args.results_dir, exist_ok=True)
+        path = os.path.join(args.results_dir, f"{label}.json")
+        with open(path, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nsaved   {path}")
+
+    if baseline is None:
+        print("no baseline run to compare with")
+        return 0
+    slower = regressions(current, baseline, args.threshold)
+    print(f"baseline {baseline['label']} ({baseline['created']}): ", end='')
+    if not slower:
+        print(f"no stage slower by more than {args.threshold:.0%}")
+        return 0
+    print(f"{len(slower)} regression(s)")
+    for rows, stage, seconds, before in slower:
+        print(f"{int(rows):>10} {stage:<18} {before:>9.4f} -> {seconds:.4f}  (+{seconds / before - 1:.0%})")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
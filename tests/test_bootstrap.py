@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from adams.bootstrap import bootstrap_means, bootstrap_pair
+from adams.results import ScoredDataset
+from adams.scoring import score_frame
+
+
+def _dataset(prefix, n_rows, judge='Qwen'):
+    df = pd.DataFrame({
+        'Question': [f'{prefix} question {i}' for i in range(n_rows)],
+        'Reference_Answer': 'reference',
+        'Model_Answer': 'answer',
+    })
+    return ScoredDataset.from_frame(score_frame(df, judge))
+
+
+def test_unpaired_datasets_are_resampled_independently():
+    a, b = _dataset('a', 200), _dataset('b', 150)
+    result = bootstrap_pair(a, b, n_resamples=200)
+    assert not result.paired
+    assert result.difference.shape == (1 + a.metrics.shape[1], 2)
+    assert np.all(result.difference[:, 0] <= result.difference[:, 1])
+
+
+def test_paired_datasets_keep_their_rows_together():
+    result = bootstrap_pair(_dataset('a', 200), _dataset('a', 200, 'Mistral'), n_resamples=200)
+    assert result.paired
+
+
+def test_seed_sequence_and_int_seeds_agree():
+    values = np.arange(60, dtype=np.float32).reshape(20, 3)
+    np.testing.assert_array_equal(bootstrap_means(values, 50, seed=7),
+                                  bootstrap_means(values, 50, seed=np.random.SeedSequence(7)))
+
+
+def test_results_do_not_depend_on_the_worker_count():
+    values = np.random.default_rng(0).random((5_000, 4), dtype=np.float32)
+    one = bootstrap_means(values, 1_000, workers=1)
+    np.testing.assert_array_equal(one, bootstrap_means(values, 1_000, workers=4))
+    assert one.shape == (1_000, 4)
+    np.testing.assert_allclose(one.mean(axis=0), values.mean(axis=0), atol=0.01)
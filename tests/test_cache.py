@@ -0,0 +1,26 @@
+import numpy as np
+
+from adams.cache import EVICT_TARGET, JudgmentCache
+
+
+def _keys(prefix, n):
+    return [f'{prefix}:{i}'.encode() for i in range(n)]
+
+
+def test_eviction_keeps_the_cache_near_its_cap():
+    cache = JudgmentCache(':memory:', max_bytes=50_000)
+    for batch in range(3):
+        cache.put_many(_keys(f'b{batch}', 1000), np.ones((1000, len(cache.metrics))))
+    stats = cache.stats()
+    assert EVICT_TARGET * cache.max_bytes * 0.95 <= stats['bytes'] <= cache.max_bytes
+    assert stats['evictions'] == 3000 - stats['entries']
+
+
+def test_oldest_entries_are_evicted_first():
+    cache = JudgmentCache(':memory:', max_bytes=50_000)
+    cache.put_many(_keys('old', 300), np.ones((300, len(cache.metrics))))
+    cache.put_many(_keys('new', 200), np.ones((200, len(cache.metrics))))
+    _, new_hits = cache.get_many(_keys('new', 200))
+    _, old_hits = cache.get_many(_keys('old', 300))
+    assert new_hits.all()
+    assert not old_hits.all()
@@ -0,0 +1,49 @@
+import io
+
+import pandas as pd
+
+from adams.ingest import iter_chunks
+
+
+def _frame(n_rows=120):
+    df = pd.DataFrame({
+        'Question': [f'q{i}' for i in range(n_rows)],
+        'Reference_Answer': ['1.50'] * (n_rows // 2) + ['1/2'] * (n_rows - n_rows // 2),
+        'Model_Answer': [str(i) for i in range(n_rows)],
+    })
+    df.loc[5, 'Model_Answer'] = None
+    return df
+
+
+def _read(data, name, chunksize=50):
+    chunks = [chunk for chunk, _ in iter_chunks(io.BytesIO(data), name, chunksize)]
+    return chunks, pd.concat(chunks, ignore_index=True)
+
+
+def test_csv_chunks_keep_text_as_written():
+    df = _frame()
+    chunks, out = _read(df.to_csv(index=False).encode(), 'x.csv')
+    assert len({str(chunk[col].dtype) for chunk in chunks for col in chunk}) == 1
+    assert out['Reference_Answer'].tolist() == df['Reference_Answer'].tolist()
+    assert out['Model_Answer'].isna().tolist() == df['Model_Answer'].isna().tolist()
+
+
+def test_json_layouts():
+    df = _frame()
+    layouts = {
+        'columns.json': df.to_json(),
+        'records.json': df.to_json(orient='records'),
+        'pretty.json': df.to_json(orient='records', indent=2),
+        'lines.json': df.to_json(orient='records', lines=True),
+        'lines.jsonl': df.to_json(orient='records', lines=True),
+    }
+    for name, text in layouts.items():
+        _, out = _read(text.encode(), name)
+        assert out['Reference_Answer'].tolist() == df['Reference_Answer'].tolist(), name
+        assert out['Question'].tolist() == df['Question'].tolist(), name
+
+
+def test_json_numbers_become_text():
+    df = _frame().assign(Model_Answer=range(120))
+    chunks, out = _read(df.to_json(orient='records', lines=True).encode(), 'x.jsonl')
+    assert out['Model_Answer'].tolist() == [str(i) for i in range(120)]
@@ -0,0 +1,78 @@
+import asyncio
+import io
+import time
+
+import pandas as pd
+import pytest
+
+from adams.cache import JudgmentCache
+from adams.judge import JudgeConfig, JudgeError, parse_rate_limits, rate_limiter
+from adams.mock_judge import BackgroundServer
+from adams.pipeline import score_upload
+
+pytest.importorskip('aiohttp')
+
+
+def _upload(n_rows=300):
+    df = pd.DataFrame({
+        'Question': [f'question {i}' for i in range(n_rows)],
+        'Reference_Answer': 'reference',
+        'Model_Answer': 'answer',
+    })
+    return df.to_csv(index=False).encode()
+
+
+def _config(server, **options):
+    return JudgeConfig(base_url=server.base_url, backoff_base=0.0, backoff_max=0.0, **options)
+
+
+def test_malformed_replies_are_retried():
+    with BackgroundServer(latency=0.0, malformed_rate=0.3) as server:
+        scored = score_upload(io.BytesIO(_upload(100)), 'x.csv', 'Qwen', judge_config=_config(server, max_retries=8))
+    assert len(scored) == 100
+
+
+def test_a_failed_run_keeps_its_judgments_and_resumes():
+    data = _upload()
+    cache = JudgmentCache(':memory:')
+    with BackgroundServer(latency=0.0, malformed_rate=0.02) as server:
+        port = server.port
+        with pytest.raises(JudgeError):
+            score_upload(io.BytesIO(data), 'x.csv', 'Qwen', judge_config=_config(server, max_retries=0),
+                         cache=cache)
+    stored = cache.stats()['entries']
+    assert stored > 0
+
+    # Same endpoint URL, so the same judgment cache keys
+    with BackgroundServer(port=port, latency=0.0) as server:
+        resumed = score_upload(io.BytesIO(data), 'x.csv', 'Qwen', judge_config=_config(server), cache=cache)
+    assert len(resumed) == 300
+    assert cache.stats()['hits'] >= stored
+
+
+def test_rate_limits_parse_from_a_number_or_per_judge_json():
+    assert parse_rate_limits(None) == ({}, None)
+    assert parse_rate_limits('2.5') == ({}, 2.5)
+    assert parse_rate_limits('{"Qwen": 5, "*": 20}') == ({'Qwen': 5.0}, 20.0)
+    with pytest.raises(ValueError):
+        parse_rate_limits('[5]')
+
+    config = JudgeConfig(base_url='http://judge', rate_limits={'Qwen': 8.0}, default_rate_limit=4.0)
+    share = config.split_rate_limits(4)
+    assert (share.rate_limit_for('Qwen'), share.rate_limit_for('Mistral')) == (2.0, 1.0)
+
+
+def test_limiters_are_shared_per_endpoint_and_judge_across_event_loops():
+    limiter = rate_limiter('http://judge/', 'Qwen', 10.0)
+    assert rate_limiter('http://judge', 'Qwen', 10.0) is limiter
+    assert rate_limiter('http://judge', 'Mistral', 10.0) is not limiter
+    assert rate_limiter('http://judge', 'Qwen', None) is None
+
+    async def burst():
+        await asyncio.gather(*(limiter.acquire() for _ in range(10)))
+
+    # The burst of 10 is spent by the first loop, so the second has to wait for new tokens
+    start = time.monotonic()
+    asyncio.run(burst())
+    asyncio.run(burst())
+    assert time.monotonic() - start >= 0.8
@@ -0,0 +1,19 @@
+import numpy as np
+from scipy.stats import spearmanr
+
+from adams.optimize import rank_columns, spearman_columns
+
+
+def test_spearman_with_ties_matches_scipy_and_ignores_row_order():
+    rng = np.random.default_rng(0)
+    labels = rng.integers(1, 6, 500).astype(float)
+    scores = np.round(labels + rng.normal(0, 1.5, 500))
+    expected = spearmanr(scores, labels).statistic
+
+    assert np.isclose(spearman_columns(scores, rank_columns(labels)[:, 0])[0], expected)
+    order = np.argsort(labels, kind='stable')
+    assert np.isclose(spearman_columns(scores[order], rank_columns(labels[order])[:, 0])[0], expected)
+
+
+def test_tied_values_share_their_average_rank():
+    np.testing.assert_array_equal(rank_columns(np.array([3.0, 1.0, 3.0, 2.0]))[:, 0], [3.5, 1.0, 3.5, 2.0])
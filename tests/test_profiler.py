@@ -0,0 +1,31 @@
+import gc
+import tracemalloc
+
+from adams.profiler import Profiler, tracing_users
+
+
+def test_tracing_stops_when_the_last_memory_profiler_lets_go():
+    assert not tracemalloc.is_tracing()
+    first, second = Profiler(track_memory=True), Profiler(track_memory=True)
+    assert tracemalloc.is_tracing() and tracing_users() == 2
+
+    first.track_memory = False
+    first.track_memory = False
+    assert tracemalloc.is_tracing() and tracing_users() == 1
+
+    # A session ending drops its profiler without turning tracking off
+    del second
+    gc.collect()
+    assert tracing_users() == 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_sections_record_allocations():
+    profiler = Profiler(track_memory=True)
+    profiler.start_run()
+    with profiler.section('alloc'):
+        data = bytearray(1 << 20)
+    profiler.end_run()
+    assert profiler.totals['alloc'].memory_bytes >= len(data)
+    profiler.track_memory = False
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,56 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from adams.pipeline import score_upload
+from adams.scoring import METRIC_COLUMNS, score_frame
+
+SCORE_COLUMNS = ['ADAMS_Score', *METRIC_COLUMNS]
+
+
+def _frame(n_rows=300):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'Question': [f'question {i}' for i in range(n_rows)],
+        # Numeric-looking answers, missing values and text mixed across chunks
+        'Reference_Answer': rng.choice(['1.50', '1/2', '3', 'three', None], size=n_rows),
+        'Model_Answer': rng.choice(['1.5', '2.00', 'NaN?', 'an answer', None], size=n_rows),
+    })
+
+
+def _scores(frame):
+    return frame[SCORE_COLUMNS].to_numpy()
+
+
+def test_chunked_reordered_and_single_pass_runs_score_identically():
+    df = _frame()
+    data = df.to_csv(index=False).encode()
+    single = _scores(score_upload(io.BytesIO(data), 'x.csv', 'Qwen', chunksize=len(df)))
+    for chunksize in (1, 7, 100):
+        np.testing.assert_array_equal(_scores(score_upload(io.BytesIO(data), 'x.csv', 'Qwen', chunksize=chunksize)),
+                                      single)
+
+    order = np.random.default_rng(1).permutation(len(df))
+    shuffled = df.iloc[order].to_csv(index=False).encode()
+    reordered = _scores(score_upload(io.BytesIO(shuffled), 'x.csv', 'Qwen', chunksize=13))
+    np.testing.assert_array_equal(reordered, single[order])
+
+
+def test_scores_depend_on_judge_and_seed():
+    df = _frame()
+    base = _scores(score_frame(df, 'Qwen'))
+    np.testing.assert_array_equal(_scores(score_frame(df, 'Qwen')), base)
+    assert not np.array_equal(_scores(score_frame(df, 'Mistral')), base)
+    assert not np.array_equal(_scores(score_frame(df, 'Qwen', seed=1)), base)
+
+
+def test_simulated_scoring_leaves_the_judgment_cache_alone():
+    from adams.cache import JudgmentCache
+
+    cache = JudgmentCache(':memory:')
+    df = _frame()
+    scored = score_upload(io.BytesIO(df.to_csv(index=False).encode()), 'x.csv', 'Qwen', cache=cache)
+    np.testing.assert_array_equal(_scores(scored), _scores(score_frame(df, 'Qwen')))
+    stats = cache.stats()
+    assert stats['entries'] == 0 and stats['hits'] + stats['misses'] == 0
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from adams.results import ScoredDataset
+from adams.scoring import score_frame
+from adams.shared import SessionToken, SharedResults
+
+
+def _dataset():
+    df = pd.DataFrame({'Question': ['q1', 'q2'], 'Reference_Answer': 'r', 'Model_Answer': 'm'})
+    return ScoredDataset.from_frame(score_frame(df, 'Qwen'))
+
+
+def test_each_owner_gets_a_handle_and_forgetting_one_keeps_the_others():
+    shared = SharedResults()
+    key = ('hash', 'Qwen')
+    entry = shared.add(key, _dataset(), {'id': 'a1'}, SessionToken(), owner='a')
+    linked = []
+
+    def link(handles):
+        linked.append([handle['id'] for handle in handles])
+        return {'id': 'b1'}
+
+    hit = shared.acquire(key, SessionToken())
+    assert hit is entry
+    assert shared.handle_for(hit, 'b', link) == {'id': 'b1'}
+    assert shared.handle_for(hit, 'b', link) == {'id': 'b1'}
+    assert shared.handle_for(hit, 'a', link) == {'id': 'a1'}
+    assert linked == [['a1']]
+
+    shared.forget('a1')
+    assert shared.acquire(key, SessionToken()) is entry
+    shared.forget('b1')
+    assert shared.acquire(key, SessionToken()) is None
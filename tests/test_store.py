@@ -0,0 +1,58 @@
+import os
+import sqlite3
+
+import pandas as pd
+
+from adams.results import ScoredDataset
+from adams.scoring import score_frame
+from adams.store import DatasetStore
+
+
+def _dataset(n_rows=20):
+    df = pd.DataFrame({'Question': [f'q{i}' for i in range(n_rows)], 'Reference_Answer': 'r', 'Model_Answer': 'm'})
+    return ScoredDataset.from_frame(score_frame(df, 'Qwen'))
+
+
+def test_list_is_scoped_by_owner_and_limited_to_recent(tmp_path):
+    store = DatasetStore(str(tmp_path))
+    anonymous = [store.save(_dataset(), f'a{i}.csv', 'Qwen') for i in range(3)]
+    mine = store.save(_dataset(), 'mine.csv', 'Qwen', owner='me@example.com')
+
+    assert [entry['id'] for entry in store.list()] == [entry['id'] for entry in anonymous]
+    assert [entry['id'] for entry in store.list(limit=2)] == [entry['id'] for entry in anonymous[1:]]
+    assert [entry['id'] for entry in store.list('me@example.com')] == [mine['id']]
+
+
+def test_delete_removes_the_dataset(tmp_path):
+    store = DatasetStore(str(tmp_path))
+    kept, deleted = store.save(_dataset(), 'kept.csv', 'Qwen'), store.save(_dataset(), 'gone.csv', 'Qwen')
+    store.delete(deleted['id'])
+    assert store.existing([kept['id'], deleted['id']]) == {kept['id']}
+    assert [entry['id'] for entry in store.list()] == [kept['id']]
+
+
+def test_indexes_without_owners_are_migrated(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'index.sqlite'))
+    conn.execute('CREATE TABLE datasets (id TEXT PRIMARY KEY, name TEXT, llm_judge TEXT, timestamp TEXT,'
+                 ' filename TEXT, sample_count INTEGER, path TEXT, created REAL)')
+    conn.execute("INSERT INTO datasets VALUES ('old', 'old.csv (Qwen)', 'Qwen', 't', 'old.csv', 1, 'x', 0)")
+    conn.commit()
+    conn.close()
+    store = DatasetStore(str(tmp_path))
+    store.save(_dataset(), 'new.csv', 'Qwen')
+    assert [entry['id'] for entry in store.list()][0] == 'old'
+
+
+def test_linked_rows_share_the_file_until_the_last_is_deleted(tmp_path):
+    store = DatasetStore(str(tmp_path))
+    theirs = store.save(_dataset(), 'same.csv', 'Qwen', owner='a@example.com')
+    mine = store.link(theirs['id'], owner='b@example.com')
+
+    assert mine['id'] != theirs['id'] and mine['name'] == theirs['name']
+    assert [entry['id'] for entry in store.list('b@example.com')] == [mine['id']]
+    store.delete(theirs['id'])
+    assert store.existing([theirs['id'], mine['id']]) == {mine['id']}
+    store._cache.clear()
+    assert len(store.load(mine['id'])) == 20
+    store.delete(mine['id'])
+    assert not [name for name in os.listdir(tmp_path) if name != 'index.sqlite']